@@ -0,0 +1,62 @@
+"""Ferramenta de desenvolvimento: mede o custeio FIFO de um ano sintético (a correção fica em tests/test_lots.py)."""
+import sys
+import time
+import random
+from datetime import date, timedelta
+from src.modules.lots import FifoCosting
+from src.modules.utils import BASE_UNITS
+
+# Um ano de movimentações
+DAYS = 365
+START = date(2025, 1, 1)
+
+
+def synthetic_year(foods, movements_per_day, seed=42):
+    """Entradas e saídas (dicionários como os do backend) de um ano, em ordem de registro."""
+    rng = random.Random(seed)
+    entries, exits = [], []
+    for day in range(DAYS):
+        date_str = (START + timedelta(days=day)).strftime('%d/%m/%Y')
+        for _ in range(movements_per_day):
+            food_id = rng.randint(1, foods)
+            # Compras maiores e menos frequentes que as saídas
+            if rng.random() < 0.3:
+                quantity = rng.uniform(1, 10)
+                entries.append({'food_name': f"Alimento {food_id}", 'quantity': quantity, 'unit': 'kg',
+                                'cost': quantity * rng.uniform(5, 50), 'date': date_str,
+                                'supplier': '-', 'food_id': food_id})
+            else:
+                exits.append({'food_name': f"Alimento {food_id}", 'quantity': rng.uniform(100, 3000),
+                              'unit': 'g', 'date': date_str, 'reason': 'consumo', 'food_id': food_id})
+    return entries, exits
+
+
+if __name__ == "__main__":
+    if len(sys.argv) > 3:
+        print("Uso:")
+        print("  Medir o custeio FIFO de um ano: python benchmark_lots.py [alimentos] [movimentações por dia]")
+        sys.exit(1)
+
+    foods = int(sys.argv[1]) if len(sys.argv) > 1 else 200
+    movements_per_day = int(sys.argv[2]) if len(sys.argv) > 2 else 200
+    entries, exits = synthetic_year(foods, movements_per_day)
+    print(f"{len(entries)} entradas e {len(exits)} saídas de {foods} alimentos em {DAYS} dias")
+
+    started = time.perf_counter()
+    costing = FifoCosting(BASE_UNITS).run(entries, exits)
+    elapsed = time.perf_counter() - started
+    print(f"Processamento FIFO: {elapsed:.3f}s")
+
+    # Consultas: custo por mês e valor do estoque em cada fim de mês
+    started = time.perf_counter()
+    months = costing.cost_by_month()
+    month_ends = [(START.replace(month=month % 12 + 1, year=START.year + month // 12) - timedelta(days=1)).toordinal()
+                  for month in range(1, 13)]
+    values = [costing.inventory_value(ordinal) for ordinal in month_ends]
+    queries = time.perf_counter() - started
+    print(f"Custo de {len(months)} meses e valor do estoque em {len(values)} datas: {queries:.3f}s")
+    print(f"Custo do ano: R$ {sum(months.values()):.2f} | Estoque final a custo: R$ {values[-1]:.2f}")
+
+    status = "✅" if elapsed < 1 else "❌"
+    print(f"{status} Um ano processado em {elapsed:.3f}s (meta: menos de 1s)")
+    sys.exit(0 if elapsed < 1 else 1)
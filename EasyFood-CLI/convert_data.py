@@ -0,0 +1,18 @@
+from src.modules.utils import DATA_FILES
+from src.modules.storage import JsonStorage
+from src.modules.codec import CODECS
+from src.modules.config import CONFIG_FILE
+import sys
+
+if __name__ == "__main__":
+    if len(sys.argv) != 2 or sys.argv[1] not in CODECS:
+        print("Uso:")
+        print(f"  Converter data/ para outro formato: python convert_data.py <{'|'.join(CODECS)}>")
+        sys.exit(1)
+
+    codec_name = sys.argv[1]
+    counts = JsonStorage(DATA_FILES).convert(codec_name)
+    for file_key, count in counts.items():
+        print(f"{file_key}: {count} registros convertidos")
+    print(f"\n✅ Arquivos de data/ gravados em {codec_name}")
+    print(f'Para manter o formato nas próximas gravações, defina {{"codec": "{codec_name}"}} em {CONFIG_FILE}')
@@ -1,7 +1,17 @@
 # -*- coding: utf-8 -*-
+import sys
+
+if __name__ == "__main__" and len(sys.argv) > 1:
+    # Subcomandos sem interação (ex.: python main.py report financial --format json):
+    # não carregam os menus nem criam backup, para iniciar rápido em scripts e no cron
+    from src.modules.commands import run
+    sys.exit(run(sys.argv[1:]))
+
 from src.modules.backup_manager import backup_manager
 from src.modules import alimentos, fornecedores, estoque, refeicoes, relatorios
-from src.modules.utils import clear_screen, load_data, Food, Supplier, StockEntry, Meal
+from src.modules.utils import clear_screen, load_data, get_storage, Food, Supplier, Meal
+from src.modules.references import migrate_ids
+from src.modules.storage import DataFileError
 import os
 
 def check_data_files():
@@ -9,11 +19,10 @@ def check_data_files():
     if not os.path.exists(data_dir):
         os.makedirs(data_dir)
     
+    # Movimentações ficam em partições mensais (data/stock_entries/), criadas pelo armazenamento
     required_files = [
         'foods.json',
         'suppliers.json',
-        'stock_entries.json',
-        'stock_exits.json',
         'meals.json'
     ]
     
@@ -27,12 +36,13 @@ def check_data_files():
 def main():
     check_data_files()
     backup_manager.create_backup()  # Backup inicial ao iniciar
+    migrate_ids(get_storage())  # Garante IDs estáveis (dados de versões anteriores)
     
     while True:
         clear_screen()
         foods = load_data('foods', Food)
         suppliers = load_data('suppliers', Supplier)
-        stock_entries = load_data('stock_entries', StockEntry)
+        has_stock_entries = get_storage().count('stock_entries') > 0  # Sem ler o histórico
         meals = load_data('meals', Meal)
         
         menu_options = []
@@ -50,7 +60,7 @@ def main():
             menu_options.append("4. Refeições")
         
         # Relatórios só aparece se tiver todos os requisitos
-        if len(foods) > 0 and len(suppliers) > 0 and len(stock_entries) > 0 and len(meals) > 0:
+        if len(foods) > 0 and len(suppliers) > 0 and has_stock_entries and len(meals) > 0:
             menu_options.append("5. Relatórios")
         
         # Opções fixas no final
@@ -89,4 +99,8 @@ def main():
         input("\nPressione Enter para continuar...")
 
 if __name__ == "__main__":
-    main()
\ No newline at end of file
+    try:
+        main()
+    except DataFileError as e:
+        # Nunca segue com uma lista vazia no lugar de um arquivo ilegível
+        print(f"\n❌ {e}")
\ No newline at end of file
@@ -1,11 +1,13 @@
 # -*- coding: utf-8 -*-
 from src.modules.utils import (
     Food, StockEntry, StockExit, Meal,
-    load_data, save_data, get_input,
+    load_data, save_data, get_input, UnitOfWork,
     select_from_list, clear_screen,
     validate_positive_number, 
     validate_non_negative_number, UNIDADES
 )
+from src.modules.references import next_id
+from src.modules.storage import MovementFilter
 from tabulate import tabulate 
 
 def manage_foods():
@@ -57,6 +59,7 @@ def add_food():
     
     foods = load_data('foods', Food)
     foods.append(Food(
+        id=next_id(foods),
         name=name,
         unit=unit,
         quantity_in_stock=quantity_in_stock,
@@ -72,7 +75,8 @@ def add_food():
     print("\n✅ Alimento cadastrado com sucesso!")
 
 def edit_food():
-    foods = load_data('foods', Food)
+    tx = UnitOfWork()
+    foods = tx.load('foods', Food)
     if not foods:
         print("Nenhum alimento cadastrado!")
         return
@@ -114,35 +118,19 @@ def edit_food():
         default=str(food.quantity_per_portion), 
         is_number=True
     )
-    if new_name != old_name:
-        entries = load_data('stock_entries', StockEntry)
-        for entry in entries:
-            if entry.food_name == old_name:
-                entry.food_name = new_name
-        save_data(entries, 'stock_entries')
-        
-        exits = load_data('stock_exits', StockExit)
-        for exit in exits:
-            if exit.food_name == old_name:
-                exit.food_name = new_name
-        save_data(exits, 'stock_exits')
-        
-        meals = load_data('meals', Meal)
-        for meal in meals:
-            for item in meal.foods:
-                if item['food_name'] == old_name:
-                    item['food_name'] = new_name
-        save_data(meals, 'meals')
-    
+    # O histórico e as refeições referenciam o alimento pelo ID:
+    # renomear altera apenas o cadastro
     food.name = new_name
     food.unit = new_unit
     food.quantity_in_stock = new_quantity
     food.quantity_per_portion = new_portion
-    save_data(foods, 'foods')
+    tx.save(foods, 'foods')
+    tx.commit()
     print("\n✅ Alimento e histórico atualizados!")
 
 def remove_food():
-    foods = load_data('foods', Food)
+    tx = UnitOfWork()
+    foods = tx.load('foods', Food)
     if not foods:
         print("Nenhum alimento cadastrado!")
         return
@@ -155,20 +143,18 @@ def remove_food():
     if confirm == 's':
         foods.remove(food)
         
-        entries = load_data('stock_entries', StockEntry)
-        entries = [e for e in entries if e.food_name != food.name]
-        save_data(entries, 'stock_entries')
-        
-        exits = load_data('stock_exits', StockExit)
-        exits = [e for e in exits if e.food_name != food.name]
-        save_data(exits, 'stock_exits')
+        # Movimentações do alimento saem pelo filtro: só as partições que o contêm são lidas
+        for file_key in ('stock_entries', 'stock_exits'):
+            tx.delete(file_key, MovementFilter(food_id=food.id))
         
-        meals = load_data('meals', Meal)
+        meals = tx.load('meals', Meal)
         for meal in meals:
-            meal.foods = [item for item in meal.foods if item['food_name'] != food.name]
-        save_data(meals, 'meals')
+            meal.foods = [item for item in meal.foods if item.get('food_id') != food.id]
+        tx.save(meals, 'meals')
         
-        save_data(foods, 'foods')
+        tx.save(foods, 'foods')
+        # Grava tudo de uma vez: ou todos os arquivos mudam, ou nenhum
+        tx.commit()
         print("✅ Alimento e histórico removidos!")
 
 def list_foods():
@@ -2,6 +2,15 @@ import os
 import shutil
 import logging
 from datetime import datetime
+from src.modules.config import get_config
+from src.modules.wal import WAL_FILE
+from src.modules.storage import VERSIONS_FILE, copy_sqlite
+from src.modules.locking import get_file_lock, LOCK_FILE
+
+WAL_PATH = os.path.join('data', WAL_FILE)
+VERSIONS_PATH = os.path.join('data', VERSIONS_FILE)
+# Trava entre processos da pasta data/ (a mesma usada pelo armazenamento)
+data_lock = get_file_lock(os.path.join('data', LOCK_FILE))
 
 class BackupManager:
     def __init__(self):
@@ -29,17 +38,32 @@ class BackupManager:
             
             # 3. Copia arquivos
             os.makedirs(backup_path)
+            sqlite_path = get_config()['sqlite_path']
             data_files = [
                 'data/foods.json',
                 'data/suppliers.json',
-                'data/stock_entries.json',
+                'data/stock_entries',       # Partições mensais (+ diário)
+                'data/stock_exits',
+                'data/stock_entries.json',  # Layout anterior (antes da migração)
+                'data/stock_entries.jsonl',
                 'data/stock_exits.json',
-                'data/meals.json'
+                'data/stock_exits.jsonl',
+                'data/meals.json',
+                WAL_PATH,                   # Gravações ainda não aplicadas pelo checkpoint
+                sqlite_path                 # Banco do backend SQLite, se em uso
             ]
             
-            for file in data_files:
-                if os.path.exists(file):
-                    shutil.copy2(file, backup_path)
+            with data_lock.shared():  # Cópia consistente mesmo com outro processo gravando
+                for file in data_files:
+                    if file == sqlite_path:
+                        # Gravações no banco não usam data/.lock: cópia pelo próprio SQLite
+                        if os.path.exists(file):
+                            copy_sqlite(file, os.path.join(backup_path, os.path.basename(file)))
+                    elif os.path.isdir(file):
+                        # Partições mensais das movimentações
+                        shutil.copytree(file, os.path.join(backup_path, os.path.basename(file)))
+                    elif os.path.exists(file):
+                        shutil.copy2(file, backup_path)
             
             # 4. Rotação inteligente (mantém últimos 20 backups)
             self._rotate_backups()
@@ -119,12 +143,27 @@ class BackupManager:
                 if confirm.lower() != 's':
                     return False
                 
-                # Substitui arquivos
-                for file in os.listdir(source):
-                    shutil.copy(
-                        os.path.join(source, file),
-                        os.path.join("data", file)
-                    )
+                with data_lock.exclusive():
+                    # Gravações pendentes no WAL pertencem aos dados atuais: descarta.
+                    # Sem versions.json, cópias lidas antes da restauração não são regravadas.
+                    for path in (WAL_PATH, VERSIONS_PATH):
+                        if os.path.exists(path):
+                            os.remove(path)
+
+                    # Substitui arquivos (diretórios de partições são trocados por inteiro)
+                    sqlite_path = get_config()['sqlite_path']
+                    for file in os.listdir(source):
+                        source_path = os.path.join(source, file)
+                        target_path = os.path.join("data", file)
+                        if file == os.path.basename(sqlite_path):
+                            # O banco volta para o caminho configurado, mesmo fora de data/
+                            os.makedirs(os.path.dirname(sqlite_path) or '.', exist_ok=True)
+                            copy_sqlite(source_path, sqlite_path)
+                        elif os.path.isdir(source_path):
+                            shutil.rmtree(target_path, ignore_errors=True)
+                            shutil.copytree(source_path, target_path)
+                        else:
+                            shutil.copy(source_path, target_path)
                     
                 print("✅ Restauração concluída! Reinicie o sistema.")
                 return True
@@ -0,0 +1,143 @@
+# src/modules/cache.py
+from collections import Counter
+from src.modules.ledger import StockLedger
+from src.modules.search import NameIndex
+
+
+def copy_record(record):
+    """Copia as listas aninhadas (ex.: itens de refeição) para isolar quem altera o objeto."""
+    return {
+        key: [dict(item) if isinstance(item, dict) else item for item in value]
+        if isinstance(value, list) else value
+        for key, value in record.items()
+    }
+
+
+class DatasetCache:
+    """Cache em memória dos conjuntos de dados, validado pela assinatura dos arquivos.
+
+    Cada chamada entrega dicionários novos: alterar um registro não contamina o cache.
+    """
+
+    def __init__(self):
+        self._entries = {}
+        self.hits = Counter()
+        self.misses = Counter()
+
+    def _fresh_entry(self, file_key, storage, signature):
+        entry = self._entries.get(file_key)
+        if entry and entry['signature'] == signature and entry['storage'] is storage:
+            return entry
+        return None
+
+    def _records(self, entry):
+        if entry['nested']:
+            return [copy_record(record) for record in entry['records']]
+        return entry['records']
+
+    def peek(self, file_key, storage):
+        """Registros de file_key se já estiverem em cache e atualizados; senão None (não lê nada)."""
+        entry = self._fresh_entry(file_key, storage, storage.signature(file_key))
+        if entry is None:
+            return None
+        self.hits[file_key] += 1
+        return self._records(entry)
+
+    def get(self, file_key, storage):
+        """Retorna os registros de file_key, lendo do backend apenas se necessário."""
+        signature = storage.signature(file_key)
+        entry = self._fresh_entry(file_key, storage, signature)
+        if entry:
+            self.hits[file_key] += 1
+        else:
+            self.misses[file_key] += 1
+            records = storage.load(file_key)
+            self._entries[file_key] = {
+                'signature': signature,
+                'storage': storage,
+                'records': records,
+                'nested': any(isinstance(v, list) for r in records for v in r.values())
+            }
+            entry = self._entries[file_key]
+        return self._records(entry)
+
+    def invalidate(self, file_key=None):
+        """Descarta uma entrada (ou todas, se file_key for None)."""
+        if file_key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(file_key, None)
+
+    def stats(self):
+        """Contadores de acertos/falhas, no total e por conjunto de dados."""
+        return {
+            'hits': sum(self.hits.values()),
+            'misses': sum(self.misses.values()),
+            'by_key': {
+                key: {'hits': self.hits[key], 'misses': self.misses[key]}
+                for key in sorted(set(self.hits) | set(self.misses))
+            }
+        }
+
+
+# Instância global (compartilhada por todo o processo)
+dataset_cache = DatasetCache()
+
+
+class LedgerCache:
+    """StockLedger já montado de cada conjunto, validado pela assinatura.
+
+    O ledger é compartilhado: quem o recebe não deve alterá-lo.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, file_key, record_type, storage):
+        signature = storage.signature(file_key)
+        entry = self._entries.get(file_key)
+        if entry and entry['signature'] == signature and entry['storage'] is storage \
+                and entry['ledger'].record_type is record_type:
+            return entry['ledger']
+        records = dataset_cache.peek(file_key, storage)
+        if records is None:
+            records = storage.iter_records(file_key)
+        ledger = StockLedger.from_records(record_type, records)
+        self._entries[file_key] = {'signature': signature, 'storage': storage, 'ledger': ledger}
+        return ledger
+
+    def invalidate(self, file_key=None):
+        """Descarta uma entrada (ou todas, se file_key for None)."""
+        if file_key is None:
+            self._entries.clear()
+        else:
+            self._entries.pop(file_key, None)
+
+
+class NameIndexCache:
+    """NameIndex de cada conjunto lido por load_data, enquanto versão e nomes não mudarem.
+
+    Use só as posições: os itens do índice podem ser de uma leitura anterior.
+    """
+
+    def __init__(self):
+        self._entries = {}
+
+    def get(self, items):
+        file_key = getattr(items, 'file_key', None)
+        if file_key is None:
+            return NameIndex(items)
+        names = [item.name for item in items]
+        entry = self._entries.get(file_key)
+        if entry is None or entry['version'] != items.version or entry['names'] != names:
+            entry = {'version': items.version, 'names': names, 'index': NameIndex(items)}
+            self._entries[file_key] = entry
+        return entry['index']
+
+    def invalidate(self):
+        self._entries.clear()
+
+
+# Instâncias globais
+ledger_cache = LedgerCache()
+name_index_cache = NameIndexCache()
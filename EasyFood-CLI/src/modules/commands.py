@@ -0,0 +1,170 @@
+# src/modules/commands.py
+import os
+import sys
+import csv
+import json
+import argparse
+from datetime import date
+from src.modules.utils import use_read_only_storage, iter_data, validate_date, StockEntry, StockExit
+from src.modules.storage import MovementFilter, DataFileError, MigrationRequired
+from src.modules.references import missing_ids
+
+REPORTS = ('nutrition', 'financial', 'stock', 'forecast', 'inventory')
+FORMATS = ('table', 'json', 'csv')
+MOVEMENTS = {'entries': ('stock_entries', StockEntry), 'exits': ('stock_exits', StockExit)}
+
+
+def _date(value):
+    if not validate_date(value):
+        raise argparse.ArgumentTypeError(f"data inválida: {value!r} (use dd/mm/aaaa)")
+    return value
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(
+        prog='main.py',
+        description="EasyFood - relatórios e exportação sem interação (sem argumentos, abre o menu)."
+    )
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    report = commands.add_parser('report', help="gera um relatório")
+    report.add_argument('kind', choices=REPORTS)
+    report.add_argument('--format', choices=FORMATS, default='table')
+    report.add_argument('--from', dest='start_date', type=_date, metavar='DD/MM/AAAA',
+                        help="início do período (financeiro: compras; estoque: saídas; FIFO: consumo)")
+    report.add_argument('--to', dest='end_date', type=_date, metavar='DD/MM/AAAA',
+                        help="fim do período (previsão: data de referência; padrão: hoje)")
+    report.add_argument('--table', type=int, metavar='N', help="apenas a N-ésima tabela do relatório")
+
+    export = commands.add_parser('export', help="exporta movimentações de estoque")
+    export.add_argument('kind', choices=list(MOVEMENTS))
+    export.add_argument('--format', choices=FORMATS, default='csv')
+    export.add_argument('--from', dest='start_date', type=_date, metavar='DD/MM/AAAA')
+    export.add_argument('--to', dest='end_date', type=_date, metavar='DD/MM/AAAA')
+    export.add_argument('--food', dest='food_id', type=int, metavar='ID', help="apenas um alimento (ID)")
+    return parser
+
+
+def _report_tables(parser, args):
+    # Importa só o relatório pedido; cada um tem suas regras de período
+    today = date.today().strftime('%d/%m/%Y')
+    start_date, end_date = args.start_date or '', args.end_date or ''
+    if args.kind == 'nutrition':
+        from src.modules.reports.nutrition import collect_nutrition_report as collect, NUTRITION_FILES as files
+        if start_date or end_date:
+            parser.error("o relatório nutricional não tem período")
+        report, params = 'nutrition', ()
+    elif args.kind == 'financial':
+        from src.modules.reports.financial import collect_financial_report as collect, FINANCIAL_FILES as files
+        report, params = 'financial', (start_date, end_date)
+    elif args.kind == 'stock':
+        from src.modules.reports.stock import collect_stock_report as collect, STOCK_FILES as files
+        if end_date and not start_date:
+            parser.error("no relatório de estoque, --to exige --from")
+        report, params = 'stock', (start_date, (end_date or today) if start_date else '')
+    elif args.kind == 'forecast':
+        from src.modules.reports.stock import collect_stock_report as collect, STOCK_FILES as files
+        if start_date:
+            parser.error("a previsão usa as saídas dos últimos dias até --to; --from não se aplica")
+        report, params = 'stock', ('', '', end_date or today)
+    else:
+        from src.modules.reports.inventory import collect_inventory_report as collect, INVENTORY_FILES as files
+        report, params = 'inventory', (start_date, end_date or today)
+
+    from src.modules.reports.base import collect_report
+    tables = collect_report(report, files, collect, *params)
+    if args.table is not None:
+        if not 1 <= args.table <= len(tables):
+            parser.error(f"--table deve estar entre 1 e {len(tables)}")
+        tables = [tables[args.table - 1]]
+    elif report == 'stock' and not tables[1].rows:
+        tables = tables[:1]  # Como no menu: sem itens em unidade incompatível, sem a tabela
+    return tables
+
+
+def _rounded(row):
+    # Sem ruído de ponto flutuante nas saídas json/csv (ex.: 1.7999999999999998)
+    return [round(value, 6) if isinstance(value, float) else value for value in row]
+
+
+def write_tables(tables, output_format, out, meta=None):
+    """Escreve as tabelas do relatório, uma de cada vez, no formato pedido."""
+    if output_format == 'json':
+        out.write("{")
+        for key, value in (meta or {}).items():
+            out.write(f"{json.dumps(key)}: {json.dumps(value, ensure_ascii=False)}, ")
+        out.write('"tables": [')
+        for position, table in enumerate(tables):
+            out.write(", " if position else "\n")
+            out.write(json.dumps({
+                'title': table.title,
+                'columns': table.headers,
+                'rows': [dict(zip(table.headers, _rounded(row))) for row in table.rows]
+            }, ensure_ascii=False))
+        out.write("\n]}\n")
+    elif output_format == 'csv':
+        # Um bloco por tabela: '# título', cabeçalho e linhas
+        writer = csv.writer(out, lineterminator='\n')
+        for position, table in enumerate(tables):
+            if position:
+                out.write("\n")
+            out.write(f"# {table.title}\n")
+            writer.writerow(table.headers)
+            writer.writerows(_rounded(row) for row in table.rows)
+    else:
+        from tabulate import tabulate
+        for table in tables:
+            out.write(f"\n{table.title}\n{tabulate(table.rows, headers=table.headers, tablefmt='grid', floatfmt='.2f')}\n")
+
+
+def write_movements(records, fields, output_format, out):
+    """Escreve as movimentações à medida que são lidas (tabela: só ao fim, para alinhar as colunas)."""
+    if output_format == 'json':
+        out.write("[")
+        for position, record in enumerate(records):
+            out.write(",\n" if position else "\n")
+            out.write(json.dumps(record, ensure_ascii=False))
+        out.write("\n]\n")
+    elif output_format == 'csv':
+        writer = csv.DictWriter(out, fieldnames=fields, lineterminator='\n')
+        writer.writeheader()
+        for record in records:
+            writer.writerow(record)
+    else:
+        from tabulate import tabulate
+        out.write(tabulate([[record[field] for field in fields] for record in records],
+                           headers=fields, tablefmt='grid') + "\n")
+
+
+def run(argv, out=None):
+    """Executa um subcomando (argv sem o nome do programa); retorna o código de saída."""
+    out = out or sys.stdout
+    parser = build_parser()
+    args = parser.parse_args(argv)
+    try:
+        # Somente leitura: converter dados antigos fica com o menu interativo
+        if missing_ids(use_read_only_storage()):
+            raise MigrationRequired("Cadastros sem IDs estáveis (dados de uma versão anterior)")
+        if args.command == 'report':
+            tables = _report_tables(parser, args)
+            meta = {'report': args.kind, 'from': args.start_date, 'to': args.end_date}
+            write_tables(tables, args.format, out, meta)
+        else:
+            file_key, class_type = MOVEMENTS[args.kind]
+            period = MovementFilter.between(args.start_date, args.end_date, food_id=args.food_id)
+            # Lidos em streaming, já com os nomes atuais dos cadastros
+            records = (item.to_dict() for item in iter_data(file_key, class_type, filter=period))
+            write_movements(records, list(class_type.__slots__), args.format, out)
+        out.flush()
+    except DataFileError as e:
+        print(f"❌ {e}", file=sys.stderr)
+        return 1
+    except MigrationRequired as e:
+        print(f"❌ {e}. Abra o menu (python main.py, sem argumentos) uma vez para atualizar os dados.",
+              file=sys.stderr)
+        return 1
+    except BrokenPipeError:
+        # Saída fechada antes do fim (ex.: | head): descarta o restante sem erro
+        os.dup2(os.open(os.devnull, os.O_WRONLY), out.fileno())
+        return 0
+    return 0
@@ -0,0 +1,50 @@
+# src/modules/config.py
+import os
+import json
+
+CONFIG_FILE = 'config.json'
+DEFAULT_CONFIG = {
+    'storage': 'json',               # Backend de armazenamento: 'json' ou 'sqlite'
+    'sqlite_path': 'data/easyfood.db',
+    'checkpoint_interval': 2,        # Segundos entre checkpoints do WAL (0 = aplica a cada gravação)
+    'codec': 'json',                 # Formato dos arquivos: 'json', 'json-compact', 'json-fast' ou 'msgpack'
+    'report_cache_size': 32,         # Relatórios guardados em cache (0 = desativado)
+    'report_cache_path': ''          # Arquivo para manter o cache entre execuções ('' = só em memória)
+}
+# Variáveis de ambiente que sobrescrevem o arquivo de configuração
+ENV_OVERRIDES = {
+    'EASYFOOD_STORAGE': 'storage',
+    'EASYFOOD_SQLITE_PATH': 'sqlite_path',
+    'EASYFOOD_CHECKPOINT_INTERVAL': 'checkpoint_interval',
+    'EASYFOOD_CODEC': 'codec',
+    'EASYFOOD_REPORT_CACHE_SIZE': 'report_cache_size',
+    'EASYFOOD_REPORT_CACHE_PATH': 'report_cache_path'
+}
+
+_config = None
+
+
+def get_config():
+    """Retorna a configuração: padrões + config.json (opcional) + variáveis de ambiente."""
+    global _config
+    if _config is None:
+        config = dict(DEFAULT_CONFIG)
+        try:
+            with open(CONFIG_FILE, 'r') as f:
+                config.update(json.load(f))
+        except FileNotFoundError:
+            pass
+        except json.JSONDecodeError as e:
+            raise ValueError(f"{CONFIG_FILE} inválido: {e}")
+
+        for env_var, key in ENV_OVERRIDES.items():
+            if os.environ.get(env_var):
+                config[key] = os.environ[env_var]
+        _config = config
+    return _config
+
+
+def reset_config():
+    """Descarta a configuração carregada (força nova leitura)."""
+    global _config
+    _config = None
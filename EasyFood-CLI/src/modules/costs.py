@@ -0,0 +1,66 @@
+# src/modules/costs.py
+import threading
+
+COST_FILE_KEY = 'stock_entries'
+
+
+class CostIndex:
+    """Custo médio ponderado por alimento (ID), montado uma vez por versão de stock_entries."""
+
+    def __init__(self, base_units):
+        self.base_units = base_units
+        self._lock = threading.Lock()
+        self._storage = None
+        self._signature = None
+        self._totals = {}  # food_id -> [custo total, quantidade total]
+
+    def _add(self, record):
+        quantity = record['quantity'] * self.base_units[record['unit']]
+        if quantity > 0 and record.get('food_id') is not None:
+            totals = self._totals.setdefault(record['food_id'], [0.0, 0.0])
+            totals[0] += record['cost']
+            totals[1] += quantity
+
+    def _refresh(self, storage):
+        signature = storage.signature(COST_FILE_KEY)
+        if storage is not self._storage or signature != self._signature:
+            self._totals = {
+                food_id: list(totals)
+                for food_id, totals in storage.cost_totals(self.base_units).items()
+            }
+            self._storage, self._signature = storage, signature
+
+    def record(self, storage, records, signatures):
+        """Soma entradas recém-acrescentadas; signatures é o par (antes, depois) de storage.append.
+
+        Se o índice não estava na versão anterior, é remontado na próxima consulta.
+        """
+        before, after = signatures
+        with self._lock:
+            if storage is self._storage and before == self._signature:
+                for record in records:
+                    self._add(record)
+                self._signature = after
+            else:
+                self._signature = None
+
+    def totals(self, food_id, storage):
+        """(custo total, quantidade total na unidade base) das entradas do alimento."""
+        with self._lock:
+            self._refresh(storage)
+            return tuple(self._totals.get(food_id, (0.0, 0.0)))
+
+    def average_cost(self, food_id, storage):
+        """Custo médio ponderado por unidade base; None se o alimento não tem entradas."""
+        cost, quantity = self.totals(food_id, storage)
+        return cost / quantity if quantity > 0 else None
+
+    def average_costs(self, storage):
+        """Custo médio ponderado de todos os alimentos com entradas, por ID."""
+        with self._lock:
+            self._refresh(storage)
+            return {
+                food_id: cost / quantity
+                for food_id, (cost, quantity) in self._totals.items()
+                if quantity > 0
+            }
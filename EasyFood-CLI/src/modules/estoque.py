@@ -1,4 +1,5 @@
 from src.modules.utils import *
+from src.modules.storage import MovementFilter
 from tabulate import tabulate
 
 def manage_stock():
@@ -61,17 +62,16 @@ def add_stock_entry():
     cost = format_decimal(cost)
     
     # Registra a entrada
-    entries = load_data('stock_entries', StockEntry)
-    entries.append(StockEntry(
+    append_data([StockEntry(
         food.name,
         quantity,
         food.unit,
         cost,
         date,
-        supplier.name
-    ))
-    
-    save_data(entries, 'stock_entries')
+        supplier.name,
+        food_id=food.id,
+        supplier_id=supplier.id
+    )], 'stock_entries')
     print("\n✅ Entrada registrada!")
 
 def add_stock_exit():
@@ -105,27 +105,36 @@ def add_stock_exit():
     
     # Convert to base units
     converted_qty = quantity * BASE_UNITS[food.unit]
-    if food.quantity_in_stock < converted_qty:
+
+    def take_from_stock(current_foods):
+        # Reaplicada sobre os dados atuais se outro processo gravar no meio
+        current = next((f for f in current_foods if f.id == food.id), None)
+        if current is None or current.quantity_in_stock < converted_qty:
+            return False
+        current.quantity_in_stock -= converted_qty
+
+    if not update_data('foods', Food, take_from_stock):
         print("❌ Estoque insuficiente!")
         return
-    
-    food.quantity_in_stock -= converted_qty
-    exits = load_data('stock_exits', StockExit)
-    exits.append(StockExit(
+    append_data([StockExit(
     food.name,
     quantity,
     food.unit,  # Movido para 3ª posição
     date,
-    reason
-    ))
-    
-    save_data(foods, 'foods')
-    save_data(exits, 'stock_exits')
+    reason,
+    food_id=food.id
+    )], 'stock_exits')
     print("\n✅ Saída registrada!")
 
 def list_stock_movements():
-    entries = load_data('stock_entries', StockEntry)
-    exits = load_data('stock_exits', StockExit)
+    print("\nPeríodo (Enter para todo o histórico)")
+    start = get_input("Data inicial (dd/mm/aaaa): ", validate_date, '')
+    end = get_input("Data final (dd/mm/aaaa): ", validate_date, '')
+    period = MovementFilter.between(start, end)
+    
+    # Lidos em streaming: só as movimentações do período são carregadas
+    entries = iter_data('stock_entries', StockEntry, filter=period)
+    exits = iter_data('stock_exits', StockExit, filter=period)
     
     print("\n=== ENTRADAS ===")
     entry_data = [
@@ -0,0 +1,59 @@
+# src/modules/forecast.py
+from datetime import date
+import numpy as np
+
+# Dias de saídas considerados, janela da média móvel e span da média exponencial
+HISTORY_DAYS = 90
+ROLLING_WINDOW = 30
+EWMA_SPAN = 14
+# Rupturas além deste horizonte (dias) não são datadas
+MAX_FORECAST_DAYS = 3650
+
+
+class ConsumptionForecast:
+    """Previsão de consumo (média móvel e exponencial) e de ruptura de todos os alimentos de uma vez."""
+
+    def __init__(self, food_ids, series, end, history_days=HISTORY_DAYS,
+                 window=ROLLING_WINDOW, span=EWMA_SPAN):
+        self.food_ids = list(food_ids)
+        self.end = end
+        rows = {food_id: row for row, food_id in enumerate(self.food_ids)}
+        first = end - history_days + 1
+
+        # Saídas de cada alimento (food_id, ordinais, quantidades) -> matriz diária
+        series = [(rows[food_id], dates, quantities) for food_id, dates, quantities in series
+                  if food_id in rows]
+        self.daily = np.zeros((len(self.food_ids), history_days))
+        if series:
+            food_rows = np.repeat([row for row, _, _ in series], [len(dates) for _, dates, _ in series])
+            days = np.concatenate([dates for _, dates, _ in series]) - first
+            quantities = np.concatenate([quantities for _, _, quantities in series])
+            inside = (days >= 0) & (days < history_days)
+            np.add.at(self.daily, (food_rows[inside], days[inside]), quantities[inside])
+
+        window = min(window, history_days)
+        self.rolling = self.daily[:, -window:].sum(axis=1) / window
+        alpha = 2 / (span + 1)
+        weights = alpha * (1 - alpha) ** np.arange(history_days - 1, -1, -1)
+        self.ewma = self.daily @ (weights / weights.sum())
+
+    @classmethod
+    def from_movements(cls, movement_index, storage, food_ids, end, history_days=HISTORY_DAYS, **kwargs):
+        """Previsão a partir do índice de movimentações (lê só as saídas do histórico)."""
+        series = movement_index.series(storage, 'stock_exits', end - history_days + 1, end)
+        return cls(food_ids, series, end, history_days, **kwargs)
+
+    def days_left(self, stock, rates=None):
+        """Dias até acabar o estoque, na ordem de food_ids (inf sem consumo); rates padrão = EWMA."""
+        rates = self.ewma if rates is None else np.asarray(rates, dtype=float)
+        stock = np.asarray(stock, dtype=float)
+        days = np.full(len(stock), np.inf)
+        np.divide(stock, rates, out=days, where=rates > 0)
+        return days
+
+    def stockout_dates(self, stock, rates=None):
+        """Data prevista de ruptura de cada alimento (None sem consumo ou além de MAX_FORECAST_DAYS)."""
+        return [
+            date.fromordinal(self.end + int(days)) if days <= MAX_FORECAST_DAYS else None
+            for days in self.days_left(stock, rates)
+        ]
@@ -1,9 +1,10 @@
 # src/modules/fornecedores.py
 from src.modules.utils import (
-    Supplier, StockEntry,
+    Supplier,
     load_data, save_data, get_input,
     select_from_list, clear_screen, TIPOS_FORNECEDORES
 )
+from src.modules.references import next_id
 
 def manage_suppliers():
     while True:
@@ -40,7 +41,7 @@ def add_supplier():
     location = get_input("Localização (ex: Av. Principal, 123): ", lambda x: len(x) > 0)
 
     suppliers = load_data('suppliers', Supplier)
-    suppliers.append(Supplier(name, type_, location))
+    suppliers.append(Supplier(name, type_, location, id=next_id(suppliers)))
     save_data(suppliers, 'suppliers')
     print("\n✅ Fornecedor cadastrado com sucesso!")
 
@@ -60,14 +61,7 @@ def edit_supplier():
     new_type = get_input(f"Tipo ({supplier.type}): ", lambda x: x in TIPOS_FORNECEDORES, default=supplier.type)
     new_location = get_input(f"Localização atual ({supplier.location}): ", default=supplier.location)
     
-    if new_name != old_name:
-        # Atualizar histórico de entradas
-        entries = load_data('stock_entries', StockEntry)
-        for entry in entries:
-            if entry.supplier == old_name:
-                entry.supplier = new_name
-        save_data(entries, 'stock_entries')
-    
+    # As entradas referenciam o fornecedor pelo ID: renomear altera apenas o cadastro
     supplier.name = new_name
     supplier.type = new_type
     supplier.location = new_location
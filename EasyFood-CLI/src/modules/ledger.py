@@ -0,0 +1,155 @@
+# src/modules/ledger.py
+from array import array
+from datetime import date, datetime
+
+DATE_FORMAT = '%d/%m/%Y'
+NO_ID = -1       # Código de ID ausente (None)
+NO_DATE = 0      # Ordinal de data que não segue DATE_FORMAT (texto guardado à parte)
+
+# Tipo de coluna de cada campo das movimentações
+LEDGER_FIELDS = {
+    'quantity': 'float',
+    'cost': 'float',
+    'date': 'date',
+    'food_name': 'text',
+    'unit': 'text',
+    'supplier': 'text',
+    'reason': 'text',
+    'food_id': 'id',
+    'supplier_id': 'id',
+}
+TYPECODES = {'float': 'd', 'date': 'i', 'text': 'i', 'id': 'i'}
+
+
+class StockLedger:
+    """Movimentações de estoque em colunas (array), com os textos repetidos internados.
+
+    Iterar produz os StockEntry/StockExit de sempre, criados sob demanda.
+    """
+
+    def __init__(self, record_type, items=()):
+        self.record_type = record_type
+        self.fields = tuple(record_type.__slots__)
+        self.columns = {
+            field: array(TYPECODES[LEDGER_FIELDS[field]]) for field in self.fields
+        }
+        self._strings = []       # código -> texto
+        self._codes = {}         # texto -> código
+        self._raw_dates = {}     # posição -> data em formato livre
+        self._date_text = {}     # ordinal -> texto (memória dos já formatados)
+        self._date_codes = {}    # texto -> ordinal (memória dos já interpretados)
+        encoders = {
+            'float': float,
+            'date': self._encode_date,
+            'id': lambda value: NO_ID if value is None else value,
+            'text': self._intern,
+        }
+        self._encoders = [
+            (field, self.columns[field].append, encoders[LEDGER_FIELDS[field]])
+            for field in self.fields
+        ]
+        self.extend(items)
+
+    @classmethod
+    def from_records(cls, record_type, records):
+        """Monta o ledger diretamente dos dicionários do backend."""
+        ledger = cls(record_type)
+        for record in records:
+            ledger.append_record(record)
+        return ledger
+
+    # ---------- codificação ----------
+    def _intern(self, value):
+        code = self._codes.get(value)
+        if code is None:
+            code = len(self._strings)
+            self._codes[value] = code
+            self._strings.append(value)
+        return code
+
+    def _encode_date(self, value):
+        ordinal = self._date_codes.get(value)
+        if ordinal is not None:
+            return ordinal
+        try:
+            ordinal = datetime.strptime(value, DATE_FORMAT).toordinal()
+        except (TypeError, ValueError):
+            ordinal = NO_DATE
+        if ordinal != NO_DATE and self._format_date(ordinal) == value:
+            self._date_codes[value] = ordinal
+            return ordinal
+        self._raw_dates[len(self)] = value  # Preserva o texto original
+        return NO_DATE
+
+    def _format_date(self, ordinal):
+        text = self._date_text.get(ordinal)
+        if text is None:
+            text = date.fromordinal(ordinal).strftime(DATE_FORMAT)
+            self._date_text[ordinal] = text
+        return text
+
+    def _decode(self, field, index):
+        kind = LEDGER_FIELDS[field]
+        value = self.columns[field][index]
+        if kind == 'float':
+            return value
+        if kind == 'date':
+            return self._raw_dates[index] if value == NO_DATE else self._format_date(value)
+        if kind == 'id':
+            return None if value == NO_ID else value
+        return self._strings[value]
+
+    # ---------- escrita ----------
+    def append_record(self, record):
+        """Acrescenta uma movimentação a partir de um dicionário."""
+        # Codifica tudo antes de gravar: uma data em formato livre usa len(self)
+        encoded = [(append, encode(record.get(field))) for field, append, encode in self._encoders]
+        for append, value in encoded:
+            append(value)
+
+    def append(self, item):
+        self.append_record(item.to_dict())
+
+    def extend(self, items):
+        for item in items:
+            self.append(item)
+
+    def resolve(self, id_field, name_field, names):
+        """Substitui os nomes pelos atuais a partir dos IDs (ver references.py)."""
+        ids = self.columns[id_field]
+        names_column = self.columns[name_field]
+        codes = {ref_id: self._intern(name) for ref_id, name in names.items()}
+        for index, ref_id in enumerate(ids):
+            code = codes.get(ref_id)
+            if code is not None:
+                names_column[index] = code
+
+    # ---------- leitura ----------
+    def __len__(self):
+        return len(self.columns[self.fields[0]])
+
+    def record(self, index):
+        """Movimentação na posição index, como dicionário."""
+        return {field: self._decode(field, index) for field in self.fields}
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError('posição fora do ledger')
+        return self.record_type(**self.record(index))
+
+    def __iter__(self):
+        for index in range(len(self)):
+            yield self.record_type(**self.record(index))
+
+    def to_dicts(self):
+        return [self.record(index) for index in range(len(self))]
+
+    def column(self, field):
+        """Coluna numérica bruta (quantity, cost, date como ordinais, IDs)."""
+        if LEDGER_FIELDS[field] == 'text':
+            raise ValueError(f"'{field}' é uma coluna codificada; use o valor dos objetos")
+        return self.columns[field]
@@ -0,0 +1,61 @@
+# src/modules/nutrition.py
+import numpy as np
+
+# Colunas da matriz de nutrientes (valores por porção em Food)
+NUTRIENTS = ('calories', 'proteins', 'carbs', 'fats')
+
+
+class NutritionEngine:
+    """Totais nutricionais das refeições por produto de matrizes (porções x nutrientes por porção)."""
+
+    def __init__(self, foods, meals, base_units):
+        self.foods = list(foods)
+        self.meals = list(meals)
+        columns = {food.id: column for column, food in enumerate(self.foods) if food.id is not None}
+        by_name = {food.name: column for column, food in enumerate(self.foods)}
+
+        # Itens reconhecidos: (refeição, coluna do alimento, quantidade na unidade base)
+        item_meals, item_columns, item_quantities = [], [], []
+        for row, meal in enumerate(self.meals):
+            for item in meal.foods:
+                column = columns.get(item.get('food_id'), by_name.get(item['food_name']))
+                if column is None:
+                    continue
+                item_meals.append(row)
+                item_columns.append(column)
+                item_quantities.append(item['quantity'] * base_units[item['unit']])
+
+        self.item_meals = np.array(item_meals, dtype=np.intp)
+        self.item_columns = np.array(item_columns, dtype=np.intp)
+        portion_sizes = np.array(
+            [food.quantity_per_portion * base_units[food.unit] for food in self.foods], dtype=float
+        )
+        food_units = np.array([base_units[food.unit] for food in self.foods], dtype=float)
+        base_quantities = np.array(item_quantities, dtype=float)
+        # Quantidade de cada item na unidade do alimento (para exibição) e em porções
+        self.item_quantities = base_quantities / food_units[self.item_columns]
+        self.item_portions = base_quantities / portion_sizes[self.item_columns]
+
+        self.nutrients = np.array(
+            [[getattr(food, nutrient) for nutrient in NUTRIENTS] for food in self.foods], dtype=float
+        ).reshape(len(self.foods), len(NUTRIENTS))
+        self.quantities = np.zeros((len(self.meals), len(self.foods)))
+        np.add.at(self.quantities, (self.item_meals, self.item_columns), self.item_portions)
+        self.meal_totals = self.quantities @ self.nutrients
+
+    def meal_items(self, row):
+        """Itens da refeição na posição row: [(alimento, quantidade na unidade do alimento, nutrientes)]."""
+        positions = np.flatnonzero(self.item_meals == row)
+        values = self.item_portions[positions, None] * self.nutrients[self.item_columns[positions]]
+        return [
+            (self.foods[self.item_columns[position]], self.item_quantities[position], value)
+            for position, value in zip(positions, values)
+        ]
+
+    def projections(self, horizons):
+        """Totais por refeição em cada horizonte (dias): array horizontes x refeições x NUTRIENTS."""
+        return np.multiply.outer(np.asarray(horizons, dtype=float), self.meal_totals)
+
+    def daily_total(self):
+        """Soma diária de todas as refeições, por nutriente."""
+        return self.meal_totals.sum(axis=0)
@@ -68,7 +68,8 @@ def add_meal():
             meal_foods.append({
                 'food_name': food.name,
                 'quantity': quantity,
-                'unit': food_unit  # Use the food's registered unit
+                'unit': food_unit,  # Use the food's registered unit
+                'food_id': food.id
             })
             
         elif op == '2':
@@ -120,7 +121,8 @@ def edit_meal():
                 meal.foods.append({
                     'food_name': food.name,
                     'quantity': quantity,
-                    'unit': unit
+                    'unit': unit,
+                    'food_id': food.id
                 })
                 
         elif op == '2':
@@ -142,7 +144,8 @@ def edit_meal():
             meal.foods[idx] = {
                 'food_name': item['food_name'],
                 'quantity': new_quantity,
-                'unit': new_unit
+                'unit': new_unit,
+                'food_id': item.get('food_id')
             }
             
         elif op == '3':
@@ -2,7 +2,9 @@ from src.modules.utils import clear_screen
 from .reports import (
     generate_nutrition_report,
     generate_financial_report,
-    generate_stock_report
+    generate_stock_report,
+    generate_forecast_report,
+    generate_inventory_report
 )
 
 def generate_reports():
@@ -12,7 +14,9 @@ def generate_reports():
         print("1. Nutricional Diário")
         print("2. Consumo de Estoque")
         print("3. Financeiro")
-        print("4. Voltar")
+        print("4. Custo FIFO e Valor do Estoque")
+        print("5. Previsão de Consumo")
+        print("6. Voltar")
         
         choice = input("Escolha uma opção: ").strip()
         
@@ -23,6 +27,10 @@ def generate_reports():
         elif choice == '3':
             generate_financial_report()
         elif choice == '4':
+            generate_inventory_report()
+        elif choice == '5':
+            generate_forecast_report()
+        elif choice == '6':
             break
         else:
             print("Opção inválida!")
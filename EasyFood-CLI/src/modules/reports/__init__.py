@@ -1,9 +1,18 @@
-from .nutrition import generate_nutrition_report
-from .financial import generate_financial_report
-from .stock import generate_stock_report
+from importlib import import_module
 
-__all__ = [
-    'generate_nutrition_report',
-    'generate_financial_report',
-    'generate_stock_report'
-]
\ No newline at end of file
+# Cada relatório é importado só quando usado: os subcomandos de main.py
+# carregam apenas o relatório pedido (o de nutrição, por exemplo, traz o NumPy)
+_MODULES = {
+    'generate_nutrition_report': '.nutrition',
+    'generate_financial_report': '.financial',
+    'generate_stock_report': '.stock',
+    'generate_forecast_report': '.stock',
+    'generate_inventory_report': '.inventory'
+}
+
+__all__ = list(_MODULES)
+
+def __getattr__(name):
+    if name in _MODULES:
+        return getattr(import_module(_MODULES[name], __name__), name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
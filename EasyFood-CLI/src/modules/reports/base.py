@@ -1,21 +1,38 @@
+from collections import namedtuple
 from tabulate import tabulate
-from collections import defaultdict
-from src.modules.utils import load_data, BASE_UNITS, Food, Meal, StockEntry
+from src.modules.utils import get_storage, get_input, validate_date
+from src.modules.storage import date_ordinal
+from src.modules.report_cache import get_report_cache
 
-def get_food_cost_data():
-    stock_entries = load_data('stock_entries', StockEntry)
-    food_cost_data = defaultdict(list)
-    
-    for entry in stock_entries:
-        quantity = entry.quantity * BASE_UNITS[entry.unit]
-        if quantity > 0:
-            food_cost_data[entry.food_name].append({
-                'cost_per_unit': entry.cost / quantity,
-                'quantity': quantity
-            })
-    return food_cost_data
+# Tabela de um relatório com valores sem formatação (números, textos ou None),
+# usada pela tela interativa e pelas saídas json/csv/tabela dos subcomandos
+ReportTable = namedtuple('ReportTable', ['title', 'headers', 'rows'])
+
+def format_table(title, headers, data, table_style="grid"):
+    return f"\n{title}\n{tabulate(data, headers=headers, tablefmt=table_style)}\n"
 
 def print_table(title, headers, data, table_style="grid"):
-    print(f"\n{title}")
-    print(tabulate(data, headers=headers, tablefmt=table_style))
-    print()
\ No newline at end of file
+    print(format_table(title, headers, data, table_style))
+
+def show_report(report, file_keys, build, *params):
+    """Mostra o relatório, do cache se os dados (file_keys) e params não mudaram."""
+    print(get_report_cache().get(report, file_keys, lambda: build(*params), get_storage(), params))
+    input("\nPressione Enter para voltar...")
+
+def collect_report(report, file_keys, collect, *params):
+    """Tabelas do relatório (ReportTable), do cache se os dados e params não mudaram."""
+    tables = get_report_cache().get(
+        f"{report}-data", file_keys, lambda: [list(table) for table in collect(*params)], get_storage(), params
+    )
+    return [ReportTable(*table) for table in tables]
+
+def ask_period(subject):
+    """Pede o período do relatório; datas vazias = sem limite."""
+    start_date = get_input(f"Início do período {subject} (dd/mm/aaaa, Enter = desde o início): ", validate_date, '')
+    end_date = get_input(f"Fim do período {subject} (dd/mm/aaaa, Enter = sem limite): ", validate_date, '')
+    return start_date, end_date
+
+def period_ordinals(start_date, end_date):
+    """Datas 'dd/mm/aaaa' do período em ordinais (None = sem limite)."""
+    return (date_ordinal(start_date) if start_date else None,
+            date_ordinal(end_date) if end_date else None)
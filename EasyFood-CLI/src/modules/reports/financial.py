@@ -1,82 +1,82 @@
-from .base import print_table, get_food_cost_data
-from src.modules.utils import load_data, Meal, BASE_UNITS, StockEntry, Food
-from collections import defaultdict
+from .base import ReportTable, show_report, ask_period, period_ordinals
+from src.modules.utils import load_data, get_storage, cost_index, movement_index, Meal, BASE_UNITS, Food
+
+
+# Conjuntos de dados lidos pelo relatório (invalidam o cache quando mudam)
+FINANCIAL_FILES = ('foods', 'meals', 'stock_entries')
+HORIZONS = [(1, "Diária"), (7, "Semanal"), (30, "Mensal")]
 
 
 def generate_financial_report():
+    print("\n💵 Relatório Financeiro")
+    start_date, end_date = ask_period("das compras")
+    show_report('financial', FINANCIAL_FILES, build_financial_report, start_date, end_date)
+
+
+def collect_financial_report(start_date='', end_date=''):
+    """Tabelas do relatório: custo de cada item das refeições e projeções por refeição."""
     foods = {f.name: f for f in load_data('foods', Food)}
     meals = load_data('meals', Meal)
-    stock_entries = load_data('stock_entries', StockEntry)
 
-    # Calcular custos médios por alimento
-    food_cost_data = defaultdict(list)
-    for entry in stock_entries:
-        quantity = entry.quantity * BASE_UNITS[entry.unit]
-        if quantity > 0:
-            food_cost_data[entry.food_name].append({
-                'cost_per_unit': entry.cost / quantity,
-                'quantity': quantity
-            })
+    if start_date or end_date:
+        # Custo médio só das entradas do período (busca binária por alimento)
+        start, end = period_ordinals(start_date, end_date)
+        average_costs = movement_index.average_costs(get_storage(), start, end)
+    else:
+        # Custo médio ponderado por alimento (índice mantido a cada entrada registrada)
+        average_costs = cost_index.average_costs(get_storage())
 
     # Calcular custos detalhados por refeição
-    meal_costs = {}
-    print("\n💵 Relatório Financeiro Detalhado")
-
+    items = []
+    meal_costs = []
     for meal in meals:
         total_cost = 0.0
-        meal_details = []
-        
         for item in meal.foods:
             food = foods.get(item['food_name'])
-            if not food or not food_cost_data.get(food.name):
+            if not food or food.id not in average_costs:
                 continue
-
-            # Calcular média ponderada
-            total_cost_spent = sum(e['cost_per_unit'] * e['quantity'] for e in food_cost_data[food.name])
-            total_quantity = sum(e['quantity'] for e in food_cost_data[food.name])
-            avg_cost = total_cost_spent / total_quantity if total_quantity > 0 else 0
+            avg_cost = average_costs[food.id]
 
             # Converter quantidade para unidade base
             required = item['quantity'] * BASE_UNITS[item['unit']]
             item_cost = avg_cost * required
-
-            # Armazenar detalhes
-            meal_details.append({
-                'name': food.name,
-                'quantity': f"{required/BASE_UNITS[food.unit]:.2f}{food.unit}",
-                'cost': item_cost
-            })
+            items.append([meal.name, food.name, required / BASE_UNITS[food.unit], food.unit,
+                          avg_cost * BASE_UNITS[food.unit], item_cost])
             total_cost += item_cost
+        meal_costs.append([meal.name] + [total_cost * days for days, _ in HORIZONS])
 
-        # Armazenar custo da refeição
-        meal_costs[meal.name] = total_cost
-
-        # Mostrar detalhes da refeição
-        print(f"\n🍽 {meal.name}")
-        for detail in meal_details:
-            print(f"  - {detail['name']}: {detail['quantity']} (R$ {detail['cost']:.2f})")
-        print(f"  TOTAL: R$ {total_cost:.2f}")
+    meal_costs.append(["TOTAL"] + [sum(row[column] for row in meal_costs) for column in range(1, len(HORIZONS) + 1)])
+    return [
+        ReportTable("Custos por Refeição", ["Refeição", "Item", "Quantidade", "Unidade", "Custo Unitário", "Custo"], items),
+        ReportTable("Projeções", ["Refeição"] + [period for _, period in HORIZONS], meal_costs)
+    ]
 
-    # Calcular totais
-    daily_total = sum(meal_costs.values())
 
-    # Projeções
-    print("\n\n📅 Projeção Diária:")
-    for meal_name, cost in meal_costs.items():
-        print(f"{meal_name}: R$ {cost:.2f}")
-    print("========================")
-    print(f"TOTAL DIÁRIO: R$ {daily_total:.2f}")
+def build_financial_report(start_date='', end_date=''):
+    output = []
+    items, projections = collect_financial_report(start_date, end_date)
+    output.append("\n💵 Relatório Financeiro Detalhado")
+    if start_date or end_date:
+        output.append(f"Custos das compras de {start_date or 'início'} a {end_date or 'fim'}")
 
-    print("\n🔄 Projeção Semanal (7 dias):")
-    for meal_name, cost in meal_costs.items():
-        print(f"{meal_name}: R$ {cost * 7:.2f}")
-    print("========================")
-    print(f"TOTAL SEMANAL: R$ {daily_total * 7:.2f}")
+    # Mostrar detalhes de cada refeição
+    meal_costs = projections.rows[:-1]
+    for meal_name, daily_cost, *_ in meal_costs:
+        output.append(f"\n🍽 {meal_name}")
+        for item_meal, name, quantity, unit, _, cost in items.rows:
+            if item_meal == meal_name:
+                output.append(f"  - {name}: {quantity:.2f}{unit} (R$ {cost:.2f})")
+        output.append(f"  TOTAL: R$ {daily_cost:.2f}")
 
-    print("\n📅 Projeção Mensal (30 dias):")
-    for meal_name, cost in meal_costs.items():
-        print(f"{meal_name}: R$ {cost * 30:.2f}")
-    print("========================")
-    print(f"TOTAL MENSAL: R$ {daily_total * 30:.2f}")
+    # Projeções (uma coluna da tabela para cada horizonte)
+    sections = [("\n\n📅 Projeção Diária:", "TOTAL DIÁRIO"),
+                ("\n🔄 Projeção Semanal (7 dias):", "TOTAL SEMANAL"),
+                ("\n📅 Projeção Mensal (30 dias):", "TOTAL MENSAL")]
+    for column, (label, total_label) in enumerate(sections, start=1):
+        output.append(label)
+        for row in meal_costs:
+            output.append(f"{row[0]}: R$ {row[column]:.2f}")
+        output.append("========================")
+        output.append(f"{total_label}: R$ {projections.rows[-1][column]:.2f}")
 
-    input("\nPressione Enter para voltar...")
\ No newline at end of file
+    return "\n".join(output)
@@ -0,0 +1,76 @@
+from datetime import datetime
+from .base import ReportTable, format_table, show_report
+from src.modules.utils import load_data, get_storage, get_input, validate_date, Food, BASE_UNITS
+from src.modules.storage import date_ordinal
+from src.modules.lots import FifoCosting
+
+# Conjuntos de dados lidos pelo relatório (invalidam o cache quando mudam)
+INVENTORY_FILES = ('foods', 'stock_entries', 'stock_exits')
+
+def generate_inventory_report():
+    print("\n📦 Custo FIFO e Valor do Estoque")
+    start_date = get_input("Início do período (dd/mm/aaaa, Enter = desde o início): ", validate_date, '')
+    end_date = get_input("Fim do período (dd/mm/aaaa, Enter = hoje): ", validate_date, datetime.now().strftime('%d/%m/%Y'))
+    show_report('inventory', INVENTORY_FILES, build_inventory_report, start_date, end_date)
+
+def collect_inventory_report(start_date, end_date):
+    """Tabelas do relatório: custo das mercadorias usadas, valor do estoque em lotes e saídas sem custo."""
+    start = date_ordinal(start_date) if start_date else None
+    end = date_ordinal(end_date)
+
+    foods = {f.id: f for f in load_data('foods', Food)}
+    # Uma passagem pelo histórico: lotes consumidos em ordem de entrada
+    costing = FifoCosting.from_storage(get_storage(), BASE_UNITS)
+
+    def food_row(food_id, quantity):
+        food = foods.get(food_id)
+        name, unit = (food.name, food.unit) if food else (f"#{food_id}", 'g')
+        return [name, quantity / BASE_UNITS[unit], unit]
+
+    # Custo das mercadorias usadas no período, por alimento
+    used = sorted(
+        (food_row(food_id, quantity) + [cost] for food_id, (quantity, cost) in costing.cost_of_goods(start, end).items()),
+        key=lambda row: row[0]
+    )
+    used.append(["TOTAL", None, None, sum(row[3] for row in used)])
+    months = [[month, cost] for month, cost in costing.cost_by_month(start, end).items()]
+
+    # Valor do estoque em lotes na data final
+    stock = sorted(
+        (food_row(food_id, quantity) + [value] for food_id, (quantity, value) in costing.inventory(end).items()),
+        key=lambda row: row[0]
+    )
+    stock.append(["TOTAL", None, None, costing.inventory_value(end)])
+    uncosted = [food_row(food_id, quantity) for food_id, quantity in costing.uncosted.items()]
+
+    period = f"{start_date or 'início'} a {end_date}"
+    return [
+        ReportTable(f"Custo das Mercadorias Usadas ({period})", ["Item", "Quantidade", "Unidade", "Custo"], used),
+        ReportTable("Custo por Mês", ["Mês", "Custo"], months),
+        ReportTable(f"Valor do Estoque a Custo em {end_date}", ["Item", "Quantidade em Lotes", "Unidade", "Valor"], stock),
+        ReportTable("Saídas sem Custo", ["Item", "Quantidade", "Unidade"], uncosted)
+    ]
+
+def _format_rows(rows):
+    # [item, quantidade, unidade, custo] -> [item, quantidade com unidade, R$]
+    return [
+        [name, f"{quantity:.2f}{unit}" if quantity is not None else "", f"R$ {cost:.2f}"]
+        for name, quantity, unit, cost in rows
+    ]
+
+def build_inventory_report(start_date, end_date):
+    output = []
+    used, months, stock, uncosted = collect_inventory_report(start_date, end_date)
+
+    output.append(format_table(f"💵 {used.title}", ["Item", "Quantidade", "Custo"], _format_rows(used.rows)))
+    if months.rows:
+        output.append(format_table("📅 Custo por Mês", months.headers,
+                                   [[month, f"R$ {cost:.2f}"] for month, cost in months.rows]))
+    output.append(format_table(f"📦 {stock.title}", ["Item", "Quantidade em Lotes", "Valor"], _format_rows(stock.rows)))
+
+    if uncosted.rows:
+        output.append("⚠️ Saídas sem entrada correspondente no histórico não entram no custo:")
+        for name, quantity, unit in uncosted.rows:
+            output.append(f"  - {name}: {quantity:.2f}{unit}")
+
+    return "\n".join(output)
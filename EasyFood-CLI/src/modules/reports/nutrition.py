@@ -1,105 +1,59 @@
-from .base import print_table
+from .base import ReportTable, format_table, show_report
 from src.modules.utils import load_data, Food, Meal, BASE_UNITS
+from src.modules.nutrition import NutritionEngine
+
+# Conjuntos de dados lidos pelo relatório (invalidam o cache quando mudam)
+NUTRITION_FILES = ('foods', 'meals')
+MEAL_HEADERS = ["Item", "Porção", "Unidade", "Calorias", "Proteínas", "Carboidratos", "Gorduras"]
+PROJECTION_HEADERS = ["Refeição", "Frequência", "Calorias", "Proteínas", "Carboidratos", "Gorduras"]
+HORIZONS = [(1, "Diária"), (7, "Semanal"), (30, "Mensal")]
 
 def generate_nutrition_report():
+    show_report('nutrition', NUTRITION_FILES, build_nutrition_report)
+
+def collect_nutrition_report():
+    """Tabelas do relatório: uma por refeição e uma por horizonte de projeção."""
+    tables = []
     meals = load_data('meals', Meal)
-    foods = {f.name: f for f in load_data('foods', Food)}
-    
-    # Nutrition headers
-    nutri_headers = ["Item", "Porção", "Calorias", "Proteínas", "Carboidratos", "Gorduras"]
-    meal_totals = {}
+    foods = load_data('foods', Food)
+    # Totais das refeições e projeções por produto de matrizes
+    engine = NutritionEngine(foods, meals, BASE_UNITS)
 
-    for meal in meals:
-        table_data = []
-        total = {'cal': 0.0, 'prot': 0.0, 'carb': 0.0, 'fat': 0.0}
-        
-        for item in meal.foods:
-            food = foods.get(item['food_name'])
-            if not food:
-                continue
+    for row, meal in enumerate(meals):
+        rows = [
+            [food.name, float(quantity), food.unit] + values.tolist()
+            for food, quantity, values in engine.meal_items(row)
+        ]
+        rows.append(["TOTAL", None, None] + engine.meal_totals[row].tolist())
+        tables.append(ReportTable(meal.name, MEAL_HEADERS, rows))
 
-            base_qty = item['quantity'] * BASE_UNITS[item['unit']]
-            portions = base_qty / (food.quantity_per_portion * BASE_UNITS[food.unit])
-            
-            # Calcular valores como floats primeiro
-            calories = round(portions * food.calories, 1)
-            proteins = round(portions * food.proteins, 1)
-            carbs = round(portions * food.carbs, 1)
-            fats = round(portions * food.fats, 1)
-            
-            row = [
-                food.name,
-                f"{base_qty/BASE_UNITS[food.unit]:.1f}{food.unit}",
-                calories,  # Manter como float para cálculos
-                proteins,
-                carbs,
-                fats
-            ]
-            table_data.append(row)
-            
-            # Acumular totais com floats
-            total['cal'] += calories
-            total['prot'] += proteins
-            total['carb'] += carbs
-            total['fat'] += fats
+    projections = engine.projections([days for days, _ in HORIZONS])
+    for (days, period), totals in zip(HORIZONS, projections):
+        rows = [[meal.name, days] + totals[row].tolist() for row, meal in enumerate(meals)]
+        rows.append(["TOTAL PROJETADO", None] + totals.sum(axis=0).tolist())
+        tables.append(ReportTable(f"Projeção {period} ({days} dias)", PROJECTION_HEADERS, rows))
 
-        # Formatar valores apenas para exibição
-        formatted_data = [
-            [
-                row[0], 
-                row[1], 
-                f"{row[2]:.1f}", 
-                f"{row[3]:.1f}", 
-                f"{row[4]:.1f}", 
-                f"{row[5]:.1f}"
-            ] 
-            for row in table_data
-        ]
-        
-        # Adicionar linha de total formatada
-        formatted_data.append([
-            "TOTAL", 
-            "", 
-            f"{total['cal']:.1f}", 
-            f"{total['prot']:.1f}", 
-            f"{total['carb']:.1f}", 
-            f"{total['fat']:.1f}"
-        ])
-        
-        print_table(f"🍽 {meal.name}", nutri_headers, formatted_data)
-        meal_totals[meal.name] = total
+    return tables
 
-    # Projections
-    proj_headers = ["Refeição", "Frequência", "Calorias", "Proteínas", "Carboidratos", "Gorduras"]
-    
-    for days, period in [(1, "Diária"), (7, "Semanal"), (30, "Mensal")]:
-        proj_data = []
-        grand_total = {'cal': 0.0, 'prot': 0.0, 'carb': 0.0, 'fat': 0.0}
-        
-        for meal_name, totals in meal_totals.items():
-            row = [
-                meal_name,
-                f"{days}x",
-                totals['cal'] * days,
-                totals['prot'] * days,
-                totals['carb'] * days,
-                totals['fat'] * days
+def build_nutrition_report():
+    output = []
+    tables = collect_nutrition_report()
+    # Uma tabela por refeição, seguidas de uma por horizonte de projeção
+    meal_tables = len(tables) - len(HORIZONS)
+    for position, table in enumerate(tables):
+        if position < meal_tables:
+            # Porção com a unidade do alimento; valores com 1 casa decimal
+            formatted_data = [
+                [name, f"{quantity:.1f}{unit}" if quantity is not None else ""] + [f"{value:.1f}" for value in values]
+                for name, quantity, unit, *values in table.rows
+            ]
+            headers = MEAL_HEADERS[:2] + MEAL_HEADERS[3:]
+            output.append(format_table(f"🍽 {table.title}", headers, formatted_data))
+        else:
+            proj_data = [
+                [name, f"{days}x" if days is not None else ""] + [f"{value:.1f}" for value in values]
+                for name, days, *values in table.rows
             ]
-            proj_data.append(row)
-            grand_total['cal'] += row[2]
-            grand_total['prot'] += row[3]
-            grand_total['carb'] += row[4]
-            grand_total['fat'] += row[5]
-        
-        proj_data.append([
-            "TOTAL PROJETADO",
-            "",
-            grand_total['cal'],
-            grand_total['prot'],
-            grand_total['carb'],
-            grand_total['fat']
-        ])
-        
-        print_table(f"📅 Projeção {period} ({days} dias)", proj_headers, proj_data)
+            output.append(format_table(f"📅 {table.title}", PROJECTION_HEADERS, proj_data))
 
-    input("\nPressione Enter para voltar...")
\ No newline at end of file
+    return "\n".join(output)
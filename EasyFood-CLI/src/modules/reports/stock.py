@@ -1,40 +1,125 @@
-from .base import print_table
-from src.modules.utils import load_data, Food, Meal, BASE_UNITS
+from datetime import date
+from .base import ReportTable, format_table, show_report, period_ordinals
+from src.modules.utils import load_data, get_storage, get_input, validate_date, meal_usage_index, movement_index, Food, BASE_UNITS
+from src.modules.storage import date_ordinal
+from src.modules.forecast import ConsumptionForecast, HISTORY_DAYS, ROLLING_WINDOW
+
+# Conjuntos de dados lidos pelo relatório (invalidam o cache quando mudam)
+STOCK_FILES = ('foods', 'meals', 'stock_exits')
+STATUS_ICONS = {"Adequado": "✅", "Crítico": "🔴", "Atenção": "🟡"}
+# Colunas em quantidade por dia e em quantidade, na unidade do alimento
+RATE_COLUMNS = {"Consumo Diário", "Saída Média/dia", f"Média {ROLLING_WINDOW}d", "Média Exponencial"}
+QUANTITY_COLUMNS = {"Estoque Atual", "Saídas no Período"}
 
 def generate_stock_report():
+    print("\n📦 Consumo de Estoque")
+    start_date = get_input("Início do período de saídas (dd/mm/aaaa, Enter = sem período): ", validate_date, '')
+    end_date = ''
+    if start_date:
+        end_date = get_input("Fim do período (dd/mm/aaaa, Enter = hoje): ", validate_date, date.today().strftime('%d/%m/%Y'))
+    show_report('stock', STOCK_FILES, build_stock_report, start_date, end_date)
+
+def generate_forecast_report():
+    # Modo previsão do relatório de estoque: consumo real medido até hoje
+    show_report('stock', STOCK_FILES, build_stock_report, '', '', date.today().strftime('%d/%m/%Y'))
+
+def collect_stock_report(start_date='', end_date='', forecast_date=''):
+    """Tabelas do relatório: estoque e consumo por alimento e itens em unidade incompatível.
+
+    Quantidades na unidade do alimento; duração e ruptura None quando não há consumo.
+    """
     foods = load_data('foods', Food)
-    meals = load_data('meals', Meal)
+    # Consumo diário por alimento (unidade base), do índice invertido das refeições
+    meal_usage = meal_usage_index.daily_usage(get_storage())
     
-    headers = ["Item", "Estoque Atual", "Consumo Diário", "Duração (dias)", "Status"]
-    table_data = []
+    headers = ["Item", "Estoque Atual", "Unidade", "Consumo Diário", "Duração (dias)", "Status"]
+    exits = None
+    if start_date:
+        # Saídas registradas no período, somadas por busca binária em cada alimento
+        start, end = period_ordinals(start_date, end_date)
+        days = max(end - start + 1, 1)
+        exits = movement_index.totals(get_storage(), 'stock_exits', start, end)
+        headers[4:4] = ["Saídas no Período", "Saída Média/dia"]
+
+    # Pular alimentos com estoque zero
+    stocked = [food for food in foods if food.quantity_in_stock > 0]
+    if forecast_date:
+        # Taxas de saída e rupturas de todos os alimentos numa só passada (NumPy)
+        forecast = ConsumptionForecast.from_movements(
+            movement_index, get_storage(), [food.id for food in stocked], date_ordinal(forecast_date)
+        )
+        stockouts = forecast.stockout_dates([food.quantity_in_stock * BASE_UNITS[food.unit] for food in stocked])
+        headers[-1:-1] = [f"Média {ROLLING_WINDOW}d", "Média Exponencial", "Ruptura Prevista"]
+    rows = []
     
-    for food in foods:
-        # Pular alimentos com estoque zero
-        if food.quantity_in_stock <= 0:
-            continue
-            
-        daily_use = 0.0
-        for meal in meals:
-            for item in meal.foods:
-                if item['food_name'] == food.name:
-                    qty = item['quantity'] * BASE_UNITS[item['unit']] / BASE_UNITS[food.unit]
-                    daily_use += qty
+    for position, food in enumerate(stocked):
+        daily_use = meal_usage.get(food.id, 0.0) / BASE_UNITS[food.unit]
         
-        status = "✅ Adequado"
+        status = "Adequado"
         if food.min_stock > 0 and food.quantity_in_stock < food.min_stock:
-            status = "🔴 Crítico"
+            status = "Crítico"
         elif food.quantity_in_stock < food.ideal_stock:
-            status = "🟡 Atenção"
+            status = "Atenção"
             
-        duration = food.quantity_in_stock / daily_use if daily_use > 0 else float('inf')
+        duration = food.quantity_in_stock / daily_use if daily_use > 0 else None
         
-        table_data.append([
-            food.name,
-            f"{food.quantity_in_stock:.1f}{food.unit}",  # Formatado para 1 decimal
-            f"{daily_use:.1f}{food.unit}/dia",
-            f"{duration:.1f}" if duration != float('inf') else "∞",
-            status
-        ])
+        row = [food.name, food.quantity_in_stock, food.unit, daily_use, duration, status]
+        if exits is not None:
+            exited = exits.get(food.id, (0.0, 0.0))[0] / BASE_UNITS[food.unit]
+            row[4:4] = [exited, exited / days]
+        if forecast_date:
+            unit = BASE_UNITS[food.unit]
+            stockout = stockouts[position]
+            row[-1:-1] = [
+                float(forecast.rolling[position]) / unit,
+                float(forecast.ewma[position]) / unit,
+                stockout.strftime('%d/%m/%Y') if stockout else None
+            ]
+        rows.append(row)
+
+    foods_by_id = {food.id: food for food in foods}
+    incompatible = [
+        [meal_name, foods_by_id[food_id].name, unit, foods_by_id[food_id].unit]
+        for meal_name, food_id, unit in meal_usage_index.incompatible(get_storage())
+    ]
+    return [
+        ReportTable("Estoque", headers, rows),
+        ReportTable("Itens em Unidade Incompatível",
+                    ["Refeição", "Item", "Unidade do Item", "Unidade do Alimento"], incompatible)
+    ]
+
+def _format_stock_value(header, value, unit):
+    if header in RATE_COLUMNS:
+        return f"{value:.1f}{unit}/dia"
+    if header in QUANTITY_COLUMNS:
+        return f"{value:.1f}{unit}"  # Formatado para 1 decimal
+    if header == "Duração (dias)":
+        return f"{value:.1f}" if value is not None else "∞"
+    if header == "Ruptura Prevista":
+        return value or "∞"
+    return f"{STATUS_ICONS[value]} {value}"
+
+def build_stock_report(start_date='', end_date='', forecast_date=''):
+    output = []
+    stock, incompatible = collect_stock_report(start_date, end_date, forecast_date)
+    headers = [header for header in stock.headers if header != "Unidade"]
+    table_data = [
+        [row[0]] + [_format_stock_value(header, value, row[2]) for header, value in zip(headers[1:], row[1:2] + row[3:])]
+        for row in stock.rows
+    ]
     
-    print_table("📦 Análise de Estoque (Itens com Estoque)", headers, table_data)
-    input("\nPressione Enter para voltar...")
\ No newline at end of file
+    title = "📦 Análise de Estoque (Itens com Estoque)"
+    if start_date:
+        title += f" - saídas de {start_date} a {end_date}"
+    if forecast_date:
+        title = f"📈 Previsão de Consumo - saídas dos últimos {HISTORY_DAYS} dias até {forecast_date}"
+    output.append(format_table(title, headers, table_data))
+    if forecast_date:
+        output.append("A ruptura prevista usa a média exponencial (dias recentes pesam mais).")
+
+    if incompatible.rows:
+        output.append("⚠️ Itens de refeição em unidade incompatível com a do alimento (fora do consumo):")
+        for meal_name, food_name, unit, food_unit in incompatible.rows:
+            output.append(f"  - {meal_name}: {food_name} em {unit} (alimento em {food_unit})")
+
+    return "\n".join(output)
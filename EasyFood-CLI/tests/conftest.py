@@ -0,0 +1,56 @@
+import os
+import sys
+import shutil
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+
+
+@pytest.fixture
+def data_dir(tmp_path, monkeypatch):
+    """Pasta de trabalho vazia (data/ e config.json relativos a ela), com a configuração padrão."""
+    from src.modules.cache import dataset_cache, ledger_cache, name_index_cache
+    from src.modules.config import reset_config
+
+    (tmp_path / 'data').mkdir()
+    monkeypatch.chdir(tmp_path)
+    for env_var in ('EASYFOOD_STORAGE', 'EASYFOOD_SQLITE_PATH', 'EASYFOOD_CODEC', 'EASYFOOD_CHECKPOINT_INTERVAL'):
+        monkeypatch.delenv(env_var, raising=False)
+    reset_config()
+    dataset_cache.invalidate()
+    ledger_cache.invalidate()
+    name_index_cache.invalidate()
+    yield tmp_path / 'data'
+    dataset_cache.invalidate()
+    ledger_cache.invalidate()
+    name_index_cache.invalidate()
+    reset_config()
+
+
+@pytest.fixture
+def json_storage(data_dir, monkeypatch):
+    """JsonStorage em data_dir, sem checkpoint automático (os testes chamam checkpoint())."""
+    from src.modules.config import reset_config
+    from src.modules.storage import JsonStorage
+    from src.modules.utils import DATA_FILES
+
+    monkeypatch.setenv('EASYFOOD_CHECKPOINT_INTERVAL', '3600')
+    reset_config()
+    storage = JsonStorage(DATA_FILES)
+    yield storage
+    storage.close()
+
+
+@pytest.fixture
+def json_app(data_dir, monkeypatch):
+    """Cópia dos dados de exemplo, usada pelo get_storage() (backend JSON)."""
+    from src.modules import utils
+    from src.modules.references import migrate_ids
+
+    shutil.rmtree(data_dir)
+    shutil.copytree(os.path.join(APP_DIR, 'data'), data_dir)
+    monkeypatch.setattr(utils, '_storage', None)
+    migrate_ids(utils.get_storage())
+    yield utils.get_storage()
+    utils.get_storage().close()
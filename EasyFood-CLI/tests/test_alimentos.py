@@ -0,0 +1,26 @@
+from src.modules.alimentos import remove_food
+from src.modules.utils import load_data, Food, StockEntry, StockExit, Meal
+
+
+def records(file_key, class_type):
+    return [item.to_dict() for item in load_data(file_key, class_type)]
+
+
+def answer(monkeypatch, *inputs):
+    replies = iter(inputs)
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(replies))
+
+
+def test_remove_food_removes_its_references(monkeypatch, json_app):
+    banana = next(food for food in load_data('foods', Food) if food.name == "Banana")
+    entries, exits = records('stock_entries', StockEntry), records('stock_exits', StockExit)
+    answer(monkeypatch, "banana", "s")
+
+    remove_food()
+
+    assert "Banana" not in [food.name for food in load_data('foods', Food)]
+    assert records('stock_entries', StockEntry) == [e for e in entries if e['food_id'] != banana.id]
+    assert records('stock_exits', StockExit) == [e for e in exits if e['food_id'] != banana.id]
+    assert len(entries) - len(records('stock_entries', StockEntry)) == 1
+    for meal in load_data('meals', Meal):
+        assert banana.id not in [item.get('food_id') for item in meal.foods]
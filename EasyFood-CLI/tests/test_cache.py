@@ -0,0 +1,60 @@
+from src.modules.cache import DatasetCache, dataset_cache, ledger_cache
+from src.modules.utils import StockEntry
+from tests.test_wal import ENTRIES
+
+MEALS = [{'name': "Almoço", 'foods': [{'food_name': "Arroz", 'food_id': 1}]}]
+
+
+def test_dataset_cache_reads_again_only_after_a_write(json_storage):
+    cache = DatasetCache()
+    json_storage.save('foods', [{'id': 1, 'name': "Arroz"}])
+    cache.get('foods', json_storage)
+    cache.get('foods', json_storage)
+    assert cache.stats()['by_key']['foods'] == {'hits': 1, 'misses': 1}
+
+    json_storage.save('foods', [{'id': 1, 'name': "Feijão"}])
+
+    assert cache.get('foods', json_storage) == [{'id': 1, 'name': "Feijão"}]
+    assert cache.stats()['by_key']['foods'] == {'hits': 1, 'misses': 2}
+
+
+def test_dataset_cache_isolates_nested_lists(json_storage):
+    json_storage.save('meals', MEALS)
+
+    dataset_cache.get('meals', json_storage)[0]['foods'][0]['food_name'] = "Alterado"
+
+    assert dataset_cache.get('meals', json_storage) == MEALS
+    assert dataset_cache.peek('stock_entries', json_storage) is None
+
+
+def test_ledger_cache_does_not_keep_records(json_storage):
+    json_storage.save('stock_entries', ENTRIES)
+
+    ledger = ledger_cache.get('stock_entries', StockEntry, json_storage)
+
+    assert ledger.to_dicts() == [StockEntry(**record).to_dict() for record in ENTRIES]
+    assert dataset_cache.peek('stock_entries', json_storage) is None
+    assert ledger_cache.get('stock_entries', StockEntry, json_storage) is ledger
+
+
+def test_ledger_cache_rebuilds_after_write(json_storage):
+    json_storage.save('stock_entries', ENTRIES)
+    ledger = ledger_cache.get('stock_entries', StockEntry, json_storage)
+
+    json_storage.append('stock_entries', ENTRIES[:1])
+
+    assert len(ledger_cache.get('stock_entries', StockEntry, json_storage)) == 5
+    assert len(ledger) == 4
+
+
+def test_name_index_is_reused_until_the_names_change(json_app):
+    from src.modules.cache import name_index_cache
+    from src.modules.utils import Food, load_data
+
+    foods = load_data('foods', Food)
+    index = name_index_cache.get(foods)
+    assert name_index_cache.get(load_data('foods', Food)) is index
+
+    foods[0].name = "Outro nome"
+    assert name_index_cache.get(foods) is not index
+    assert name_index_cache.get([Food("Arroz", 'kg', 0, 1, 1, 0, 0, 0)]) is not index
@@ -0,0 +1,34 @@
+import io
+import pytest
+from src.modules.codec import CODECS, decode, iter_file, iter_json_array
+from tests.test_wal import ENTRIES
+
+
+@pytest.mark.parametrize('name', sorted(CODECS))
+def test_codec_round_trip_and_detection(name):
+    if name == 'msgpack':
+        pytest.importorskip('msgpack')
+    content = CODECS[name].dumps(ENTRIES)
+
+    assert decode(content) == ENTRIES
+    assert list(iter_file(io.BufferedReader(io.BytesIO(content)))) == ENTRIES
+
+
+def test_json_stream_handles_items_split_across_chunks():
+    records = ENTRIES + [{'name': "Feijão", 'quantity': 12345.678}]
+    content = CODECS['json'].dumps(records)
+
+    assert list(iter_json_array(io.BytesIO(content), chunk_size=7)) == records
+    assert list(iter_json_array(io.BytesIO(b''))) == []
+
+
+def test_convert_rewrites_every_dataset(json_storage, data_dir):
+    pytest.importorskip('msgpack')
+    json_storage.save('foods', [{'id': 1, 'name': "Arroz"}])
+    json_storage.save('stock_entries', ENTRIES)
+
+    counts = json_storage.convert('msgpack')
+
+    assert counts['foods'] == 1 and counts['stock_entries'] == 4
+    assert (data_dir / 'foods.json').read_bytes()[0] == 0x91
+    assert json_storage.load('stock_entries') == ENTRIES
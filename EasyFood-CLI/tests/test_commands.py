@@ -0,0 +1,67 @@
+import io
+import os
+import csv
+import json
+import shutil
+from src.modules import utils
+from src.modules.commands import run
+from conftest import APP_DIR
+
+
+def data_files(data_dir):
+    return sorted(
+        (os.path.relpath(os.path.join(root, name), data_dir), os.path.getmtime(os.path.join(root, name)))
+        for root, _, names in os.walk(data_dir) for name in names
+    )
+
+
+def run_command(*argv):
+    out = io.StringIO()
+    return run(list(argv), out), out.getvalue()
+
+
+def test_report_on_legacy_data_writes_nothing(data_dir, monkeypatch, capsys):
+    shutil.rmtree(data_dir)
+    shutil.copytree(os.path.join(APP_DIR, 'data'), data_dir)
+    monkeypatch.setattr(utils, '_storage', None)
+    before = data_files(data_dir)
+
+    code, output = run_command('report', 'stock')
+
+    assert code == 1
+    assert output == ""
+    assert "sem argumentos" in capsys.readouterr().err
+    assert data_files(data_dir) == before
+
+
+def test_report_reads_migrated_data_without_writing(json_app, data_dir):
+    json_app.checkpoint()
+    before = data_files(data_dir)
+
+    code, output = run_command('report', 'stock', '--format', 'json')
+
+    assert code == 0
+    report = json.loads(output)
+    assert [table['title'] for table in report['tables']] == ["Estoque"]  # Sem itens incompatíveis
+    assert data_files(data_dir) == before
+
+
+def test_export_filters_by_food(json_app):
+    food_id = json_app.load('stock_entries')[0]['food_id']
+
+    code, output = run_command('export', 'entries', '--food', str(food_id))
+
+    rows = list(csv.DictReader(io.StringIO(output)))
+    assert code == 0
+    assert rows and {row['food_id'] for row in rows} == {str(food_id)}
+
+
+def test_report_without_sqlite_database_fails(data_dir, monkeypatch):
+    monkeypatch.setenv('EASYFOOD_STORAGE', 'sqlite')
+    monkeypatch.setenv('EASYFOOD_SQLITE_PATH', str(data_dir / 'easyfood.db'))
+    from src.modules.config import reset_config
+    reset_config()
+    monkeypatch.setattr(utils, '_storage', None)
+
+    assert run_command('report', 'nutrition')[0] == 1
+    assert not os.path.exists(data_dir / 'easyfood.db')
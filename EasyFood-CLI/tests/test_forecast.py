@@ -0,0 +1,35 @@
+from datetime import date
+import numpy as np
+import pytest
+from src.modules.forecast import ConsumptionForecast
+
+END = date(2025, 3, 31).toordinal()
+
+
+def daily(food_id, days, quantity):
+    dates = np.arange(END - days + 1, END + 1)
+    return food_id, dates, np.full(len(dates), quantity)
+
+
+def test_constant_consumption_forecast():
+    series = [
+        daily(1, 90, 2.0),
+        daily(99, 90, 5.0),                                # Alimento fora da lista
+        (2, np.array([END - 200, END + 1]), np.ones(2)),   # Fora do histórico
+    ]
+
+    forecast = ConsumptionForecast([1, 2], series, END)
+
+    assert forecast.rolling == pytest.approx([2.0, 0.0])
+    assert forecast.ewma == pytest.approx([2.0, 0.0])
+    assert list(forecast.days_left([10.0, 10.0])) == [5.0, np.inf]
+    assert forecast.stockout_dates([10.0, 10.0]) == [date(2025, 4, 5), None]
+
+
+def test_ewma_weighs_recent_days_more():
+    forecast = ConsumptionForecast([1, 2], [daily(1, 7, 4.0), (2, np.array([END - 80]), np.array([28.0]))], END)
+
+    assert forecast.rolling == pytest.approx([28.0 / 30, 0.0])
+    assert forecast.ewma[0] > forecast.rolling[0]
+    assert forecast.ewma[1] < 0.01
+    assert forecast.days_left([5.0, 0.0], rates=[0.0, 1.0]).tolist() == [np.inf, 0.0]
@@ -0,0 +1,48 @@
+import os
+from src.modules.journal import MovementJournal, snapshot_digest
+from tests.test_wal import ENTRIES
+
+
+def digest(path):
+    with open(path, 'rb') as f:
+        return snapshot_digest(f.read())
+
+
+def test_journal_applies_only_to_its_snapshot(tmp_path):
+    snapshot = tmp_path / 'manifest.json'
+    snapshot.write_text('{"partitions": {}}')
+    journal = MovementJournal(str(snapshot))
+
+    journal.append(ENTRIES[:2])
+    journal.append(ENTRIES[2:])
+    assert journal.read(digest(snapshot)) == ENTRIES
+
+    snapshot.write_text('{"partitions": {"2025-01": {}}}')  # Snapshot reescrito: diário antigo
+    assert journal.read(digest(snapshot)) == []
+    journal.append(ENTRIES[:1])
+    assert journal.read(digest(snapshot)) == ENTRIES[:1]
+
+
+def test_torn_line_is_skipped_and_isolated(tmp_path):
+    snapshot = tmp_path / 'manifest.json'
+    snapshot.write_text('{}')
+    journal = MovementJournal(str(snapshot))
+    journal.append(ENTRIES[:1])
+    with open(journal.path, 'a') as f:
+        f.write('{"food_name": "incompl')  # Gravação interrompida
+
+    journal.append(ENTRIES[1:2])
+
+    assert journal.read(digest(snapshot)) == ENTRIES[:2]
+
+
+def test_append_does_not_rewrite_partitions(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.checkpoint()
+    partition = data_dir / 'stock_entries' / '2025-01.json'
+    mtime = os.stat(partition).st_mtime_ns
+
+    json_storage.append('stock_entries', [ENTRIES[0]])
+
+    assert os.stat(partition).st_mtime_ns == mtime
+    assert json_storage.load('stock_entries') == ENTRIES + [ENTRIES[0]]
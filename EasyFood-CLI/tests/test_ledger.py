@@ -0,0 +1,45 @@
+from datetime import date
+import pytest
+from src.modules.ledger import StockLedger
+from src.modules.utils import StockEntry, StockExit
+from tests.test_wal import ENTRIES, entry
+
+
+def test_ledger_round_trips_records():
+    records = ENTRIES + [dict(entry(4, '01/04/2025'), supplier_id=None)]
+
+    ledger = StockLedger.from_records(StockEntry, records)
+
+    assert len(ledger) == 5
+    assert ledger.to_dicts() == records
+    assert [item.to_dict() for item in ledger] == records
+    assert list(ledger.column('date'))[0] == date(2025, 1, 10).toordinal()
+
+
+def test_ledger_keeps_dates_in_other_formats():
+    records = [entry(1, '2025-01-10'), entry(2, '5/1/2025'), entry(3, None), entry(1, '05/01/2025')]
+
+    ledger = StockLedger.from_records(StockEntry, records)
+
+    assert [item.date for item in ledger] == ['2025-01-10', '5/1/2025', None, '05/01/2025']
+
+
+def test_ledger_resolve_renames_by_id():
+    ledger = StockLedger.from_records(StockEntry, ENTRIES)
+
+    ledger.resolve('food_id', 'food_name', {1: "Arroz", 3: "Feijão"})
+
+    assert [item.food_name for item in ledger] == ["Arroz", "Alimento 2", "Arroz", "Feijão"]
+
+
+def test_ledger_indexing_and_slices():
+    exits = [{'food_name': "Arroz", 'quantity': float(n), 'unit': 'kg', 'date': '01/02/2025',
+              'reason': "Consumo", 'food_id': 1} for n in range(5)]
+    ledger = StockLedger(StockExit, [StockExit(**record) for record in exits])
+
+    assert ledger[-1].quantity == 4.0
+    assert [item.quantity for item in ledger[1:4:2]] == [1.0, 3.0]
+    with pytest.raises(IndexError):
+        ledger[5]
+    with pytest.raises(ValueError):
+        ledger.column('reason')
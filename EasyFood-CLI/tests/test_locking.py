@@ -0,0 +1,63 @@
+import os
+import multiprocessing
+import pytest
+
+PROCESSES = 3
+OPERATIONS = 15
+
+
+def writer(data_root, worker, operations):
+    """Processo gravador: soma ao estoque, cadastra fornecedores e registra entradas."""
+    os.chdir(data_root)
+    from src.modules.utils import (Food, Supplier, StockEntry, load_data, save_data,
+                                   update_data, append_data, VersionConflict)
+
+    for number in range(operations):
+        # Leitura-alteração-gravação com verificação de versão, repetida em caso de conflito
+        while True:
+            foods = load_data('foods', Food)
+            foods[0].quantity_in_stock += 1
+            try:
+                save_data(foods, 'foods')
+                break
+            except VersionConflict:
+                pass
+
+        update_data('suppliers', Supplier, lambda suppliers: suppliers.append(
+            Supplier(f"Fornecedor {worker}-{number}", 'outro', '-')
+        ), attempts=10000)
+        append_data([StockEntry('Arroz', 1, 'kg', 1.0, '01/01/2025', '-', food_id=1)], 'stock_entries')
+
+
+@pytest.mark.parametrize('backend', ['json', 'sqlite'])
+def test_concurrent_writers_lose_no_updates(backend, data_dir, monkeypatch):
+    from src.modules import utils
+    from src.modules.config import reset_config
+    from src.modules.utils import Food, Supplier, load_data
+
+    monkeypatch.setenv('EASYFOOD_STORAGE', backend)
+    monkeypatch.setenv('EASYFOOD_SQLITE_PATH', str(data_dir / 'easyfood.db'))
+    # Checkpoints frequentes: exercita também a aplicação do WAL entre processos
+    monkeypatch.setenv('EASYFOOD_CHECKPOINT_INTERVAL', '0.05')
+    reset_config()
+    monkeypatch.setattr(utils, '_storage', None)
+    storage = utils.get_storage()
+    storage.save_many({'foods': [Food('Arroz', 'kg', 0, 1, 1, 0, 0, 0, id=1).to_dict()],
+                       'suppliers': [], 'meals': []})
+
+    context = multiprocessing.get_context('spawn')  # Sem herdar descritores (e travas) do pai
+    workers = [
+        context.Process(target=writer, args=(str(data_dir.parent), worker, OPERATIONS))
+        for worker in range(PROCESSES)
+    ]
+    for process in workers:
+        process.start()
+    for process in workers:
+        process.join()
+    assert [process.exitcode for process in workers] == [0] * PROCESSES
+
+    expected = PROCESSES * OPERATIONS
+    assert load_data('foods', Food)[0].quantity_in_stock == expected
+    assert len(load_data('suppliers', Supplier)) == expected
+    assert storage.count('stock_entries') == expected
+    storage.close()
@@ -0,0 +1,93 @@
+import random
+from datetime import date, timedelta
+import pytest
+from src.modules.lots import FifoCosting
+from src.modules.storage import date_ordinal
+from src.modules.utils import BASE_UNITS
+
+
+def entry(food_id, quantity, cost, day, unit='kg'):
+    return {'food_id': food_id, 'quantity': quantity, 'unit': unit, 'cost': cost, 'date': day}
+
+
+def exit_(food_id, quantity, day, unit='kg'):
+    return {'food_id': food_id, 'quantity': quantity, 'unit': unit, 'date': day}
+
+
+def test_exits_consume_oldest_lots_first():
+    costing = FifoCosting(BASE_UNITS).run(
+        [entry(1, 2, 20.0, '01/01/2025'), entry(1, 2, 40.0, '02/01/2025')],
+        [exit_(1, 3000, '03/01/2025', unit='g')]
+    )
+
+    assert costing.cost_of_goods() == {1: (3000.0, 40.0)}  # 2kg a 10/kg + 1kg a 20/kg
+    assert costing.inventory() == {1: (1000.0, 20.0)}
+
+
+def test_same_day_entry_is_available_to_exit_and_missing_stock_is_uncosted():
+    costing = FifoCosting(BASE_UNITS).run(
+        [entry(1, 1, 10.0, '05/01/2025')],
+        [exit_(1, 3, '05/01/2025'), exit_(1, 1, '04/01/2025')]
+    )
+
+    assert costing.uncosted == {1: 3000.0}  # 1kg antes da entrada + 2kg além do lote
+    assert costing.cost_of_goods() == {1: (1000.0, 10.0)}
+    assert costing.inventory() == {}
+
+
+def test_queries_by_period_and_date():
+    costing = FifoCosting(BASE_UNITS).run(
+        [entry(1, 10, 100.0, '10/01/2025')],
+        [exit_(1, 1, '20/01/2025'), exit_(1, 2, '05/02/2025')]
+    )
+
+    assert costing.cost_by_month() == {'2025-01': 10.0, '2025-02': 20.0}
+    assert costing.cost_of_goods(start=date_ordinal('01/02/2025')) == {1: (2000.0, 20.0)}
+    assert costing.inventory_value(date_ordinal('31/01/2025')) == pytest.approx(90.0)
+    assert costing.inventory_value(date_ordinal('09/01/2025')) == 0
+
+
+def naive_fifo(entries, exits):
+    """Custo total das saídas recalculando cada fila de lotes do zero (referência)."""
+    movements = sorted(
+        [(date_ordinal(r['date']), 0, i, r) for i, r in enumerate(entries)]
+        + [(date_ordinal(r['date']), 1, len(entries) + i, r) for i, r in enumerate(exits)],
+        key=lambda m: m[:3]
+    )
+    lots, total = {}, 0.0
+    for _, kind, _, record in movements:
+        quantity = record['quantity'] * BASE_UNITS[record['unit']]
+        queue = lots.setdefault(record['food_id'], [])
+        if kind == 0:
+            queue.append([quantity, record['cost'] / quantity])
+            continue
+        while quantity > 1e-9 and queue:
+            used = min(quantity, queue[0][0])
+            total += used * queue[0][1]
+            quantity -= used
+            queue[0][0] -= used
+            if queue[0][0] <= 1e-9:
+                queue.pop(0)
+    stock = sum(q * c for queue in lots.values() for q, c in queue)
+    return total, stock
+
+
+def test_matches_reference_on_synthetic_history():
+    rng = random.Random(7)
+    entries, exits = [], []
+    for day in range(120):
+        day_str = (date(2025, 1, 1) + timedelta(days=day)).strftime('%d/%m/%Y')
+        for _ in range(10):
+            food_id = rng.randint(1, 5)
+            if rng.random() < 0.3:
+                quantity = rng.uniform(1, 10)
+                entries.append(entry(food_id, quantity, quantity * rng.uniform(5, 50), day_str))
+            else:
+                exits.append(exit_(food_id, rng.uniform(100, 3000), day_str, unit='g'))
+
+    costing = FifoCosting(BASE_UNITS).run(entries, exits)
+    expected_cost, expected_stock = naive_fifo(entries, exits)
+
+    assert sum(cost for _, cost in costing.cost_of_goods().values()) == pytest.approx(expected_cost)
+    assert sum(costing.cost_by_month().values()) == pytest.approx(expected_cost)
+    assert costing.inventory_value() == pytest.approx(expected_stock)
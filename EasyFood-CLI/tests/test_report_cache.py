@@ -0,0 +1,42 @@
+from src.modules.report_cache import ReportCache
+
+
+def test_report_is_rebuilt_only_after_a_write(json_storage):
+    cache = ReportCache(4)
+    builds = []
+
+    def build():
+        builds.append(1)
+        return f"relatório {len(builds)}"
+
+    assert cache.get('stock', ['foods'], build, json_storage) == "relatório 1"
+    assert cache.get('stock', ['foods'], build, json_storage) == "relatório 1"
+    assert cache.get('stock', ['foods'], build, json_storage, params=('01/01/2025',)) == "relatório 2"
+
+    json_storage.save('foods', [{'id': 1, 'name': "Arroz"}])
+
+    assert cache.get('stock', ['foods'], build, json_storage) == "relatório 3"
+    assert cache.stats()['by_report']['stock'] == {'hits': 1, 'misses': 3}
+
+
+def test_least_recently_used_report_is_evicted(json_storage):
+    cache = ReportCache(2)
+    for report in ('a', 'b'):
+        cache.get(report, [], lambda: report, json_storage)
+    cache.get('a', [], lambda: "novo", json_storage)  # 'a' passa a ser o mais recente
+
+    cache.get('c', [], lambda: 'c', json_storage)
+
+    assert cache.get('a', [], lambda: "novo", json_storage) == 'a'
+    assert cache.get('b', [], lambda: "novo", json_storage) == "novo"
+
+
+def test_cache_persists_between_runs(json_storage, tmp_path):
+    path = str(tmp_path / 'cache' / 'reports.json')
+    ReportCache(4, path).get('stock', ['foods'], lambda: "gravado", json_storage)
+
+    cache = ReportCache(4, path)
+    assert cache.get('stock', ['foods'], lambda: "novo", json_storage) == "gravado"
+
+    cache.clear()
+    assert ReportCache(4, path).get('stock', ['foods'], lambda: "novo", json_storage) == "novo"
@@ -0,0 +1,9 @@
+from src.modules.reports.nutrition import build_nutrition_report, HORIZONS
+from src.modules.utils import load_data, Meal
+
+
+def test_nutrition_report_formats_meal_and_projection_tables(json_app):
+    report = build_nutrition_report()
+
+    assert report.count("🍽") == len(load_data('meals', Meal))
+    assert report.count("📅") == len(HORIZONS)
@@ -0,0 +1,23 @@
+from collections import namedtuple
+from src.modules.search import NameIndex
+
+Item = namedtuple('Item', ['name'])
+INDEX = NameIndex([Item("Goma de Tapioca"), Item("Tapioca"), Item("Arroz integral"), Item("Pão de queijo")])
+
+
+def test_substring_search_puts_prefixes_first():
+    assert [item.name for item in INDEX.search("TAPIÓCA")] == ["Tapioca", "Goma de Tapioca"]
+    assert INDEX.search("") == INDEX.items
+    assert INDEX.search("mandioca") == []
+
+
+def test_fuzzy_search_tolerates_typos():
+    assert INDEX.search("tapioka") == []
+    assert [item.name for item in INDEX.fuzzy_search("tapioka")] == ["Tapioca", "Goma de Tapioca"]
+    assert [item.name for item in INDEX.fuzzy_search("pao de quejo")] == ["Pão de queijo"]
+
+
+def test_fuzzy_search_respects_min_confidence():
+    assert INDEX.fuzzy_search("xyz") == []
+    assert INDEX.fuzzy_search("arros", min_confidence=1.0) == []
+    assert [item.name for item in INDEX.fuzzy_search("arros", min_confidence=0.5)] == ["Arroz integral"]
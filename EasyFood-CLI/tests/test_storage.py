@@ -0,0 +1,96 @@
+import json
+import os
+from src.modules.journal import MovementJournal
+from src.modules.storage import JsonStorage, MovementFilter, SqliteStorage
+from src.modules.utils import DATA_FILES
+from tests.test_wal import ENTRIES, wal_entries
+
+
+def test_deletion_reads_only_partitions_with_the_food(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.checkpoint()
+    os.remove(data_dir / 'stock_entries' / '2025-03.json')  # Sem o alimento 1: não pode ser lida
+
+    json_storage.save_many({}, deletions={'stock_entries': MovementFilter(food_id=1)})
+
+    [logged] = wal_entries(data_dir)
+    assert logged['partitions'] == {'stock_entries': {'2025-01': [ENTRIES[1]], '2025-02': []}}
+
+
+def test_deletion_folds_the_journal(json_storage):
+    json_storage.save('stock_entries', ENTRIES[:2])
+    json_storage.checkpoint()
+    json_storage.append('stock_entries', ENTRIES[2:])
+
+    json_storage.save_many({}, deletions={'stock_entries': MovementFilter(food_id=1)})
+    assert json_storage.load('stock_entries') == [ENTRIES[1], ENTRIES[3]]
+
+    json_storage.checkpoint()
+    assert json_storage.load('stock_entries') == [ENTRIES[1], ENTRIES[3]]
+
+
+def test_deletion_applies_to_pending_partitions(json_storage):
+    json_storage.save('stock_entries', ENTRIES)
+
+    json_storage.save_many({}, deletions={'stock_entries': MovementFilter(food_id=3)})
+
+    assert json_storage.load('stock_entries') == ENTRIES[:3]
+
+
+def test_sqlite_deletion(data_dir):
+    storage = SqliteStorage(str(data_dir / 'easyfood.db'))
+    storage.save('stock_entries', ENTRIES)
+    version = storage.version('stock_entries')
+
+    storage.save_many({}, deletions={'stock_entries': MovementFilter(food_id=1)})
+
+    assert [r['food_id'] for r in storage.load('stock_entries')] == [2, 3]
+    assert storage.version('stock_entries') != version
+
+
+def test_count_uses_manifest_journal_and_pending(json_storage):
+    json_storage.save('stock_entries', ENTRIES[:2])
+    json_storage.checkpoint()
+    json_storage.append('stock_entries', ENTRIES[2:])
+    assert json_storage.count('stock_entries') == 4
+
+    json_storage.save('stock_entries', ENTRIES[1:])
+    assert json_storage.count('stock_entries') == 3
+
+    json_storage.checkpoint()
+    assert json_storage.count('stock_entries') == 3
+    assert json_storage.count('foods') == 0
+
+
+def test_sqlite_count(data_dir):
+    storage = SqliteStorage(str(data_dir / 'easyfood.db'))
+    storage.save('stock_entries', ENTRIES)
+
+    assert storage.count('stock_entries') == 4
+
+
+def test_legacy_file_and_journal_become_monthly_partitions(data_dir):
+    legacy = data_dir / 'stock_entries.json'
+    legacy.write_text(json.dumps(ENTRIES[:3]))
+    MovementJournal(str(legacy)).append(ENTRIES[3:])
+
+    storage = JsonStorage(DATA_FILES)
+    try:
+        assert not legacy.exists()
+        assert not (data_dir / 'stock_entries.jsonl').exists()
+        assert sorted(os.listdir(data_dir / 'stock_entries')) == [
+            '2025-01.json', '2025-02.json', '2025-03.json', 'manifest.json'
+        ]
+        assert storage.load('stock_entries') == ENTRIES
+    finally:
+        storage.close()
+
+
+def test_filters_open_only_matching_partitions(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.checkpoint()
+    os.remove(data_dir / 'stock_entries' / '2025-01.json')  # Fora do filtro: não pode ser lida
+
+    by_period = MovementFilter.between('01/02/2025', '31/03/2025')
+    assert list(json_storage.iter_records('stock_entries', by_period)) == ENTRIES[2:]
+    assert list(json_storage.iter_records('stock_entries', MovementFilter(food_id=3))) == ENTRIES[3:]
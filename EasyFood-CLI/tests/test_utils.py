@@ -0,0 +1,77 @@
+from collections import namedtuple
+import pytest
+from src.modules.storage import VersionConflict
+from src.modules.utils import Food, Meal, UnitOfWork, load_data, select_from_list
+
+Item = namedtuple('Item', ['name'])
+ITEMS = [Item("Arroz branco"), Item("Feijão preto"), Item("Arroz integral"), Item("Açúcar")]
+
+
+def answer(monkeypatch, *inputs):
+    replies = iter(inputs)
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(replies))
+
+
+def test_select_from_list_searches_after_invalid_number(monkeypatch):
+    answer(monkeypatch, "99", "arroz", "2")
+
+    assert select_from_list(ITEMS, "Selecione") == Item("Arroz integral")
+
+
+def test_select_from_list_auto_selects_single_match(monkeypatch):
+    answer(monkeypatch, "acucar")
+
+    assert select_from_list(ITEMS, "Selecione") == Item("Açúcar")
+
+
+def test_select_from_list_falls_back_to_similar_names(monkeypatch, capsys):
+    answer(monkeypatch, "fejao", "1")
+
+    assert select_from_list(ITEMS, "Selecione") == Item("Feijão preto")
+    assert "Itens parecidos" in capsys.readouterr().out
+
+
+def test_unit_of_work_saves_only_changed_datasets(json_app):
+    tx = UnitOfWork()
+    foods = tx.load('foods', Food)
+    meals = tx.load('meals', Meal)
+    meals_version = json_app.version('meals')
+    foods[0].quantity_in_stock += 1
+    tx.save(foods, 'foods')
+    tx.save(meals, 'meals')
+
+    assert tx.commit() == ['foods']
+    assert json_app.version('meals') == meals_version
+    assert load_data('foods', Food)[0].quantity_in_stock == foods[0].quantity_in_stock
+
+
+def test_unit_of_work_conflict_writes_nothing(json_app):
+    tx = UnitOfWork()
+    foods = tx.load('foods', Food)
+    meals = tx.load('meals', Meal)
+    stock = foods[0].quantity_in_stock
+    foods[0].quantity_in_stock += 1
+    meals[0].name = "Outro nome"
+    tx.save(foods, 'foods')
+    tx.save(meals, 'meals')
+
+    # Outro processo grava as refeições depois do load
+    json_app.save('meals', [meal.to_dict() for meal in load_data('meals', Meal)[1:]])
+
+    with pytest.raises(VersionConflict):
+        tx.commit()
+    assert load_data('foods', Food)[0].quantity_in_stock == stock
+
+
+def test_unit_of_work_rolls_back_on_error(json_app):
+    version = json_app.version('foods')
+
+    with pytest.raises(ValueError):
+        with UnitOfWork() as tx:
+            foods = tx.load('foods', Food)
+            foods[0].quantity_in_stock += 1
+            tx.save(foods, 'foods')
+            raise ValueError
+
+    assert json_app.version('foods') == version
+    assert tx.commit() == []
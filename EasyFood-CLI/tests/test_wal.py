@@ -0,0 +1,104 @@
+import json
+import os
+from src.modules.storage import JsonStorage
+from src.modules.utils import DATA_FILES
+from src.modules.wal import WriteAheadLog
+
+
+def entry(food_id, date, quantity=1.0):
+    return {'food_name': f"Alimento {food_id}", 'quantity': quantity, 'unit': 'g', 'cost': 2.0,
+            'date': date, 'supplier': "Mercado", 'food_id': food_id, 'supplier_id': 1}
+
+
+ENTRIES = [entry(1, '10/01/2025'), entry(2, '15/01/2025'), entry(1, '03/02/2025'), entry(3, '20/03/2025')]
+
+
+def wal_entries(data_dir):
+    return WriteAheadLog(str(data_dir / 'wal.jsonl')).read()[0]
+
+
+def test_wal_group_commit_reads_back_entries(tmp_path):
+    wal = WriteAheadLog(str(tmp_path / 'wal.jsonl'))
+    wal.append({'id': 'a'})
+    wal.append({'id': 'b'})
+    with open(tmp_path / 'wal.jsonl', 'a') as f:
+        f.write('{"id": "incompleta"')  # Gravação interrompida
+
+    entries, size = wal.read()
+    assert [e['id'] for e in entries] == ['a', 'b']
+
+    wal.discard(size)
+    assert wal.read()[0] == []
+
+
+def test_save_logs_only_changed_partitions(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.checkpoint()
+
+    changed = [dict(record) for record in ENTRIES]
+    changed[2]['quantity'] = 5.0
+    json_storage.save('stock_entries', changed)
+
+    [logged] = wal_entries(data_dir)
+    assert logged['partitions'] == {'stock_entries': {'2025-02': [changed[2]]}}
+    assert logged['datasets'] == {}
+
+
+def test_pending_partitions_overlay_disk(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.checkpoint()
+
+    json_storage.save('stock_entries', ENTRIES[:2] + ENTRIES[3:])  # Fevereiro fica vazio
+    assert json_storage.load('stock_entries') == ENTRIES[:2] + ENTRIES[3:]
+    assert os.path.exists(data_dir / 'stock_entries' / '2025-02.json')
+
+    json_storage.checkpoint()
+    assert json_storage.load('stock_entries') == ENTRIES[:2] + ENTRIES[3:]
+    assert not os.path.exists(data_dir / 'stock_entries' / '2025-02.json')
+
+
+def test_load_of_pending_dataset_returns_copies(json_storage):
+    json_storage.save('meals', [{'name': "Almoço", 'foods': [{'food_name': "Arroz", 'food_id': 1}]}])
+
+    json_storage.load('meals')[0]['foods'][0]['food_name'] = "Alterado"
+
+    assert json_storage.load('meals')[0]['foods'][0]['food_name'] == "Arroz"
+
+
+def test_save_folds_the_journal_into_partitions(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES[:2])
+    json_storage.checkpoint()
+    json_storage.append('stock_entries', ENTRIES[2:])
+
+    json_storage.save('stock_entries', ENTRIES[:3])  # Remove o registro do diário
+    assert json_storage.load('stock_entries') == ENTRIES[:3]
+
+    json_storage.checkpoint()
+    assert json_storage.load('stock_entries') == ENTRIES[:3]
+    assert not os.path.exists(data_dir / 'stock_entries' / 'manifest.jsonl')
+
+
+def test_unapplied_wal_is_replayed_on_startup(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.save('foods', [{'id': 1, 'name': "Arroz"}])
+    json_storage._closed = True  # Queda antes do checkpoint
+
+    storage = JsonStorage(DATA_FILES)
+    try:
+        assert not os.path.exists(data_dir / 'wal.jsonl')
+        assert storage.load('stock_entries') == ENTRIES
+        assert storage.load('foods') == [{'id': 1, 'name': "Arroz"}]
+    finally:
+        storage.close()
+
+
+def test_previous_wal_format_is_replayed(json_storage, data_dir):
+    json_storage.save('stock_entries', ENTRIES)
+    json_storage.checkpoint()
+    with open(data_dir / 'wal.jsonl', 'w') as f:
+        f.write(json.dumps({'id': 'antiga', 'datasets': {'stock_entries': ENTRIES[2:]}}) + '\n')
+
+    assert json_storage.load('stock_entries') == ENTRIES[2:]
+    json_storage.checkpoint()
+    assert json_storage.load('stock_entries') == ENTRIES[2:]
+    assert sorted(os.listdir(data_dir / 'stock_entries')) == ['2025-02.json', '2025-03.json', 'manifest.json']
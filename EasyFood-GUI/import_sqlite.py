@@ -0,0 +1,17 @@
+from src.modules.utils import DATA_FILES
+from src.modules.storage import import_json_to_sqlite
+from src.modules.config import get_config, CONFIG_FILE
+import sys
+
+if __name__ == "__main__":
+    if len(sys.argv) > 2:
+        print("Uso:")
+        print("  Importar data/*.json para SQLite: python import_sqlite.py [caminho_do_banco]")
+        sys.exit(1)
+
+    db_path = sys.argv[1] if len(sys.argv) == 2 else get_config()['sqlite_path']
+    counts = import_json_to_sqlite(DATA_FILES, db_path)
+    for file_key, count in counts.items():
+        print(f"{file_key}: {count} registros importados")
+    print(f"\n✅ Banco criado em {db_path}")
+    print(f'Para usá-lo, defina {{"storage": "sqlite", "sqlite_path": "{db_path}"}} em {CONFIG_FILE}')
@@ -1,6 +1,9 @@
 import sys
-from PyQt6.QtWidgets import QApplication
+from PyQt6.QtWidgets import QApplication, QMessageBox
 from main_window import MainWindow
+from src.modules.utils import get_storage
+from src.modules.references import migrate_ids
+from src.modules.storage import DataFileError
 import os
 import json
 
@@ -10,12 +13,10 @@ def check_data_files():
     if not os.path.exists(data_dir):
         os.makedirs(data_dir)  # Create the data directory if it doesn't exist
 
-    # List of required JSON files
+    # List of required JSON files (stock movements live in monthly partitions created by the storage)
     required_files = [
         'foods.json',
         'suppliers.json',
-        'stock_entries.json',
-        'stock_exits.json',
         'meals.json'
     ]
 
@@ -33,8 +34,16 @@ def main():
     # Cria a aplicação
     app = QApplication(sys.argv)
 
-    # Cria e exibe a janela principal
-    window = MainWindow()
+    try:
+        # Assign stable IDs to data created by older versions
+        migrate_ids(get_storage())
+
+        # Cria e exibe a janela principal
+        window = MainWindow()
+    except DataFileError as e:
+        # Never continue with an empty list in place of an unreadable file
+        QMessageBox.critical(None, "Dados corrompidos", str(e))
+        sys.exit(1)
     window.show()
 
     # Executa a aplicação
@@ -1,15 +1,23 @@
+from datetime import date
 from PyQt6.QtWidgets import (
     QMainWindow, QWidget, QVBoxLayout, QStackedWidget,
-    QMenuBar, QMenu, QDialog, QTextBrowser, QPushButton
+    QMenuBar, QMenu, QDialog, QTextBrowser, QPushButton, QHBoxLayout,
+    QFileDialog, QInputDialog, QMessageBox, QProgressDialog
 )
+from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QAction, QFont
 from src.modules.visualizacao import VisualizacaoManager
 from src.modules.actions import ActionsManager
-from src.modules.utils import create_table_page
+from src.modules.utils import create_table_page, validate_date
+from src.modules.workers import Task, WorkerPool
+
+# Tarefas mais rápidas que isto (ms) terminam sem mostrar o diálogo de progresso
+PROGRESS_DELAY_MS = 400
 
 class ReportDialog(QDialog):
-    def __init__(self, content, parent=None):
+    def __init__(self, content, parent=None, export=None):
         super().__init__(parent)
+        self.export = export
         self.setWindowTitle("Relatório")
         self.setGeometry(200, 200, 800, 600)
         
@@ -20,15 +28,26 @@ class ReportDialog(QDialog):
         self.text_browser.setFont(QFont("Arial", 10))
         self.text_browser.setHtml(content)
         
-        # Close button
+        # Buttons (export streams the report straight to the chosen file)
+        buttons = QHBoxLayout()
+        if export is not None:
+            save_btn = QPushButton("Salvar HTML...")
+            save_btn.clicked.connect(self._save_html)
+            buttons.addWidget(save_btn)
         close_btn = QPushButton("Fechar")
         close_btn.clicked.connect(self.accept)
+        buttons.addWidget(close_btn)
         
         # Layout setup
         layout.addWidget(self.text_browser)
-        layout.addWidget(close_btn)
+        layout.addLayout(buttons)
         self.setLayout(layout)
 
+    def _save_html(self):
+        path, _ = QFileDialog.getSaveFileName(self, "Salvar Relatório", "relatorio.html", "HTML (*.html)")
+        if path:
+            self.export(path)
+
 class MainWindow(QMainWindow):
     def __init__(self):
         super().__init__()
@@ -36,6 +55,7 @@ class MainWindow(QMainWindow):
         self.setGeometry(100, 100, 800, 600)
         
         # Initialize modules
+        self.worker_pool = WorkerPool()  # Leitura, relatórios e backups fora da thread da interface
         self.visualizacao_manager = VisualizacaoManager(self)
         self.actions_manager = ActionsManager(self)
         
@@ -76,7 +96,7 @@ class MainWindow(QMainWindow):
         """Helper method to create a table page with a title"""
         page = QWidget()
         page.setLayout(QVBoxLayout())
-        table = create_table_page()
+        table = create_table_page(self.worker_pool)
         page.layout().addWidget(table)
         return page
 
@@ -120,6 +140,8 @@ class MainWindow(QMainWindow):
         relatorios_menu.addAction("Nutricional", self._show_nutrition_report)
         relatorios_menu.addAction("Financeiro", self._show_financial_report)
         relatorios_menu.addAction("Estoque", self._show_stock_report)
+        relatorios_menu.addAction("Previsão de Consumo", self._show_forecast_report)
+        relatorios_menu.addAction("Custo FIFO", self._show_inventory_report)
         self.menu_bar.addMenu(relatorios_menu)
 
         # Backups Menu
@@ -130,21 +152,106 @@ class MainWindow(QMainWindow):
         self.menu_bar.addMenu(backups_menu)
 
     def _show_nutrition_report(self):
-        content = self.actions_manager.relatorios_manager.generate_nutrition_report()
-        self._show_report("Relatório Nutricional", content)
+        self._show_report("Relatório Nutricional", 'nutrition')
 
     def _show_financial_report(self):
-        content = self.actions_manager.relatorios_manager.generate_financial_report()
-        self._show_report("Relatório Financeiro", content)
+        period = self._ask_period("das compras")
+        if period is None:
+            return
+        self._show_report("Relatório Financeiro", 'financial', *period)
 
     def _show_stock_report(self):
-        content = self.actions_manager.relatorios_manager.generate_stock_report()
-        self._show_report("Relatório de Estoque", content)
+        period = self._ask_period("das saídas")
+        if period is None:
+            return
+        self._show_report("Relatório de Estoque", 'stock', *period)
+
+    def _show_forecast_report(self):
+        today = date.today().strftime('%d/%m/%Y')
+        self._show_report("Previsão de Consumo", 'stock', None, None, today)
+
+    def _show_inventory_report(self):
+        self._show_report("Custo FIFO e Valor do Estoque", 'inventory')
+
+    def _ask_period(self, subject):
+        """Ask for the report period: (start, end) as 'dd/mm/aaaa' or None when left blank; None if cancelled"""
+        period = []
+        for label in ("Início", "Fim"):
+            while True:
+                value, ok = QInputDialog.getText(
+                    self, "Período", f"{label} do período {subject} (dd/mm/aaaa, vazio = sem limite):"
+                )
+                if not ok:
+                    return None
+                value = value.strip()
+                if not value or validate_date(value):
+                    break
+                QMessageBox.warning(self, "Erro", "Data inválida. Use o formato dd/mm/aaaa.")
+            period.append(value or None)
+        return tuple(period)
+
+    def _show_report(self, title, kind, *params):
+        """Build the report in the worker pool, then show it (export also runs in the pool)"""
+        relatorios_manager = self.actions_manager.relatorios_manager
+
+        def show(content):
+            dialog = ReportDialog(content, self, lambda path: self.run_task(
+                "Salvando relatório...",
+                lambda task: relatorios_manager.export_report(kind, path, *params, progress=task.progress),
+                parent=dialog
+            ))
+            dialog.setWindowTitle(title)
+            dialog.exec()
+
+        self.run_task(
+            f"Gerando {title.lower()}...",
+            lambda task: relatorios_manager.render_report(kind, *params, progress=task.progress),
+            show
+        )
+
+    def run_task(self, label, fn, on_result=None, cancellable=True, parent=None):
+        """Run fn(task) in the worker pool behind a progress dialog; on_result(value) runs in the GUI thread"""
+        task = Task(fn, cancellable)
+        progress = QProgressDialog(label, "Cancelar", 0, 0, parent or self)
+        progress.setWindowTitle("EasyFood")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(PROGRESS_DELAY_MS)
+        progress.setAutoClose(False)
+        progress.setAutoReset(False)
+        if cancellable:
+            progress.canceled.connect(task.cancel)
+        else:
+            progress.setCancelButton(None)
+
+        def update(done, total, message):
+            progress.setMaximum(total)
+            progress.setValue(done)
+            progress.setLabelText(message or label)
+
+        def close():
+            # hide(), not close(): closing a QProgressDialog emits canceled
+            progress.hide()
+            progress.deleteLater()
+
+        def deliver(value):
+            close()
+            if on_result is not None:
+                on_result(value)
+
+        def fail(error):
+            close()
+            QMessageBox.warning(self, "Erro", str(error))
+
+        task.signals.progress.connect(update)
+        task.signals.result.connect(deliver)
+        task.signals.error.connect(fail)
+        task.signals.cancelled.connect(close)
+        return self.worker_pool.start(task)
 
-    def _show_report(self, title, content):
-        dialog = ReportDialog(content, self)
-        dialog.setWindowTitle(title)
-        dialog.exec()
+    def closeEvent(self, event):
+        """Cancel the background tasks and wait for the running ones before closing"""
+        self.worker_pool.shutdown()
+        super().closeEvent(event)
 
     def show_page(self, index: int):
         """Show the requested page in the stacked widget"""
@@ -5,6 +5,7 @@ from src.modules.estoque import EstoqueManager
 from src.modules.refeicoes import RefeicoesManager
 from src.modules.relatorios import RelatoriosManager
 from src.modules.backup_manager import backup_manager
+from src.modules.storage import VersionConflict
 
 class ActionsManager:
     def __init__(self, main_window):
@@ -15,52 +16,66 @@ class ActionsManager:
         self.refeicoes_manager = RefeicoesManager()
         self.relatorios_manager = RelatoriosManager()
 
+    def _run(self, action):
+        """Executa uma ação de cadastro; se outro processo gravou antes, avisa em vez de sobrescrever."""
+        try:
+            action()
+        except VersionConflict as e:
+            QMessageBox.warning(self.main_window, "Dados alterados", str(e))
+
     # Existing food management methods
     def add_food(self):
-        self.alimentos_manager.add_food()
+        self._run(self.alimentos_manager.add_food)
 
     def edit_food(self):
-        self.alimentos_manager.edit_food()
+        self._run(self.alimentos_manager.edit_food)
 
     def remove_food(self):
-        self.alimentos_manager.remove_food()
+        self._run(self.alimentos_manager.remove_food)
 
     # Existing supplier management methods
     def add_supplier(self):
-        self.fornecedores_manager.add_supplier()
+        self._run(self.fornecedores_manager.add_supplier)
 
     def edit_supplier(self):
-        self.fornecedores_manager.edit_supplier()
+        self._run(self.fornecedores_manager.edit_supplier)
 
     def remove_supplier(self):
-        self.fornecedores_manager.remove_supplier()
+        self._run(self.fornecedores_manager.remove_supplier)
 
     # Existing stock management methods
     def add_stock_entry(self):
-        self.estoque_manager.add_stock_entry()
+        self._run(self.estoque_manager.add_stock_entry)
 
     def add_stock_exit(self):
-        self.estoque_manager.add_stock_exit()
+        self._run(self.estoque_manager.add_stock_exit)
 
     def edit_stock(self):
-        self.estoque_manager.edit_stock()
+        self._run(self.estoque_manager.edit_stock)
 
     def remove_stock(self):
-        self.estoque_manager.remove_stock()
+        self._run(self.estoque_manager.remove_stock)
 
     # Existing meal management methods
     def add_meal(self):
-        self.refeicoes_manager.add_meal()
+        self._run(self.refeicoes_manager.add_meal)
 
     def edit_meal(self):
-        self.refeicoes_manager.edit_meal()
+        self._run(self.refeicoes_manager.edit_meal)
 
     def remove_meal(self):
-        self.refeicoes_manager.remove_meal()
+        self._run(self.refeicoes_manager.remove_meal)
 
     # Backup management methods
     def create_backup(self):
-        success = backup_manager.create_backup()
+        # Cópia no pool de tarefas (cancelável: o backup incompleto é removido)
+        self.main_window.run_task(
+            "Criando backup...",
+            lambda task: backup_manager.create_backup(progress=task.progress),
+            self._backup_created
+        )
+
+    def _backup_created(self, success):
         if success:
             QMessageBox.information(self.main_window, "Backup", "Backup criado com sucesso!")
         else:
@@ -84,22 +99,37 @@ class ActionsManager:
             backups, 0, False
         )
         if ok and backup_name:
-            success, message = backup_manager.restore_backup(backup_name)
-            if success:
-                QMessageBox.information(self.main_window, "Sucesso", message)
-            else:
-                QMessageBox.warning(self.main_window, "Erro", message)
+            # Sem cancelamento: interromper a troca dos arquivos deixaria os dados misturados
+            self.main_window.run_task(
+                "Restaurando backup...",
+                lambda task: backup_manager.restore_backup(backup_name, progress=task.progress),
+                self._backup_restored,
+                cancellable=False
+            )
+
+    def _backup_restored(self, outcome):
+        success, message = outcome
+        if success:
+            QMessageBox.information(self.main_window, "Sucesso", message)
+        else:
+            QMessageBox.warning(self.main_window, "Erro", message)
 
     # Report generation methods
     def generate_nutrition_report(self):
         return self.relatorios_manager.generate_nutrition_report()
 
-    def generate_financial_report(self):
-        return self.relatorios_manager.generate_financial_report()
+    def generate_financial_report(self, start_date=None, end_date=None):
+        return self.relatorios_manager.generate_financial_report(start_date, end_date)
+
+    def generate_stock_report(self, start_date=None, end_date=None):
+        return self.relatorios_manager.generate_stock_report(start_date, end_date)
+
+    def generate_forecast_report(self):
+        return self.relatorios_manager.generate_forecast_report()
 
-    def generate_stock_report(self):
-        return self.relatorios_manager.generate_stock_report()
+    def generate_inventory_report(self):
+        return self.relatorios_manager.generate_inventory_report()
     
     def remove_stock(self):
         """Remove uma entrada ou saída de estoque."""
-        self.estoque_manager.remove_stock()
\ No newline at end of file
+        self._run(self.estoque_manager.remove_stock)
\ No newline at end of file
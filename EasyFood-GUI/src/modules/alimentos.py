@@ -1,6 +1,7 @@
 from PyQt6.QtCore import QObject, pyqtSignal  # Importar QObject e pyqtSignal
 from PyQt6.QtWidgets import QInputDialog, QMessageBox, QDialog
 from src.modules.utils import Food, load_data, save_data
+from src.modules.references import next_id
 from src.modules.search_dialog import SearchDialog
 
 class AlimentosManager(QObject):  # Herdar de QObject para usar sinais
@@ -8,7 +9,11 @@ class AlimentosManager(QObject):  # Herdar de QObject para usar sinais
 
     def __init__(self):
         super().__init__()  # Inicializar a classe base QObject
-        self.foods = load_data('foods', Food)  # Carrega os alimentos do arquivo JSON
+        self.reload_foods()
+
+    def reload_foods(self):
+        """Recarrega os alimentos (outro processo pode ter gravado desde a última leitura)."""
+        self.foods = load_data('foods', Food)
 
     def add_food(self):
         """Adiciona um novo alimento."""
@@ -61,8 +66,10 @@ class AlimentosManager(QObject):  # Herdar de QObject para usar sinais
         if not ok:
             return
 
-        # Cria o novo alimento
+        # Cria o novo alimento sobre a lista atual (ID livre e sem sobrescrever outros cadastros)
+        self.reload_foods()
         new_food = Food(
+            id=next_id(self.foods),
             name=name,
             unit=unit,
             quantity_per_portion=quantity_per_portion,
@@ -86,6 +93,7 @@ class AlimentosManager(QObject):  # Herdar de QObject para usar sinais
 
     def edit_food(self):
         """Edita um alimento existente usando o SearchDialog."""
+        self.reload_foods()
         if not self.foods:
             QMessageBox.warning(None, "Aviso", "Nenhum alimento cadastrado!")
             return
@@ -159,6 +167,7 @@ class AlimentosManager(QObject):  # Herdar de QObject para usar sinais
 
     def remove_food(self):
         """Remove um alimento usando o SearchDialog."""
+        self.reload_foods()
         if not self.foods:
             QMessageBox.warning(None, "Aviso", "Nenhum alimento cadastrado!")
             return
@@ -175,7 +184,7 @@ class AlimentosManager(QObject):  # Herdar de QObject para usar sinais
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
                 )
                 if confirm == QMessageBox.StandardButton.Yes:
-                    self.foods = [f for f in self.foods if f.name != selected_food.name]
+                    self.foods[:] = [f for f in self.foods if f.name != selected_food.name]
                     save_data(self.foods, 'foods')
                     QMessageBox.information(None, "Sucesso", "Alimento removido com sucesso!")
             else:
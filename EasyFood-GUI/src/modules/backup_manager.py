@@ -3,6 +3,15 @@ import os
 import shutil
 import logging
 from datetime import datetime
+from src.modules.config import get_config
+from src.modules.wal import WAL_FILE
+from src.modules.storage import VERSIONS_FILE, copy_sqlite
+from src.modules.locking import get_file_lock, LOCK_FILE
+
+WAL_PATH = os.path.join('data', WAL_FILE)
+VERSIONS_PATH = os.path.join('data', VERSIONS_FILE)
+# Trava entre processos da pasta data/ (a mesma usada pelo armazenamento)
+data_lock = get_file_lock(os.path.join('data', LOCK_FILE))
 
 class BackupManager:
     def __init__(self):
@@ -16,9 +25,10 @@ class BackupManager:
             format='%(asctime)s - %(levelname)s - %(message)s'
         )
 
-    def create_backup(self):
+    def create_backup(self, progress=None):
         """
         Cria um backup dos arquivos de dados com um timestamp único.
+        Se progress(feito, total, mensagem) interromper a cópia, o backup incompleto é removido.
         """
         try:
             # Gera um timestamp com milissegundos
@@ -33,20 +43,42 @@ class BackupManager:
 
             # Cria o diretório do backup
             os.makedirs(backup_path)
+            sqlite_path = get_config()['sqlite_path']
 
             # Lista dos arquivos de dados que serão copiados
             data_files = [
                 'data/foods.json',
                 'data/suppliers.json',
-                'data/stock_entries.json',
+                'data/stock_entries',       # Partições mensais (+ diário)
+                'data/stock_exits',
+                'data/stock_entries.json',  # Layout anterior (antes da migração)
+                'data/stock_entries.jsonl',
                 'data/stock_exits.json',
-                'data/meals.json'
+                'data/stock_exits.jsonl',
+                'data/meals.json',
+                WAL_PATH,                   # Gravações ainda não aplicadas pelo checkpoint
+                sqlite_path                 # Banco do backend SQLite, se em uso
             ]
 
             # Copia os arquivos para o diretório de backup
-            for file in data_files:
-                if os.path.exists(file):
-                    shutil.copy2(file, backup_path)
+            try:
+                with data_lock.shared():  # Cópia consistente mesmo com outro processo gravando
+                    for done, file in enumerate(data_files):
+                        if progress is not None:
+                            progress(done, len(data_files), f"Copiando {os.path.basename(file)}...")
+                        if file == sqlite_path:
+                            # Gravações no banco não usam data/.lock: cópia pelo próprio SQLite
+                            if os.path.exists(file):
+                                copy_sqlite(file, os.path.join(backup_path, os.path.basename(file)))
+                        elif os.path.isdir(file):
+                            # Partições mensais das movimentações
+                            shutil.copytree(file, os.path.join(backup_path, os.path.basename(file)))
+                        elif os.path.exists(file):
+                            shutil.copy2(file, backup_path)
+            except BaseException:
+                # Não deixa um backup pela metade (falha ou cancelamento)
+                shutil.rmtree(backup_path, ignore_errors=True)
+                raise
 
             # Realiza a rotação de backups (mantém apenas os últimos 20 backups)
             self._rotate_backups()
@@ -97,7 +129,7 @@ class BackupManager:
         # Retorna a lista de backups
         return [entry[1] for entry in backups]
 
-    def restore_backup(self, backup_name):
+    def restore_backup(self, backup_name, progress=None):
         """
         Restaura um backup específico, sobrescrevendo os arquivos de dados atuais.
         """
@@ -106,12 +138,31 @@ class BackupManager:
             if not os.path.exists(backup_path):
                 return False, "Backup não encontrado!"
 
-            # Substitui os arquivos de dados atuais pelos do backup
-            for file in os.listdir(backup_path):
-                shutil.copy(
-                    os.path.join(backup_path, file),
-                    os.path.join("data", file)
-                )
+            with data_lock.exclusive():
+                # Gravações pendentes no WAL pertencem aos dados atuais: descarta.
+                # Sem versions.json, cópias lidas antes da restauração não são regravadas.
+                for path in (WAL_PATH, VERSIONS_PATH):
+                    if os.path.exists(path):
+                        os.remove(path)
+
+                # Substitui os arquivos de dados atuais pelos do backup
+                # (diretórios de partições são trocados por inteiro)
+                sqlite_path = get_config()['sqlite_path']
+                files = os.listdir(backup_path)
+                for done, file in enumerate(files):
+                    if progress is not None:
+                        progress(done, len(files), f"Restaurando {file}...")
+                    source_path = os.path.join(backup_path, file)
+                    target_path = os.path.join("data", file)
+                    if file == os.path.basename(sqlite_path):
+                        # O banco volta para o caminho configurado, mesmo fora de data/
+                        os.makedirs(os.path.dirname(sqlite_path) or '.', exist_ok=True)
+                        copy_sqlite(source_path, sqlite_path)
+                    elif os.path.isdir(source_path):
+                        shutil.rmtree(target_path, ignore_errors=True)
+                        shutil.copytree(source_path, target_path)
+                    else:
+                        shutil.copy(source_path, target_path)
 
             logging.info(f"Backup restaurado: {backup_path}")
             return True, "Backup restaurado com sucesso!"
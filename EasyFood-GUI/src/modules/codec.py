@@ -0,0 +1,178 @@
+# src/modules/codec.py
+import json
+import codecs
+
+try:
+    import orjson  # Opcional: JSON mais rápido (pip install orjson)
+except ImportError:
+    orjson = None
+
+try:
+    import msgpack  # Opcional: formato binário (pip install msgpack)
+except ImportError:
+    msgpack = None
+
+# Tamanho dos blocos lidos ao percorrer um arquivo em modo streaming
+STREAM_CHUNK_SIZE = 64 * 1024
+# Primeiro byte de um array msgpack (fixarray, array16, array32); JSON começa com '['
+MSGPACK_ARRAY_MARKERS = frozenset(range(0x90, 0xa0)) | {0xdc, 0xdd}
+
+
+class CodecError(ValueError):
+    """Conteúdo que não pôde ser decodificado no formato detectado."""
+
+
+def iter_json_array(f, chunk_size=STREAM_CHUNK_SIZE):
+    """Percorre um array JSON elemento a elemento, lendo o arquivo (binário) em blocos; vazio = []."""
+    decoder = json.JSONDecoder()
+    text_decoder = codecs.getincrementaldecoder('utf-8')()
+    buffer, pos, eof = '', 0, False
+
+    def fill():
+        # Acrescenta o próximo bloco, descartando o trecho já consumido
+        nonlocal buffer, pos, eof
+        data = f.read(chunk_size)
+        eof = not data
+        buffer = buffer[pos:] + text_decoder.decode(data, final=eof)
+        pos = 0
+
+    def next_char():
+        # Próximo caractere significativo (None no fim do arquivo)
+        nonlocal pos
+        while True:
+            while pos < len(buffer) and buffer[pos] in ' \t\r\n':
+                pos += 1
+            if pos < len(buffer):
+                return buffer[pos]
+            if eof:
+                return None
+            fill()
+
+    char = next_char()
+    if char is None:
+        return
+    if char != '[':
+        raise json.JSONDecodeError('Esperado um array JSON', buffer, pos)
+    pos += 1
+
+    while True:
+        char = next_char()
+        if char is None:
+            raise json.JSONDecodeError('Array JSON incompleto', buffer, pos)
+        if char == ']':
+            break
+        if char == ',':
+            pos += 1
+            continue
+        try:
+            item, end = decoder.raw_decode(buffer, pos)
+        except json.JSONDecodeError:
+            if eof:
+                raise
+            fill()  # Elemento cortado no fim do bloco: lê mais e tenta de novo
+            continue
+        if end == len(buffer) and not eof:
+            fill()  # Um número no fim do bloco pode estar truncado
+            continue
+        pos = end
+        yield item
+
+
+# ==================== FORMATOS ====================
+class JsonCodec:
+    """JSON da biblioteca padrão: indentado (legível) ou compacto."""
+
+    def __init__(self, name, indent=None):
+        self.name = name
+        self.indent = indent
+
+    def dumps(self, records):
+        if self.indent:
+            return json.dumps(records, indent=self.indent).encode('utf-8')
+        return json.dumps(records, separators=(',', ':')).encode('utf-8')
+
+    def loads(self, content):
+        # Qualquer variante de JSON é lida pelo decodificador mais rápido disponível
+        if orjson is not None:
+            return orjson.loads(content)
+        return json.loads(content)
+
+    def iter_file(self, f):
+        return iter_json_array(f)
+
+
+class FastJsonCodec(JsonCodec):
+    """JSON compacto gerado pelo orjson, se instalado (senão, pela biblioteca padrão)."""
+
+    def dumps(self, records):
+        if orjson is not None:
+            return orjson.dumps(records)
+        return super().dumps(records)
+
+
+class MsgpackCodec:
+    """Formato binário msgpack: arquivos menores e leitura/gravação mais rápidas."""
+    name = 'msgpack'
+
+    def _require(self):
+        if msgpack is None:
+            raise RuntimeError(
+                "O formato msgpack requer o pacote msgpack (pip install msgpack)."
+            )
+
+    def dumps(self, records):
+        self._require()
+        return msgpack.packb(records, use_bin_type=True)
+
+    def loads(self, content):
+        self._require()
+        try:
+            return msgpack.unpackb(content, raw=False)
+        except (ValueError, msgpack.UnpackException) as e:
+            raise CodecError(f"msgpack inválido: {e}") from e
+
+    def iter_file(self, f):
+        self._require()
+        unpacker = msgpack.Unpacker(f, raw=False, read_size=STREAM_CHUNK_SIZE)
+        try:
+            for _ in range(unpacker.read_array_header()):
+                yield unpacker.unpack()
+        except (ValueError, msgpack.UnpackException) as e:
+            raise CodecError(f"msgpack inválido: {e}") from e
+
+
+CODECS = {
+    'json': JsonCodec('json', indent=2),
+    'json-compact': JsonCodec('json-compact'),
+    'json-fast': FastJsonCodec('json-fast'),
+    'msgpack': MsgpackCodec(),
+}
+
+
+def get_codec(name):
+    """Codec de gravação pelo nome ('codec' em config.json)."""
+    try:
+        codec = CODECS[name]
+    except KeyError:
+        raise ValueError(f"Formato de dados desconhecido: {name} (opções: {', '.join(CODECS)})")
+    if isinstance(codec, MsgpackCodec):
+        codec._require()
+    return codec
+
+
+def detect_codec(head):
+    """Codec de leitura a partir dos primeiros bytes do arquivo."""
+    head = head.lstrip()
+    if head and head[0] in MSGPACK_ARRAY_MARKERS:
+        return CODECS['msgpack']
+    return CODECS['json']
+
+
+def decode(content):
+    """Registros de um arquivo já lido (bytes), em qualquer formato suportado."""
+    return detect_codec(content[:16]).loads(content)
+
+
+def iter_file(f):
+    """Percorre os registros de um arquivo aberto em modo binário, detectando o formato."""
+    return detect_codec(f.peek(16)[:16]).iter_file(f)
@@ -1,5 +1,5 @@
 from PyQt6.QtWidgets import QInputDialog, QMessageBox, QDialog
-from src.modules.utils import Food, StockEntry, StockExit, load_data, save_data
+from src.modules.utils import Food, Supplier, StockEntry, StockExit, load_data, save_data, append_data, update_data
 from src.modules.search_dialog import SearchDialog
 
 class EstoqueManager:
@@ -7,15 +7,33 @@ class EstoqueManager:
         self.alimentos_manager = alimentos_manager
         self.alimentos_manager.food_added.connect(self.reload_foods)  # Conectar o sinal
         self.reload_foods()  # Carrega os dados na inicialização
-        self.stock_entries = load_data('stock_entries', StockEntry)  # Carrega as entradas de estoque
-        self.stock_exits = load_data('stock_exits', StockExit)       # Carrega as saídas de estoque
+        self.reload_stock()
 
     def reload_foods(self):
         """Recarrega a lista de alimentos do arquivo JSON."""
         self.foods = load_data('foods', Food)  # Recarrega os alimentos
 
+    def reload_stock(self):
+        """Recarrega as entradas e saídas (outro processo pode ter registrado movimentações)."""
+        self.stock_entries = load_data('stock_entries', StockEntry)
+        self.stock_exits = load_data('stock_exits', StockExit)
+
+    def _change_stock(self, food, delta):
+        """Soma delta ao estoque do alimento sobre os dados atuais; False se ficaria negativo."""
+        def change(foods):
+            # Reaplicada sobre os dados atuais se outro processo gravar no meio
+            current = next((f for f in foods if f.id == food.id), None)
+            if current is None or current.quantity_in_stock + delta < 0:
+                return False
+            current.quantity_in_stock += delta
+
+        changed = update_data('foods', Food, change)
+        self.reload_foods()
+        return changed
+
     def add_stock_entry(self):
         """Registra uma nova entrada no estoque usando o SearchDialog."""
+        self.reload_foods()
         if not self.foods:
             QMessageBox.warning(None, "Aviso", "Nenhum alimento cadastrado!")
             return
@@ -60,6 +78,9 @@ class EstoqueManager:
         if not ok or not supplier:
             return
 
+        # Vincula o fornecedor digitado ao cadastro (pelo ID), se existir
+        registered = next((s for s in load_data('suppliers', Supplier) if s.name == supplier), None)
+
         # Cria a nova entrada de estoque
         new_entry = StockEntry(
             food_name=food.name,
@@ -67,21 +88,21 @@ class EstoqueManager:
             unit=food.unit,
             cost=cost,
             date=date,
-            supplier=supplier
+            supplier=supplier,
+            food_id=food.id,
+            supplier_id=registered.id if registered else None
         )
 
-        # Adiciona a entrada à lista
-        self.stock_entries.append(new_entry)
-        save_data(self.stock_entries, 'stock_entries')  # Salva no arquivo JSON
+        append_data([new_entry], 'stock_entries')  # Anexa ao diário de movimentações
 
         # Atualiza o estoque do alimento
-        food.quantity_in_stock += quantity
-        save_data(self.foods, 'foods')
+        self._change_stock(food, quantity)
 
         QMessageBox.information(None, "Sucesso", "Entrada de estoque registrada com sucesso!")
 
     def add_stock_exit(self):
         """Registra uma nova saída no estoque usando o SearchDialog."""
+        self.reload_foods()
         if not self.foods:
             QMessageBox.warning(None, "Aviso", "Nenhum alimento cadastrado!")
             return
@@ -127,21 +148,21 @@ class EstoqueManager:
             quantity=quantity,
             unit=food.unit,
             date=date,
-            reason=reason
+            reason=reason,
+            food_id=food.id
         )
 
-        # Adiciona a saída à lista
-        self.stock_exits.append(new_exit)
-        save_data(self.stock_exits, 'stock_exits')  # Salva no arquivo JSON
-
-        # Atualiza o estoque do alimento
-        food.quantity_in_stock -= quantity
-        save_data(self.foods, 'foods')
+        # Atualiza o estoque do alimento (que outro processo pode ter alterado)
+        if not self._change_stock(food, -quantity):
+            QMessageBox.warning(None, "Erro", "Estoque insuficiente!")
+            return
+        append_data([new_exit], 'stock_exits')  # Anexa ao diário de movimentações
 
         QMessageBox.information(None, "Sucesso", "Saída de estoque registrada com sucesso!")
 
     def remove_stock(self):
         """Remove uma entrada ou saída de estoque."""
+        self.reload_stock()
         if not self.stock_entries and not self.stock_exits:
             QMessageBox.warning(None, "Aviso", "Nenhuma entrada ou saída de estoque cadastrada!")
             return
@@ -187,7 +208,7 @@ class EstoqueManager:
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            self.stock_entries = [entry for entry in self.stock_entries if entry != selected_entry]
+            self.stock_entries[:] = [entry for entry in self.stock_entries if entry != selected_entry]
             save_data(self.stock_entries, 'stock_entries')
             QMessageBox.information(None, "Sucesso", "Entrada de estoque removida com sucesso!")
 
@@ -219,6 +240,6 @@ class EstoqueManager:
             QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
         )
         if confirm == QMessageBox.StandardButton.Yes:
-            self.stock_exits = [exit for exit in self.stock_exits if exit != selected_exit]
+            self.stock_exits[:] = [exit for exit in self.stock_exits if exit != selected_exit]
             save_data(self.stock_exits, 'stock_exits')
             QMessageBox.information(None, "Sucesso", "Saída de estoque removida com sucesso!")
\ No newline at end of file
@@ -1,9 +1,14 @@
 import json
 from src.modules.utils import Food, Supplier, StockEntry, StockExit, Meal, load_data, save_data
+from src.modules.references import next_id
 
 class FornecedoresManager:
     def __init__(self):
-        self.suppliers = load_data('suppliers', Supplier)  # Carrega os fornecedores do arquivo JSON
+        self.reload_suppliers()
+
+    def reload_suppliers(self):
+        """Recarrega os fornecedores (outro processo pode ter gravado desde a última leitura)."""
+        self.suppliers = load_data('suppliers', Supplier)
 
     def add_supplier(self):
         """Adiciona um novo fornecedor."""
@@ -25,8 +30,10 @@ class FornecedoresManager:
         if not ok or not location:
             return
 
-        # Cria o novo fornecedor
+        # Cria o novo fornecedor sobre a lista atual
+        self.reload_suppliers()
         new_supplier = Supplier(
+            id=next_id(self.suppliers),
             name=name,
             type=type_,
             location=location
@@ -42,6 +49,7 @@ class FornecedoresManager:
         """Edita um fornecedor existente."""
         from PyQt6.QtWidgets import QInputDialog, QMessageBox
 
+        self.reload_suppliers()
         if not self.suppliers:
             QMessageBox.warning(None, "Aviso", "Nenhum fornecedor cadastrado!")
             return
@@ -91,6 +99,7 @@ class FornecedoresManager:
         """Remove um fornecedor."""
         from PyQt6.QtWidgets import QInputDialog, QMessageBox
 
+        self.reload_suppliers()
         if not self.suppliers:
             QMessageBox.warning(None, "Aviso", "Nenhum fornecedor cadastrado!")
             return
@@ -114,6 +123,6 @@ class FornecedoresManager:
             return
 
         # Remove o fornecedor
-        self.suppliers = [s for s in self.suppliers if s.name != supplier_name]
+        self.suppliers[:] = [s for s in self.suppliers if s.name != supplier_name]
         save_data(self.suppliers, 'suppliers')
         QMessageBox.information(None, "Sucesso", "Fornecedor removido com sucesso!")
\ No newline at end of file
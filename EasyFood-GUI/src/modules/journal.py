@@ -0,0 +1,125 @@
+# src/modules/journal.py
+import os
+import json
+import hashlib
+
+JOURNAL_SUFFIX = '.jsonl'
+
+
+def journal_path(data_path):
+    """Caminho do diário associado a um arquivo de dados (.json -> .jsonl)."""
+    return os.path.splitext(data_path)[0] + JOURNAL_SUFFIX
+
+
+def snapshot_digest(content):
+    """Hash do conteúdo do snapshot ao qual um diário se aplica."""
+    return hashlib.sha1(content).hexdigest()
+
+
+class MovementJournal:
+    """Diário append-only (uma linha JSON por registro) de movimentações de estoque.
+
+    Vale só para o snapshot .json registrado na primeira linha: reescrito o snapshot, o diário é descartado.
+    """
+
+    def __init__(self, data_path):
+        self.data_path = data_path
+        self.path = journal_path(data_path)
+
+    def _snapshot_stat(self):
+        try:
+            stats = os.stat(self.data_path)
+            return stats.st_size, stats.st_mtime_ns
+        except FileNotFoundError:
+            return None, None
+
+    def _snapshot_digest(self):
+        try:
+            with open(self.data_path, 'rb') as f:
+                return snapshot_digest(f.read())
+        except FileNotFoundError:
+            return None
+
+    def _read_header(self):
+        try:
+            with open(self.path, 'r') as f:
+                return json.loads(f.readline())
+        except (FileNotFoundError, json.JSONDecodeError):
+            return None
+
+    def read(self, digest):
+        """Retorna os registros do diário válidos para o snapshot com o hash informado."""
+        try:
+            with open(self.path, 'r') as f:
+                lines = f.read().splitlines()
+        except FileNotFoundError:
+            return []
+
+        if not lines:
+            return []
+        try:
+            header = json.loads(lines[0])
+        except json.JSONDecodeError:
+            return []
+        if header.get('snapshot') != digest:
+            return []  # Diário de um snapshot anterior: já compactado
+
+        records = []
+        for line in lines[1:]:
+            try:
+                records.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue  # Linha incompleta (gravação interrompida)
+        return records
+
+    def _is_current(self, header):
+        """Verifica se o cabeçalho do diário corresponde ao snapshot atual."""
+        if not header:
+            return False
+        size, mtime_ns = self._snapshot_stat()
+        # Caminho rápido: snapshot intocado desde a criação do diário
+        if header.get('size') == size and header.get('mtime_ns') == mtime_ns:
+            return True
+        return header.get('snapshot') == self._snapshot_digest()
+
+    def _new_header(self):
+        size, mtime_ns = self._snapshot_stat()
+        return {
+            'snapshot': self._snapshot_digest(),
+            'size': size,
+            'mtime_ns': mtime_ns
+        }
+
+    def _ends_with_newline(self):
+        with open(self.path, 'rb') as f:
+            f.seek(0, os.SEEK_END)
+            if f.tell() == 0:
+                return True
+            f.seek(-1, os.SEEK_END)
+            return f.read(1) == b'\n'
+
+    def append(self, records):
+        """Anexa registros ao diário com um único fsync para todo o grupo."""
+        if not records:
+            return
+
+        lines = [json.dumps(record) for record in records]
+        mode = 'a'
+        if not self._is_current(self._read_header()):
+            # Diário ausente ou obsoleto: recomeça vinculado ao snapshot atual
+            lines.insert(0, json.dumps(self._new_header()))
+            mode = 'w'
+        elif not self._ends_with_newline():
+            lines.insert(0, '')  # Isola uma linha incompleta deixada por uma falha
+
+        with open(self.path, mode) as f:
+            f.write('\n'.join(lines) + '\n')
+            f.flush()
+            os.fsync(f.fileno())
+
+    def clear(self):
+        """Descarta o diário (após a compactação no snapshot)."""
+        try:
+            os.remove(self.path)
+        except FileNotFoundError:
+            pass
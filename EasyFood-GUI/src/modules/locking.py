@@ -0,0 +1,110 @@
+# src/modules/locking.py
+import os
+import time
+import threading
+from contextlib import contextmanager
+
+try:
+    import fcntl
+except ImportError:  # Windows: sem flock, usa msvcrt.locking
+    fcntl = None
+    import msvcrt
+
+LOCK_FILE = '.lock'
+# Intervalo entre tentativas no Windows (msvcrt não espera indefinidamente)
+LOCK_RETRY_INTERVAL = 0.05
+
+_locks = {}
+_locks_guard = threading.Lock()
+
+
+class FileLock:
+    """Trava consultiva entre processos: shared() para leitores, exclusive() para escritores.
+
+    Reentrante dentro do processo; no Windows as duas formas são exclusivas.
+    """
+
+    def __init__(self, path):
+        self.path = path
+        self._state = threading.Lock()
+        self._fd = None
+        self._depth = 0
+        self._exclusive = False
+
+    def _lock_file(self, exclusive):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_EX if exclusive else fcntl.LOCK_SH)
+            return
+        if self._depth:
+            return  # Já exclusiva
+        os.lseek(self._fd, 0, os.SEEK_SET)
+        while True:
+            try:
+                msvcrt.locking(self._fd, msvcrt.LK_NBLCK, 1)
+                return
+            except OSError:
+                time.sleep(LOCK_RETRY_INTERVAL)
+
+    def _unlock_file(self):
+        if fcntl is not None:
+            fcntl.flock(self._fd, fcntl.LOCK_UN)
+        else:
+            os.lseek(self._fd, 0, os.SEEK_SET)
+            msvcrt.locking(self._fd, msvcrt.LK_UNLCK, 1)
+
+    def _acquire(self, exclusive):
+        with self._state:
+            if self._fd is None:
+                os.makedirs(os.path.dirname(self.path) or '.', exist_ok=True)
+                self._fd = os.open(self.path, os.O_RDWR | os.O_CREAT)
+            if self._depth == 0:
+                self._lock_file(exclusive)
+                self._exclusive = exclusive
+            elif exclusive and not self._exclusive:
+                self._lock_file(True)
+                self._exclusive = True
+            self._depth += 1
+
+    def _release(self):
+        with self._state:
+            self._depth -= 1
+            if self._depth == 0:
+                self._unlock_file()
+                self._exclusive = False
+
+    @contextmanager
+    def shared(self):
+        """Trava de leitura: vários processos podem ler ao mesmo tempo."""
+        self._acquire(False)
+        try:
+            yield
+        finally:
+            self._release()
+
+    @contextmanager
+    def exclusive(self):
+        """Trava de escrita: nenhum outro processo lê ou grava enquanto ativa."""
+        self._acquire(True)
+        try:
+            yield
+        finally:
+            self._release()
+
+
+class NullLock:
+    """Trava sem efeito: leitura de uma pasta sem data/.lock (não cria o arquivo)."""
+
+    @contextmanager
+    def shared(self):
+        yield
+
+    exclusive = shared
+
+
+def get_file_lock(path):
+    """FileLock única por arquivo neste processo (flock trava por descritor, não por processo)."""
+    with _locks_guard:
+        key = os.path.abspath(path)
+        if key not in _locks:
+            _locks[key] = FileLock(path)
+        return _locks[key]
@@ -0,0 +1,136 @@
+# src/modules/lots.py
+from bisect import bisect_left, bisect_right
+from collections import defaultdict, deque
+from datetime import date
+from src.modules.storage import date_ordinal
+
+# No mesmo dia, as entradas são processadas antes das saídas
+ENTRY, EXIT = 0, 1
+# Sobra de arredondamento abaixo da qual um lote é considerado esgotado
+EPSILON = 1e-9
+
+
+class FifoCosting:
+    """Custeio por lotes (FIFO): cada saída consome primeiro os lotes mais antigos do alimento.
+
+    Saídas sem lote disponível (estoque anterior ao histórico) ficam em uncosted, sem custo.
+    """
+
+    def __init__(self, base_units):
+        self.base_units = base_units
+        self.lots = defaultdict(deque)        # food_id -> deque de [quantidade restante, custo unitário]
+        self.uncosted = defaultdict(float)    # food_id -> quantidade saída sem lote
+        self._usage_dates = []                # ordinal de cada saída, em ordem
+        self._usage = []                      # (food_id, quantidade custeada, custo)
+        self._stock_dates = defaultdict(list)   # food_id -> ordinais dos dias com movimento
+        self._stock = defaultdict(list)         # food_id -> (quantidade, valor) ao fim desses dias
+
+    @classmethod
+    def from_storage(cls, storage, base_units):
+        """Processa todas as entradas e saídas do backend."""
+        engine = cls(base_units)
+        engine.run(storage.iter_records('stock_entries'), storage.iter_records('stock_exits'))
+        return engine
+
+    def _movements(self, entries, exits):
+        # Movimentações válidas em ordem cronológica (e de registro, no mesmo dia)
+        base_units = self.base_units
+        movements = []
+        for kind, records in ((ENTRY, entries), (EXIT, exits)):
+            for record in records:
+                ordinal = date_ordinal(record['date'])
+                food_id = record.get('food_id')
+                quantity = record['quantity'] * base_units[record['unit']]
+                if ordinal is None or food_id is None or quantity <= 0:
+                    continue
+                movements.append((ordinal, kind, len(movements), food_id, quantity, record.get('cost', 0.0)))
+        movements.sort()
+        return movements
+
+    def run(self, entries, exits):
+        """Processa entradas e saídas (dicionários do backend), em qualquer ordem."""
+        usage_dates, usage = self._usage_dates, self._usage
+        state = {}  # food_id -> [lotes, quantidade, valor, dias com movimento, estoque nesses dias]
+        for ordinal, kind, _, food_id, quantity, cost in self._movements(entries, exits):
+            food = state.get(food_id)
+            if food is None:
+                food = state[food_id] = [self.lots[food_id], 0.0, 0.0,
+                                         self._stock_dates[food_id], self._stock[food_id]]
+            food_lots = food[0]
+            if kind == ENTRY:
+                food_lots.append([quantity, cost / quantity])
+                food[1] += quantity
+                food[2] += cost
+            else:
+                remaining, used_cost = quantity, 0.0
+                while remaining > EPSILON and food_lots:
+                    lot = food_lots[0]
+                    if lot[0] > remaining:
+                        used_cost += remaining * lot[1]
+                        lot[0] -= remaining
+                        remaining = 0.0
+                        break
+                    used_cost += lot[0] * lot[1]
+                    remaining -= lot[0]
+                    food_lots.popleft()
+                if remaining > EPSILON:
+                    self.uncosted[food_id] += remaining
+                else:
+                    remaining = 0.0
+                usage_dates.append(ordinal)
+                usage.append((food_id, quantity - remaining, used_cost))
+                if food_lots:
+                    food[1] -= quantity - remaining
+                    food[2] -= used_cost
+                else:
+                    food[1] = food[2] = 0.0  # Sem acúmulo de arredondamentos
+
+            # Estoque do alimento ao fim do dia (a última movimentação do dia prevalece)
+            dates, stock = food[3], food[4]
+            if dates and dates[-1] == ordinal:
+                stock[-1] = (food[1], food[2])
+            else:
+                dates.append(ordinal)
+                stock.append((food[1], food[2]))
+        return self
+
+    def _usage_range(self, start, end):
+        low = 0 if start is None else bisect_left(self._usage_dates, start)
+        high = len(self._usage_dates) if end is None else bisect_right(self._usage_dates, end)
+        return range(low, high)
+
+    def cost_of_goods(self, start=None, end=None):
+        """Custo das mercadorias usadas no período: {food_id: (quantidade na unidade base, custo)}."""
+        totals = defaultdict(lambda: [0.0, 0.0])
+        for position in self._usage_range(start, end):
+            food_id, quantity, cost = self._usage[position]
+            totals[food_id][0] += quantity
+            totals[food_id][1] += cost
+        return {food_id: tuple(values) for food_id, values in totals.items()}
+
+    def cost_by_month(self, start=None, end=None):
+        """Custo das mercadorias usadas por mês ('aaaa-mm'), em ordem cronológica."""
+        months, month_of = {}, {}
+        for position in self._usage_range(start, end):
+            ordinal = self._usage_dates[position]
+            month = month_of.get(ordinal)
+            if month is None:
+                day = date.fromordinal(ordinal)
+                month = month_of[ordinal] = f"{day.year:04d}-{day.month:02d}"
+            months[month] = months.get(month, 0.0) + self._usage[position][2]
+        return months
+
+    def inventory(self, on=None):
+        """Estoque a custo ao fim do dia on (None = após a última movimentação): {food_id: (quantidade, valor)}."""
+        result = {}
+        for food_id, dates in self._stock_dates.items():
+            position = len(dates) if on is None else bisect_right(dates, on)
+            if position:
+                quantity, value = self._stock[food_id][position - 1]
+                if quantity > EPSILON:
+                    result[food_id] = (quantity, value)
+        return result
+
+    def inventory_value(self, on=None):
+        """Valor total do estoque a custo ao fim do dia on."""
+        return sum(value for _, value in self.inventory(on).values())
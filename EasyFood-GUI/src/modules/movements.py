@@ -0,0 +1,140 @@
+# src/modules/movements.py
+import threading
+from bisect import bisect_left, bisect_right
+from itertools import accumulate
+from src.modules.storage import date_ordinal
+
+MOVEMENT_FILE_KEYS = ('stock_entries', 'stock_exits')
+
+
+class FoodMovements:
+    """Movimentações de um alimento em listas paralelas ordenadas por data (somas acumuladas sob demanda)."""
+
+    __slots__ = ('dates', 'quantities', 'costs', 'records', '_cumulative')
+
+    def __init__(self):
+        self.dates = []
+        self.quantities = []
+        self.costs = []
+        self.records = []
+        self._cumulative = None
+
+    def add(self, ordinal, quantity, cost, record):
+        # Depois das movimentações do mesmo dia: mantém a ordem de registro
+        position = bisect_right(self.dates, ordinal)
+        self.dates.insert(position, ordinal)
+        self.quantities.insert(position, quantity)
+        self.costs.insert(position, cost)
+        self.records.insert(position, record)
+        self._cumulative = None
+
+    def span(self, start=None, end=None):
+        """Posições (início, fim) das movimentações no período (ordinais inclusivos)."""
+        low = 0 if start is None else bisect_left(self.dates, start)
+        high = len(self.dates) if end is None else bisect_right(self.dates, end)
+        return low, max(low, high)
+
+    def totals(self, start=None, end=None):
+        """(quantidade, custo) no período, por diferença das somas acumuladas."""
+        if self._cumulative is None:
+            self._cumulative = (list(accumulate(self.quantities, initial=0.0)),
+                                list(accumulate(self.costs, initial=0.0)))
+        low, high = self.span(start, end)
+        quantities, costs = self._cumulative
+        return quantities[high] - quantities[low], costs[high] - costs[low]
+
+
+class MovementIndex:
+    """Entradas e saídas de estoque por alimento (ID), ordenadas por data, por versão do conjunto.
+
+    Ficam de fora registros sem food_id, com data inválida ou quantidade não positiva.
+    """
+
+    def __init__(self, base_units):
+        self.base_units = base_units
+        self._lock = threading.Lock()
+        self._indexes = {}  # file_key -> (storage, assinatura, {food_id: FoodMovements})
+
+    def _add(self, foods, record):
+        ordinal = date_ordinal(record.get('date'))
+        food_id = record.get('food_id')
+        quantity = record['quantity'] * self.base_units[record['unit']]
+        if ordinal is None or food_id is None or quantity <= 0:
+            return
+        movements = foods.get(food_id)
+        if movements is None:
+            movements = foods[food_id] = FoodMovements()
+        movements.add(ordinal, quantity, record.get('cost', 0.0), record)
+
+    def _build(self, storage, file_key):
+        # Ordena uma vez por alimento (estável: a ordem de registro vale no mesmo dia)
+        rows = {}
+        for record in storage.iter_records(file_key):
+            ordinal = date_ordinal(record.get('date'))
+            food_id = record.get('food_id')
+            quantity = record['quantity'] * self.base_units[record['unit']]
+            if ordinal is not None and food_id is not None and quantity > 0:
+                rows.setdefault(food_id, []).append((ordinal, quantity, record.get('cost', 0.0), record))
+        foods = {}
+        for food_id, food_rows in rows.items():
+            food_rows.sort(key=lambda row: row[0])
+            movements = foods[food_id] = FoodMovements()
+            movements.dates, movements.quantities, movements.costs, movements.records = (
+                list(column) for column in zip(*food_rows)
+            )
+        return foods
+
+    def _foods(self, storage, file_key):
+        signature = storage.signature(file_key)
+        index = self._indexes.get(file_key)
+        if index is None or index[0] is not storage or index[1] != signature:
+            index = self._indexes[file_key] = (storage, signature, self._build(storage, file_key))
+        return index[2]
+
+    def record(self, storage, file_key, records, signatures):
+        """Acrescenta movimentações recém-gravadas; signatures é o par (antes, depois) de storage.append."""
+        before, after = signatures
+        with self._lock:
+            index = self._indexes.get(file_key)
+            if index is not None and index[0] is storage and index[1] == before:
+                for record in records:
+                    self._add(index[2], record)
+                self._indexes[file_key] = (storage, after, index[2])
+            else:
+                self._indexes.pop(file_key, None)
+
+    def query(self, storage, file_key, food_id, start=None, end=None):
+        """Movimentações do alimento no período (ordinais inclusivos), em ordem de data."""
+        with self._lock:
+            movements = self._foods(storage, file_key).get(food_id)
+            if movements is None:
+                return []
+            low, high = movements.span(start, end)
+            return [dict(record) for record in movements.records[low:high]]
+
+    def series(self, storage, file_key, start=None, end=None):
+        """[(food_id, ordinais, quantidades na unidade base)] dos alimentos com movimento no período."""
+        result = []
+        with self._lock:
+            for food_id, movements in self._foods(storage, file_key).items():
+                low, high = movements.span(start, end)
+                if high > low:
+                    result.append((food_id, movements.dates[low:high], movements.quantities[low:high]))
+        return result
+
+    def totals(self, storage, file_key, start=None, end=None):
+        """{food_id: (quantidade na unidade base, custo)} dos alimentos com movimento no período."""
+        result = {}
+        with self._lock:
+            for food_id, movements in self._foods(storage, file_key).items():
+                quantity, cost = movements.totals(start, end)
+                if quantity > 0:
+                    result[food_id] = (quantity, cost)
+        return result
+
+    def average_costs(self, storage, start=None, end=None):
+        """Custo médio ponderado por unidade base das entradas do período, por ID."""
+        return {
+            food_id: cost / quantity
+            for food_id, (quantity, cost) in self.totals(storage, 'stock_entries', start, end).items()
+        }
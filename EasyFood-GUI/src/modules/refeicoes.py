@@ -5,11 +5,16 @@ from src.modules.search_dialog import SearchDialog  # Importing the SearchDialog
 
 class RefeicoesManager:
     def __init__(self):
+        self.reload()
+
+    def reload(self):
+        """Reload meals and foods (another process may have saved since the last read)."""
         self.meals = load_data('meals', Meal)  # Load meals from JSON
         self.foods = load_data('foods', Food)  # Load foods for meal composition
 
     def add_meal(self):
         """Add a new meal using SearchDialog for food selection."""
+        self.reload()
         if not self.foods:
             QMessageBox.warning(None, "Aviso", "Nenhum alimento cadastrado! Cadastre alimentos primeiro.")
             return
@@ -38,7 +43,8 @@ class RefeicoesManager:
                         selected_foods.append({
                             'food_name': selected_food.name,
                             'quantity': quantity,
-                            'unit': selected_food.unit
+                            'unit': selected_food.unit,
+                            'food_id': selected_food.id
                         })
                         QMessageBox.information(None, "Sucesso", f"{selected_food.name} adicionado à refeição!")
                 else:
@@ -52,6 +58,7 @@ class RefeicoesManager:
                 name=name,
                 foods=selected_foods
             )
+            self.meals = load_data('meals', Meal)  # Append to the current list
             self.meals.append(new_meal)
             save_data(self.meals, 'meals')
             QMessageBox.information(None, "Sucesso", "Refeição criada com sucesso!")
@@ -60,6 +67,7 @@ class RefeicoesManager:
 
     def edit_meal(self):
         """Edit an existing meal using SearchDialog for selection."""
+        self.reload()
         if not self.meals:
             QMessageBox.warning(None, "Aviso", "Nenhuma refeição cadastrada!")
             return
@@ -150,7 +158,8 @@ class RefeicoesManager:
                         meal.foods.append({
                             'food_name': selected_food.name,
                             'quantity': quantity,
-                            'unit': selected_food.unit
+                            'unit': selected_food.unit,
+                            'food_id': selected_food.id
                         })
                         QMessageBox.information(None, "Sucesso", f"{selected_food.name} adicionado à refeição!")
                         list_widget.clear()
@@ -175,6 +184,7 @@ class RefeicoesManager:
 
     def remove_meal(self):
         """Remove a meal using SearchDialog for selection."""
+        self.reload()
         if not self.meals:
             QMessageBox.warning(None, "Aviso", "Nenhuma refeição cadastrada!")
             return
@@ -191,7 +201,7 @@ class RefeicoesManager:
                     QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No
                 )
                 if confirm == QMessageBox.StandardButton.Yes:
-                    self.meals = [m for m in self.meals if m.name != selected_meal.name]
+                    self.meals[:] = [m for m in self.meals if m.name != selected_meal.name]
                     save_data(self.meals, 'meals')
                     QMessageBox.information(None, "Sucesso", "Refeição removida com sucesso!")
             else:
@@ -0,0 +1,112 @@
+# src/modules/references.py
+from src.modules.cache import dataset_cache
+from src.modules.ledger import StockLedger
+
+# Campos de referência por conjunto de dados: (campo do ID, campo do nome, conjunto referenciado)
+REFERENCE_FIELDS = {
+    'stock_entries': [('food_id', 'food_name', 'foods'), ('supplier_id', 'supplier', 'suppliers')],
+    'stock_exits': [('food_id', 'food_name', 'foods')],
+}
+# Itens de refeição referenciam alimentos dentro da lista 'foods'
+MEAL_REFERENCE = ('food_id', 'food_name', 'foods')
+REFERENCE_KINDS = {'food': 'foods', 'supplier': 'suppliers'}
+
+
+def next_id(items):
+    """Próximo ID livre para uma lista de alimentos ou fornecedores."""
+    return max((item.id for item in items if item.id is not None), default=0) + 1
+
+
+def _names_by_id(file_key, storage):
+    return {
+        record['id']: record['name']
+        for record in dataset_cache.get(file_key, storage)
+        if record.get('id') is not None
+    }
+
+
+def reference_resolver(file_key, storage):
+    """Função que atualiza os nomes de um objeto a partir dos IDs (leitura item a item)."""
+    if file_key == 'meals':
+        id_field, name_field, target = MEAL_REFERENCE
+        names = _names_by_id(target, storage)
+
+        def resolve_meal(meal):
+            for item in meal.foods:
+                if item.get(id_field) in names:
+                    item[name_field] = names[item[id_field]]
+        return resolve_meal
+
+    fields = [
+        (id_field, name_field, _names_by_id(target, storage))
+        for id_field, name_field, target in REFERENCE_FIELDS.get(file_key, [])
+    ]
+
+    def resolve(item):
+        for id_field, name_field, names in fields:
+            ref_id = getattr(item, id_field)
+            if ref_id in names:
+                setattr(item, name_field, names[ref_id])
+    return resolve
+
+
+def resolve_references(file_key, items, storage):
+    """Atualiza os nomes referenciados a partir dos IDs (o nome no histórico é só uma cópia)."""
+    if isinstance(items, StockLedger):
+        for id_field, name_field, target in REFERENCE_FIELDS.get(file_key, []):
+            # Atualiza só a coluna codificada
+            items.resolve(id_field, name_field, _names_by_id(target, storage))
+        return
+
+    resolve = reference_resolver(file_key, storage)
+    for item in items:
+        resolve(item)
+
+
+def missing_ids(storage):
+    """Conjuntos sem IDs estáveis ou sem vínculo por ID, já corrigidos ({file_key: registros}); nada é gravado."""
+    changed = {}
+    ids_by_name = {}
+    for file_key in REFERENCE_KINDS.values():
+        records = dataset_cache.get(file_key, storage)
+        new_id = max((record.get('id') or 0 for record in records), default=0) + 1
+        for record in records:
+            if record.get('id') is None:
+                record['id'] = new_id
+                new_id += 1
+                changed[file_key] = records
+        names = {}
+        for record in records:
+            names.setdefault(record['name'], record['id'])
+        ids_by_name[file_key] = names
+
+    def link(record, id_field, name_field, target):
+        if record.get(id_field) is None and record.get(name_field) in ids_by_name[target]:
+            record[id_field] = ids_by_name[target][record[name_field]]
+            return True
+        return False
+
+    for file_key, fields in REFERENCE_FIELDS.items():
+        records = dataset_cache.get(file_key, storage)
+        for record in records:
+            for field in fields:
+                if link(record, *field):
+                    changed[file_key] = records
+
+    meals = dataset_cache.get('meals', storage)
+    for meal in meals:
+        for item in meal['foods']:
+            if link(item, *MEAL_REFERENCE):
+                changed['meals'] = meals
+
+    for file_key in changed:
+        dataset_cache.invalidate(file_key)  # Registros do cache alterados acima
+    return changed
+
+
+def migrate_ids(storage):
+    """Atribui IDs estáveis e vincula o histórico por ID (idempotente). Retorna os conjuntos regravados."""
+    changed = missing_ids(storage)
+    if changed:
+        storage.save_many(changed)
+    return list(changed)
@@ -1,180 +1,131 @@
-from src.modules.utils import load_data, Food, Meal, StockEntry, BASE_UNITS
-from collections import defaultdict
+import os
+from datetime import date
+from src.modules.utils import load_data, get_storage, cost_index, meal_usage_index, movement_index, Food, Meal, BASE_UNITS
+from src.modules.lots import FifoCosting
+from src.modules.nutrition import NutritionEngine
+from src.modules.forecast import ConsumptionForecast, HISTORY_DAYS, ROLLING_WINDOW
+from src.modules.report_cache import get_report_cache
+from src.modules.report_html import html_table, render_document, write_document
+from src.modules.storage import date_ordinal
+
+# Data sets each report reads (a change invalidates its cached HTML)
+REPORT_FILES = {
+    'nutrition': ('foods', 'meals'),
+    'financial': ('foods', 'meals', 'stock_entries'),
+    'stock': ('foods', 'meals', 'stock_exits'),
+    'inventory': ('foods', 'stock_entries', 'stock_exits'),
+}
 
 class RelatoriosManager:
-    def __init__(self):
-        self.foods = load_data('foods', Food)
-        self.meals = load_data('meals', Meal)
-        self.stock_entries = load_data('stock_entries', StockEntry)
+    # Sem cópias carregadas na criação: cada relatório lê os dados atuais
 
-    def _generate_html_table(self, headers, data):
-        table = """
-    <table style='
-        border-collapse: collapse;
-        width: 100%;
-        font-family: Arial, sans-serif;
-        font-size: 14px;
-        color: #000;
-    '>
-    """
-    
-        # Add table headers
-        table += "<thead><tr>"
-        for header in headers:
-            table += f"""
-            <th style='
-                border: 1px solid #000;  /* Black border */
-                padding: 12px;
-                background-color: #4CAF50;
-                color: white;
-                text-align: left;
-            '>{header}</th>
-            """
-        table += "</tr></thead>"
-        
-        # Add table rows
-        table += "<tbody>"
-        for i, row in enumerate(data):
-            # Add a bold separator above the total row
-            if i == len(data) - 1:  # Check if it's the last row (total row)
-                table += "<tr style='border-top: 2px solid #000;'>"  # Bold black separator
-            else:
-                table += "<tr>"
-            
-            for cell in row:
-                table += f"""
-                <td style='
-                    border: 1px solid #000;  /* Black border */
-                    padding: 8px;
-                    text-align: left;
-                    background-color: #ede6e8;
-                '>{cell}</td>
-                """
-            table += "</tr>"
-        table += "</tbody></table>"
-        
-        return table
+    def _sections(self, kind, params):
+        """Section generator of a report kind and the params it depends on"""
+        if kind == 'inventory' and not params:
+            params = (date.today().isoformat(),)
+        return getattr(self, f"_iter_{kind}_report"), params
+
+    @staticmethod
+    def _tracked(sections, progress):
+        # Reports each finished section; progress may cancel the build between sections
+        for done, section in enumerate(sections, 1):
+            if progress is not None:
+                progress(done, 0, f"Seções prontas: {done}")
+            yield section
+
+    def render_report(self, kind, *params, progress=None):
+        """Full HTML of a report, served from the cache while its data and params are unchanged
+
+        progress(done, total, message), if given, is called as each section is built.
+        """
+        sections, params = self._sections(kind, params)
+        return get_report_cache().get(
+            f"{kind}-html", REPORT_FILES[kind],
+            lambda: render_document(self._tracked(sections(*params), progress)), get_storage(), params
+        )
+
+    def export_report(self, kind, path, *params, progress=None):
+        """Stream a report to an HTML file section by section (no single big string in memory)"""
+        sections, params = self._sections(kind, params)
+        try:
+            write_document(path, self._tracked(sections(*params), progress))
+        except BaseException:
+            # Failed or cancelled: no half-written report left behind
+            if os.path.exists(path):
+                os.remove(path)
+            raise
+
+    @staticmethod
+    def _period(start_date, end_date):
+        # 'dd/mm/YYYY' bounds as ordinals (None = open-ended)
+        return (date_ordinal(start_date) if start_date else None,
+                date_ordinal(end_date) if end_date else None)
+
+    def _generate_html_table(self, headers, data, total_row=True):
+        return html_table(headers, data, total_row)
 
     def generate_nutrition_report(self):
-        """Generate a professional nutrition report with HTML tables"""
-        report = []
+        return self.render_report('nutrition')
+
+    def _iter_nutrition_report(self):
+        """Sections of the nutrition report, as HTML"""
         meals = load_data('meals', Meal)
-        foods = {f.name: f for f in load_data('foods', Food)}
+        foods = load_data('foods', Food)
+        # Meal totals and projections come from one matrix product
+        engine = NutritionEngine(foods, meals, BASE_UNITS)
         
         # Nutrition headers
         nutri_headers = ["Item", "Porção", "Calorias", "Proteínas", "Carboidratos", "Gorduras"]
         
-        for meal in meals:
-            table_data = []
-            total = {'cal': 0.0, 'prot': 0.0, 'carb': 0.0, 'fat': 0.0}
-            
-            for item in meal.foods:
-                food = foods.get(item['food_name'])
-                if not food:
-                    continue
-                
-                base_qty = item['quantity'] * BASE_UNITS[item['unit']]
-                portions = base_qty / (food.quantity_per_portion * BASE_UNITS[food.unit])
-                
-                calories = portions * food.calories
-                proteins = portions * food.proteins
-                carbs = portions * food.carbs
-                fats = portions * food.fats
-                
-                table_data.append([
-                    food.name,
-                    f"{base_qty/BASE_UNITS[food.unit]:.1f}{food.unit}",
-                    f"{calories:.1f}",
-                    f"{proteins:.1f}",
-                    f"{carbs:.1f}",
-                    f"{fats:.1f}"
-                ])
-                
-                total['cal'] += calories
-                total['prot'] += proteins
-                total['carb'] += carbs
-                total['fat'] += fats
+        for row, meal in enumerate(meals):
+            table_data = [
+                [food.name, f"{quantity:.1f}{food.unit}"] + [f"{value:.1f}" for value in values]
+                for food, quantity, values in engine.meal_items(row)
+            ]
             
             # Add total row
-            table_data.append([
-                "<b>TOTAL</b>",
-                "",
-                f"<b>{total['cal']:.1f}</b>",
-                f"<b>{total['prot']:.1f}</b>",
-                f"<b>{total['carb']:.1f}</b>",
-                f"<b>{total['fat']:.1f}</b>"
-            ])
+            table_data.append(["<b>TOTAL</b>", ""] + [f"<b>{value:.1f}</b>" for value in engine.meal_totals[row]])
             
             # Generate HTML table
-            report.append(f"<h2 style='color: #4CAF50;'>🍽 {meal.name}</h2>")
-            report.append(self._generate_html_table(nutri_headers, table_data))
+            yield f"<h2>🍽 {meal.name}</h2>"
+            yield self._generate_html_table(nutri_headers, table_data)
         
         # Add projections
-        report.append("<h2 style='color: #4CAF50;'>📅 Projeções</h2>")
+        yield "<h2>📅 Projeções</h2>"
         proj_headers = ["Refeição", "Frequência", "Calorias", "Proteínas", "Carboidratos", "Gorduras"]
+        horizons = [(1, "Diária"), (7, "Semanal"), (30, "Mensal")]
+        projections = engine.projections([days for days, _ in horizons])
         
-        for days, period in [(1, "Diária"), (7, "Semanal"), (30, "Mensal")]:
-            proj_data = []
-            grand_total = {'cal': 0.0, 'prot': 0.0, 'carb': 0.0, 'fat': 0.0}
-            
-            for meal in meals:
-                total = {'cal': 0.0, 'prot': 0.0, 'carb': 0.0, 'fat': 0.0}
-                
-                for item in meal.foods:
-                    food = foods.get(item['food_name'])
-                    if not food:
-                        continue
-                    
-                    base_qty = item['quantity'] * BASE_UNITS[item['unit']]
-                    portions = base_qty / (food.quantity_per_portion * BASE_UNITS[food.unit])
-                    
-                    total['cal'] += portions * food.calories
-                    total['prot'] += portions * food.proteins
-                    total['carb'] += portions * food.carbs
-                    total['fat'] += portions * food.fats
-                
-                proj_data.append([
-                    meal.name,
-                    f"{days}x",
-                    f"{total['cal'] * days:.1f}",
-                    f"{total['prot'] * days:.1f}",
-                    f"{total['carb'] * days:.1f}",
-                    f"{total['fat'] * days:.1f}"
-                ])
-                
-                grand_total['cal'] += total['cal'] * days
-                grand_total['prot'] += total['prot'] * days
-                grand_total['carb'] += total['carb'] * days
-                grand_total['fat'] += total['fat'] * days
+        for (days, period), totals in zip(horizons, projections):
+            proj_data = [
+                [meal.name, f"{days}x"] + [f"{value:.1f}" for value in totals[row]]
+                for row, meal in enumerate(meals)
+            ]
             
             # Add grand total row
-            proj_data.append([
-                "<b>TOTAL PROJETADO</b>",
-                "",
-                f"<b>{grand_total['cal']:.1f}</b>",
-                f"<b>{grand_total['prot']:.1f}</b>",
-                f"<b>{grand_total['carb']:.1f}</b>",
-                f"<b>{grand_total['fat']:.1f}</b>"
-            ])
+            proj_data.append(
+                ["<b>TOTAL PROJETADO</b>", ""] + [f"<b>{value:.1f}</b>" for value in totals.sum(axis=0)]
+            )
             
-            report.append(f"<h3>📅 Projeção {period} ({days} dias)</h3>")
-            report.append(self._generate_html_table(proj_headers, proj_data))
-        
-        return "<br>".join(report)
+            yield f"<h3>📅 Projeção {period} ({days} dias)</h3>"
+            yield self._generate_html_table(proj_headers, proj_data)
+
+    def generate_financial_report(self, start_date=None, end_date=None):
+        return self.render_report('financial', start_date, end_date)
 
-    def generate_financial_report(self):
-        """Generate a professional financial report with HTML tables"""
-        report = ["<h2 style='color: #4CAF50;'>💵 RELATÓRIO FINANCEIRO 💵</h2>"]
+    def _iter_financial_report(self, start_date=None, end_date=None):
+        """Sections of the financial report, as HTML"""
+        yield "<h2>💵 RELATÓRIO FINANCEIRO 💵</h2>"
         foods = {f.name: f for f in load_data('foods', Food)}
         meals = load_data('meals', Meal)
-        stock_entries = load_data('stock_entries', StockEntry)
         
-        # Calculate average costs
-        food_cost_data = defaultdict(list)
-        for entry in stock_entries:
-            quantity = entry.quantity * BASE_UNITS[entry.unit]
-            if quantity > 0:
-                food_cost_data[entry.food_name].append(entry.cost / quantity)
+        if start_date or end_date:
+            # Average cost of the purchases in the period only (binary search per food)
+            average_costs = movement_index.average_costs(get_storage(), *self._period(start_date, end_date))
+            yield f"<p>Custos das compras de {start_date or 'início'} a {end_date or 'fim'}</p>"
+        else:
+            # Weighted average cost per food (same index as the CLI report)
+            average_costs = cost_index.average_costs(get_storage())
         
         # Meal cost breakdown
         meal_costs = {}
@@ -184,10 +135,11 @@ class RelatoriosManager:
             
             for item in meal.foods:
                 food = foods.get(item['food_name'])
-                if not food or not food_cost_data.get(food.name):
+                if not food or food.id not in average_costs:
                     continue
                 
-                avg_cost = sum(food_cost_data[food.name]) / len(food_cost_data[food.name])
+                # Cost per base unit -> cost per food unit
+                avg_cost = average_costs[food.id] * BASE_UNITS[food.unit]
                 quantity = item['quantity'] * BASE_UNITS[item['unit']] / BASE_UNITS[food.unit]
                 item_cost = avg_cost * quantity
                 
@@ -210,14 +162,14 @@ class RelatoriosManager:
                 f"<b>R$ {total_cost:.2f}</b>"
             ])
             
-            report.append(f"<h3>🍽 {meal.name}</h3>")
-            report.append(self._generate_html_table(
+            yield f"<h3>🍽 {meal.name}</h3>"
+            yield self._generate_html_table(
                 ["Item", "Quantidade", "Custo Unitário", "Custo Total"],
                 table_data
-            ))
+            )
         
         # Add projections
-        report.append("<h2 style='color: #4CAF50;'>📅 Projeções Financeiras</h2>")
+        yield "<h2>📅 Projeções Financeiras</h2>"
         proj_headers = ["Refeição", "Frequência", "Custo Total"]
         
         for days, period in [(1, "Diária"), (7, "Semanal"), (30, "Mensal")]:
@@ -239,20 +191,50 @@ class RelatoriosManager:
                 f"<b>R$ {grand_total:.2f}</b>"
             ])
             
-            report.append(f"<h3>📅 Projeção {period} ({days} dias)</h3>")
-            report.append(self._generate_html_table(proj_headers, proj_data))
-        
-        return "<br>".join(report)
+            yield f"<h3>📅 Projeção {period} ({days} dias)</h3>"
+            yield self._generate_html_table(proj_headers, proj_data)
+
+    def generate_stock_report(self, start_date=None, end_date=None, forecast_date=None):
+        return self.render_report('stock', start_date, end_date, forecast_date)
 
-    def generate_stock_report(self):
-        """Generate a professional stock report with HTML tables"""
-        report = ["<h2 style='color: #4CAF50;'>📦 RELATÓRIO DE ESTOQUE 📦</h2>"]
+    def generate_forecast_report(self):
+        # Forecast mode of the stock report: real consumption measured up to today
+        return self.generate_stock_report(forecast_date=date.today().strftime('%d/%m/%Y'))
+
+    def _iter_stock_report(self, start_date=None, end_date=None, forecast_date=None):
+        """Sections of the stock report, as HTML"""
+        if forecast_date:
+            yield "<h2>📈 PREVISÃO DE CONSUMO 📈</h2>"
+            yield f"<p>Saídas dos últimos {HISTORY_DAYS} dias até {forecast_date}; a ruptura prevista usa a média exponencial (dias recentes pesam mais).</p>"
+        else:
+            yield "<h2>📦 RELATÓRIO DE ESTOQUE 📦</h2>"
         foods = load_data('foods', Food)
+        # Daily use per food (base unit), from the inverted meal index
+        meal_usage = meal_usage_index.daily_usage(get_storage())
+        
+        headers = ["Item", "Estoque Atual", "Estoque Mínimo", "Estoque Ideal", "Consumo Diário", "Duração (dias)", "Status"]
+        exits = None
+        if start_date:
+            # Exits recorded in the period, summed by binary search on each food
+            start, end = self._period(start_date, end_date or date.today().strftime('%d/%m/%Y'))
+            days = max(end - start + 1, 1)
+            exits = movement_index.totals(get_storage(), 'stock_exits', start, end)
+            headers[5:5] = ["Saídas no Período", "Saída Média/dia"]
+            yield f"<p>Saídas de {start_date} a {end_date or 'hoje'}</p>"
+        
+        stocked = [food for food in foods if food.quantity_in_stock > 0]  # Skip items with zero stock
+        if forecast_date:
+            # Exit rates and stock-out dates for every food in one vectorized pass
+            forecast = ConsumptionForecast.from_movements(
+                movement_index, get_storage(), [food.id for food in stocked], date_ordinal(forecast_date)
+            )
+            stockouts = forecast.stockout_dates([food.quantity_in_stock * BASE_UNITS[food.unit] for food in stocked])
+            headers[-1:-1] = [f"Média {ROLLING_WINDOW}d", "Média Exponencial", "Ruptura Prevista"]
         
         table_data = []
-        for food in foods:
-            if food.quantity_in_stock <= 0:
-                continue  # Skip items with zero stock
+        for position, food in enumerate(stocked):
+            daily_use = meal_usage.get(food.id, 0.0) / BASE_UNITS[food.unit]
+            duration = food.quantity_in_stock / daily_use if daily_use > 0 else float('inf')
             
             status = "✅ Adequado"
             if food.min_stock > 0 and food.quantity_in_stock < food.min_stock:
@@ -260,18 +242,92 @@ class RelatoriosManager:
             elif food.quantity_in_stock < food.ideal_stock:
                 status = "🟡 Atenção"
             
-            table_data.append([
+            row = [
                 food.name,
                 f"{food.quantity_in_stock:.1f}{food.unit}",
                 f"{food.min_stock:.1f}{food.unit}" if food.min_stock > 0 else "N/A",
                 f"{food.ideal_stock:.1f}{food.unit}" if food.ideal_stock > 0 else "N/A",
+                f"{daily_use:.1f}{food.unit}/dia",
+                f"{duration:.1f}" if duration != float('inf') else "∞",
                 status
-            ])
+            ]
+            if exits is not None:
+                exited = exits.get(food.id, (0.0, 0.0))[0] / BASE_UNITS[food.unit]
+                row[5:5] = [f"{exited:.1f}{food.unit}", f"{exited / days:.1f}{food.unit}/dia"]
+            if forecast_date:
+                unit = BASE_UNITS[food.unit]
+                stockout = stockouts[position]
+                row[-1:-1] = [
+                    f"{forecast.rolling[position] / unit:.1f}{food.unit}/dia",
+                    f"{forecast.ewma[position] / unit:.1f}{food.unit}/dia",
+                    stockout.strftime('%d/%m/%Y') if stockout else "∞"
+                ]
+            table_data.append(row)
         
-        report.append(self._generate_html_table(
-            ["Item", "Estoque Atual", "Estoque Mínimo", "Estoque Ideal", "Status"],
-            table_data
-        ))
-        report.append("<p><b>Legenda:</b> ✅ Adequado  🔴 Crítico  🟡 Atenção</p>")
+        yield self._generate_html_table(headers, table_data, total_row=False)  # Sem linha de total
+        yield "<p><b>Legenda:</b> ✅ Adequado  🔴 Crítico  🟡 Atenção</p>"
         
-        return "<br>".join(report)
\ No newline at end of file
+        incompatible = meal_usage_index.incompatible(get_storage())
+        if incompatible:
+            foods_by_id = {food.id: food for food in foods}
+            items = []
+            for meal_name, food_id, unit in incompatible:
+                food = foods_by_id[food_id]
+                items.append(f"{meal_name}: {food.name} em {unit} (alimento em {food.unit})")
+            yield (
+                "<p><b>⚠️ Itens de refeição em unidade incompatível com a do alimento (fora do consumo):</b> "
+                + "; ".join(items) + "</p>"
+            )
+
+    def generate_inventory_report(self):
+        return self.render_report('inventory')
+
+    def _iter_inventory_report(self, today):
+        """Sections of the FIFO cost of goods used and inventory value report, as HTML"""
+        yield "<h2>📦 CUSTO FIFO E VALOR DO ESTOQUE 📦</h2>"
+        foods = {f.id: f for f in load_data('foods', Food)}
+        # One pass over the history: lots are consumed in order of entry
+        costing = FifoCosting.from_storage(get_storage(), BASE_UNITS)
+        today = date.fromisoformat(today)
+
+        def food_label(food_id):
+            food = foods.get(food_id)
+            return (food.name, food.unit) if food else (f"#{food_id}", 'g')
+
+        # Cost of goods used per month
+        months = costing.cost_by_month(end=today.toordinal())
+        table_data = [[month, f"R$ {cost:.2f}"] for month, cost in months.items()]
+        table_data.append(["<b>TOTAL</b>", f"<b>R$ {sum(months.values()):.2f}</b>"])
+        yield "<h3>💵 Custo das Mercadorias Usadas por Mês</h3>"
+        yield self._generate_html_table(["Mês", "Custo"], table_data)
+
+        # Cost of goods used per food
+        table_data = []
+        for food_id, (quantity, cost) in costing.cost_of_goods(end=today.toordinal()).items():
+            name, unit = food_label(food_id)
+            table_data.append([name, f"{quantity / BASE_UNITS[unit]:.2f}{unit}", f"R$ {cost:.2f}"])
+        table_data.sort(key=lambda row: row[0])
+        table_data.append(["<b>TOTAL</b>", "", f"<b>R$ {sum(months.values()):.2f}</b>"])
+        yield "<h3>🍽 Custo por Alimento</h3>"
+        yield self._generate_html_table(["Item", "Quantidade", "Custo"], table_data)
+
+        # Inventory value at cost today
+        table_data = []
+        for food_id, (quantity, value) in costing.inventory(today.toordinal()).items():
+            name, unit = food_label(food_id)
+            table_data.append([name, f"{quantity / BASE_UNITS[unit]:.2f}{unit}", f"R$ {value:.2f}"])
+        table_data.sort(key=lambda row: row[0])
+        table_data.append([
+            "<b>TOTAL</b>", "", f"<b>R$ {costing.inventory_value(today.toordinal()):.2f}</b>"
+        ])
+        yield f"<h3>📦 Valor do Estoque a Custo em {today.strftime('%d/%m/%Y')}</h3>"
+        yield self._generate_html_table(["Item", "Quantidade em Lotes", "Valor"], table_data)
+
+        if costing.uncosted:
+            items = []
+            for food_id, quantity in costing.uncosted.items():
+                name, unit = food_label(food_id)
+                items.append(f"{name} ({quantity / BASE_UNITS[unit]:.2f}{unit})")
+            items = ", ".join(items)
+            yield f"<p><b>⚠️ Saídas sem entrada correspondente no histórico (sem custo):</b> {items}</p>"
+
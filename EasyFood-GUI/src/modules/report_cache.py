@@ -0,0 +1,114 @@
+# src/modules/report_cache.py
+import os
+import json
+import hashlib
+import threading
+from collections import Counter, OrderedDict
+from src.modules.config import get_config
+from src.modules.storage import write_file_atomic
+
+# Incrementar ao mudar o layout de algum relatório: descarta o cache gravado em disco
+REPORT_CACHE_VERSION = 2
+
+
+class ReportCache:
+    """Cache LRU dos relatórios montados, com chave pelo relatório, parâmetros e assinatura dos dados.
+
+    Com path, é gravado em disco e reaproveitado entre execuções.
+    """
+
+    def __init__(self, max_entries, path=None):
+        self.max_entries = max_entries
+        self.path = path
+        self._entries = OrderedDict()  # chave -> relatório
+        self._loaded = path is None
+        self._lock = threading.Lock()
+        self.hits = Counter()
+        self.misses = Counter()
+
+    @staticmethod
+    def key(report, params, storage, file_keys):
+        """Hash do relatório, dos parâmetros e das versões dos dados usados."""
+        signatures = [storage.signature(file_key) for file_key in file_keys]
+        content = json.dumps([report, list(params), storage.name, signatures], default=str)
+        return hashlib.sha256(content.encode('utf-8')).hexdigest()
+
+    def _load(self):
+        # Cache gravado por uma execução anterior (ignorado se ilegível ou de outra versão)
+        self._loaded = True
+        try:
+            with open(self.path, 'r', encoding='utf-8') as f:
+                saved = json.load(f)
+        except (FileNotFoundError, ValueError):
+            return
+        if isinstance(saved, dict) and saved.get('version') == REPORT_CACHE_VERSION:
+            for key, content in saved.get('entries', []):
+                self._entries[key] = content
+            self._evict()
+
+    def _save(self):
+        if self.path is None:
+            return
+        directory = os.path.dirname(self.path)
+        if directory:
+            os.makedirs(directory, exist_ok=True)
+        write_file_atomic(self.path, json.dumps({
+            'version': REPORT_CACHE_VERSION,
+            'entries': list(self._entries.items())
+        }))
+
+    def _evict(self):
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def get(self, report, file_keys, build, storage, params=()):
+        """Relatório em cache ou montado agora por build(); file_keys são os conjuntos que ele lê."""
+        key = self.key(report, params, storage, file_keys)
+        with self._lock:
+            if not self._loaded:
+                self._load()
+            if key in self._entries:
+                self._entries.move_to_end(key)
+                self.hits[report] += 1
+                return self._entries[key]
+        self.misses[report] += 1
+        content = build()
+        if self.max_entries > 0:
+            with self._lock:
+                self._entries[key] = content
+                self._evict()
+                self._save()
+        return content
+
+    def clear(self):
+        """Descarta todas as entradas (também do arquivo em disco)."""
+        with self._lock:
+            self._entries.clear()
+            self._loaded = True
+            self._save()
+
+    def stats(self):
+        """Contadores de acertos/falhas, no total e por relatório."""
+        return {
+            'hits': sum(self.hits.values()),
+            'misses': sum(self.misses.values()),
+            'entries': len(self._entries),
+            'by_report': {
+                report: {'hits': self.hits[report], 'misses': self.misses[report]}
+                for report in sorted(set(self.hits) | set(self.misses))
+            }
+        }
+
+
+_report_cache = None
+
+
+def get_report_cache():
+    """Cache de relatórios configurado ('report_cache_size' e 'report_cache_path' em config.json)."""
+    global _report_cache
+    if _report_cache is None:
+        config = get_config()
+        _report_cache = ReportCache(
+            int(config['report_cache_size']), config['report_cache_path'] or None
+        )
+    return _report_cache
@@ -0,0 +1,52 @@
+# src/modules/report_html.py
+# Report rendering: one shared stylesheet, CSS classes instead of inline styles,
+# output built by joining lists (or written chunk by chunk to a file)
+
+REPORT_STYLESHEET = """
+h2 { color: #4CAF50; }
+table.report { border-collapse: collapse; width: 100%; font-family: Arial, sans-serif; font-size: 14px; color: #000; }
+table.report th { border: 1px solid #000; padding: 12px; background-color: #4CAF50; color: white; text-align: left; }
+table.report td { border: 1px solid #000; padding: 8px; text-align: left; background-color: #ede6e8; }
+table.report tr.total td { border-top: 2px solid #000; }
+"""
+
+DOCUMENT_HEAD = f"<html><head><meta charset='utf-8'><style>{REPORT_STYLESHEET}</style></head><body>"
+DOCUMENT_TAIL = "</body></html>"
+# Separator between report sections (same spacing as before)
+SECTION_SEPARATOR = "<br>"
+
+
+def html_table(headers, rows, total_row=True):
+    """Table with the shared 'report' class; the last row is styled as a total row"""
+    parts = ["<table class='report'><thead><tr>"]
+    parts.extend(f"<th>{header}</th>" for header in headers)
+    parts.append("</tr></thead><tbody>")
+    last = len(rows) - 1
+    for position, row in enumerate(rows):
+        parts.append("<tr class='total'>" if total_row and position == last else "<tr>")
+        parts.extend(f"<td>{cell}</td>" for cell in row)
+        parts.append("</tr>")
+    parts.append("</tbody></table>")
+    return "".join(parts)
+
+
+def iter_document(sections):
+    """Chunks of the full HTML document for an iterable of section strings"""
+    yield DOCUMENT_HEAD
+    for position, section in enumerate(sections):
+        if position:
+            yield SECTION_SEPARATOR
+        yield section
+    yield DOCUMENT_TAIL
+
+
+def render_document(sections):
+    """Full HTML document as one string"""
+    return "".join(iter_document(sections))
+
+
+def write_document(path, sections):
+    """Stream the document to a file, one section at a time (nothing held in memory)"""
+    with open(path, 'w', encoding='utf-8') as f:
+        for chunk in iter_document(sections):
+            f.write(chunk)
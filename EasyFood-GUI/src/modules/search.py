@@ -0,0 +1,129 @@
+# src/modules/search.py
+import re
+import math
+import unicodedata
+from bisect import bisect_right
+from collections import Counter
+from functools import lru_cache
+
+# Separador entre os nomes no texto de busca (nunca aparece num termo digitado)
+SEPARATOR = "\n"
+# Confiança mínima padrão da busca aproximada (fração dos trigramas do termo presentes no nome)
+MIN_CONFIDENCE = 0.6
+WORD = re.compile(r"[a-z0-9]+")
+
+
+def normalize_text(text):
+    """Texto sem acentos e em minúsculas, para comparação."""
+    return unicodedata.normalize('NFD', text).encode('ascii', 'ignore').decode('ascii').lower()
+
+
+@lru_cache(maxsize=65536)
+def normalize_name(name):
+    """normalize_text de um nome (calculado uma vez por nome)."""
+    return normalize_text(name)
+
+
+@lru_cache(maxsize=65536)
+def word_trigrams(word):
+    padded = f"  {word} "
+    return tuple(padded[i:i + 3] for i in range(len(padded) - 2))
+
+
+def trigrams(normalized):
+    """Trigramas das palavras de um texto normalizado ('  t', ' ta', 'tap', ..., 'ca ')."""
+    grams = set()
+    for word in WORD.findall(normalized):
+        grams.update(word_trigrams(word))
+    return grams
+
+
+class NameIndex:
+    """Índice de busca pelos nomes normalizados de uma lista de itens (trecho e trigramas).
+
+    text, se informado, dá o texto pesquisável de cada item no lugar do nome.
+    """
+
+    def __init__(self, items, text=None):
+        self.items = list(items)
+        if text is None:
+            names = [normalize_name(item.name) for item in self.items]
+        else:
+            names = [normalize_text(text(item)) for item in self.items]
+        self._names = names
+        self._text = SEPARATOR.join(names)
+        self._postings = None
+        self._offsets = []
+        offset = 0
+        for name in names:
+            self._offsets.append(offset)
+            offset += len(name) + len(SEPARATOR)
+
+    @staticmethod
+    def normalize_term(term):
+        return normalize_name(term.strip())
+
+    def positions(self, term):
+        """Posições dos itens cujo nome contém term: os que começam com term primeiro."""
+        term = self.normalize_term(term)
+        if not term:
+            return list(range(len(self.items)))
+        text, offsets = self._text, self._offsets
+        prefixed, others = [], []
+        start = text.find(term)
+        while start >= 0:
+            position = bisect_right(offsets, start) - 1
+            (prefixed if start == offsets[position] else others).append(position)
+            # Próxima busca a partir do nome seguinte (um item aparece uma vez)
+            if position + 1 == len(offsets):
+                break
+            start = text.find(term, offsets[position + 1])
+        return prefixed + others
+
+    def search(self, term):
+        """Itens cujo nome contém term (sem acentos, sem diferenciar maiúsculas)."""
+        return [self.items[position] for position in self.positions(term)]
+
+    def _trigram_postings(self):
+        if self._postings is None:
+            words = {}
+            for position, name in enumerate(self._names):
+                for word in WORD.findall(name):
+                    words.setdefault(word, []).append(position)
+            postings = {}
+            for word, positions in words.items():
+                for gram in word_trigrams(word):
+                    found = postings.get(gram)
+                    if found is None:
+                        postings[gram] = set(positions)
+                    else:
+                        found.update(positions)
+            self._postings = postings
+        return self._postings
+
+    def fuzzy_positions(self, term, min_confidence=MIN_CONFIDENCE):
+        """Posições dos itens parecidos com term (fração dos trigramas presentes), os mais parecidos primeiro."""
+        grams = trigrams(self.normalize_term(term))
+        if not grams:
+            return []
+        postings = self._trigram_postings()
+        needed = max(1, math.ceil(min_confidence * len(grams) - 1e-9))
+        sets = sorted((postings.get(gram, set()) for gram in grams), key=len)
+        candidates = set().union(*sets[:len(grams) - needed + 1])
+        if len(candidates) * len(sets) <= sum(map(len, sets)):
+            hits = {position: sum(position in found for found in sets) for position in candidates}
+        else:
+            # Muitos candidatos: contar todas as posições (em C) sai mais barato
+            hits = Counter()
+            for found in sets:
+                hits.update(found)
+        # Empate: o nome mais curto (menos sobra além do termo) primeiro
+        scored = sorted(
+            (-count, len(self._names[position]), position)
+            for position, count in hits.items() if count >= needed
+        )
+        return [position for _, _, position in scored]
+
+    def fuzzy_search(self, term, min_confidence=MIN_CONFIDENCE):
+        """Itens parecidos com term (tolera erros de digitação), os mais parecidos primeiro."""
+        return [self.items[position] for position in self.fuzzy_positions(term, min_confidence)]
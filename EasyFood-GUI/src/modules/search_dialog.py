@@ -1,83 +1,192 @@
 # src/modules/search_dialog.py
-from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QTableWidget, QTableWidgetItem, QPushButton, QLabel
-from PyQt6.QtCore import Qt
-import unicodedata
+from PyQt6.QtWidgets import QDialog, QVBoxLayout, QLineEdit, QTableView, QPushButton, QLabel, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from src.modules.search import MIN_CONFIDENCE
+from src.modules.cache import name_index_cache
+
+# Espera após a última tecla antes de buscar (ms) e linhas entregues à view por vez
+DEBOUNCE_MS = 150
+FETCH_BATCH = 200
+
+
+def find_matches(index, term, min_confidence):
+    """(posições, aproximada): nomes que contêm term ou, se nenhum, os parecidos."""
+    positions = index.positions(term)
+    if positions or not term.strip():
+        return positions, False
+    positions = index.fuzzy_positions(term, min_confidence)
+    return positions, bool(positions)
+
+
+class SearchResultsModel(QAbstractTableModel):
+    """Resultados da busca (posições em items), entregues à view em lotes de FETCH_BATCH."""
+
+    def __init__(self, items, parent=None):
+        super().__init__(parent)
+        self.items = items
+        self._positions = []
+        self._loaded = 0
+
+    def set_positions(self, positions):
+        self.beginResetModel()
+        self._positions = positions
+        self._loaded = min(FETCH_BATCH, len(positions))
+        self.endResetModel()
+
+    def item(self, row):
+        return self.items[self._positions[row]]
+
+    def match_count(self):
+        return len(self._positions)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else 1
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return self.item(index.row()).name
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        return "Nome" if orientation == Qt.Orientation.Horizontal else section + 1
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._positions)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(FETCH_BATCH, len(self._positions) - self._loaded)
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+
+class SearchSignals(QObject):
+    finished = pyqtSignal(int, list, bool)  # geração, posições, aproximada
+
+
+class SearchTask(QRunnable):
+    """Busca no índice fora da thread da interface; o resultado volta por sinal."""
+
+    def __init__(self, index, generation, term, min_confidence):
+        super().__init__()
+        self.index = index
+        self.generation = generation
+        self.term = term
+        self.min_confidence = min_confidence
+        self.signals = SearchSignals()
+
+    def run(self):
+        positions, approximate = find_matches(self.index, self.term, self.min_confidence)
+        self.signals.finished.emit(self.generation, positions, approximate)
+
 
 class SearchDialog(QDialog):
-    def __init__(self, items, prompt, parent=None):
+    def __init__(self, items, prompt, parent=None, min_confidence=MIN_CONFIDENCE):
         super().__init__(parent)
         self.setWindowTitle("Pesquisar")
         self.setGeometry(200, 200, 600, 400)
-        
-        self.items = items
+
+        self.items = list(items)
+        self.index = name_index_cache.get(items)  # Reaproveitado enquanto o conjunto não mudar
+        self.min_confidence = min_confidence
         self.selected_item = None
-        
+
+        # Buscas em uma thread própria: uma nova descarta as que ainda não começaram
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(1)
+        self.generation = 0  # Resultados de buscas antigas são ignorados
+        self.applied_generation = 0
+        self.task = None
+
         # Layout
         layout = QVBoxLayout()
-        
-        # Search input
+
+        # Search input (debounced)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(DEBOUNCE_MS)
+        self.search_timer.timeout.connect(self.start_search)
         self.search_input = QLineEdit()
         self.search_input.setPlaceholderText("Digite o nome do item...")
         self.search_input.textChanged.connect(self.update_results)
+        self.search_input.returnPressed.connect(self.select_item)
         layout.addWidget(self.search_input)
-        
+
         # Results table
-        self.results_table = QTableWidget()
-        self.results_table.setColumnCount(1)
-        self.results_table.setHorizontalHeaderLabels(["Nome"])
+        self.model = SearchResultsModel(self.items, self)
+        self.results_table = QTableView()
+        self.results_table.setModel(self.model)
         self.results_table.horizontalHeader().setStretchLastSection(True)
-        self.results_table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.results_table.setSelectionMode(QTableWidget.SelectionMode.SingleSelection)
-        self.results_table.cellDoubleClicked.connect(self.select_item)
+        self.results_table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.results_table.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
+        self.results_table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results_table.doubleClicked.connect(self.select_item)
         layout.addWidget(self.results_table)
-        
+
         # Select button
         self.select_button = QPushButton("Selecionar")
         self.select_button.clicked.connect(self.select_item)
         layout.addWidget(self.select_button)
-        
+
         # Status label
         self.status_label = QLabel()
         layout.addWidget(self.status_label)
-        
+
         self.setLayout(layout)
-        self.update_results()
+        self.search_now()
 
     def update_results(self):
-        """Update the results table based on the search input"""
-        search_term = self.search_input.text().strip().lower()
-        
-        # Normalize search term
-        normalized_term = unicodedata.normalize('NFD', search_term)\
-            .encode('ascii', 'ignore').decode('ascii')
-        
-        # Filter items
-        matches = [
-            item for item in self.items
-            if normalized_term in unicodedata.normalize('NFD', item.name)
-            .encode('ascii', 'ignore').decode('ascii').lower()
-        ]
-        
-        # Update table
-        self.results_table.setRowCount(len(matches))
-        for i, item in enumerate(matches):
-            self.results_table.setItem(i, 0, QTableWidgetItem(item.name))
-        
-        # Auto-select if only one match
-        if len(matches) == 1:
-            self.selected_item = matches[0]
-            self.accept()
-        
+        """Restart the debounce timer; the search runs once typing pauses"""
+        self.generation += 1
+        self.search_timer.start()
+
+    def start_search(self):
+        """Queue the search for the current term in the worker thread"""
+        self.pool.clear()  # Buscas ainda na fila já estão desatualizadas
+        self.task = SearchTask(self.index, self.generation, self.search_input.text(), self.min_confidence)
+        self.task.signals.finished.connect(self.apply_results)
+        self.pool.start(self.task)
+
+    def search_now(self):
+        """Search the current term in the GUI thread (initial list, Enter before the debounce)"""
+        self.search_timer.stop()
+        self.generation += 1
+        positions, approximate = find_matches(self.index, self.search_input.text(), self.min_confidence)
+        self.apply_results(self.generation, positions, approximate)
+
+    def apply_results(self, generation, positions, approximate):
+        """Show the results of the latest search; older ones are dropped"""
+        if generation != self.generation:
+            return
+        self.applied_generation = generation
+        self.model.set_positions(positions)
+
+        # Highlight a single exact match so Enter picks it (never auto-accept)
+        if len(positions) == 1 and not approximate:
+            self.results_table.selectRow(0)
+
         # Update status label
-        self.status_label.setText(f"{len(matches)} itens encontrados.")
+        if approximate:
+            self.status_label.setText(f"Nenhum item contém o termo; {len(positions)} itens parecidos.")
+        else:
+            self.status_label.setText(f"{len(positions)} itens encontrados.")
 
     def select_item(self):
         """Select the currently highlighted item"""
-        selected_row = self.results_table.currentRow()
+        if self.applied_generation != self.generation:
+            self.search_now()  # Enter antes do fim da busca: resultados do termo atual
+        selected_row = self.results_table.currentIndex().row()
+        if selected_row < 0 and self.model.match_count() == 1:
+            selected_row = 0
         if selected_row >= 0:
-            self.selected_item = self.items[selected_row]
+            self.selected_item = self.model.item(selected_row)
             self.accept()
 
     def get_selected_item(self):
         """Return the selected item"""
-        return self.selected_item
\ No newline at end of file
+        return self.selected_item
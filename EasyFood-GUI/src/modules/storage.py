@@ -0,0 +1,1043 @@
+# src/modules/storage.py
+import os
+import json
+import uuid
+import atexit
+import logging
+import sqlite3
+import threading
+from urllib.parse import quote
+from datetime import date, datetime
+from functools import lru_cache
+from collections import Counter, defaultdict
+from src.modules.config import get_config
+from src.modules.cache import copy_record
+from src.modules.codec import get_codec, decode, iter_file
+from src.modules.journal import MovementJournal, snapshot_digest
+from src.modules.wal import WriteAheadLog, WAL_FILE
+from src.modules.locking import get_file_lock, NullLock, LOCK_FILE
+
+# Movimentações: particionadas por mês e gravadas em diário append-only (ver journal.py)
+JOURNALED_FILES = {'stock_entries', 'stock_exits'}
+# Manifesto de um commit multi-arquivo em andamento (ver JsonStorage._commit)
+COMMIT_MANIFEST = '.pending_commit.json'
+# Manifesto das partições mensais (data/stock_entries/manifest.json)
+PARTITION_MANIFEST = 'manifest.json'
+# Partição dos registros sem data válida
+UNDATED_PARTITION = 'sem-data'
+# Tamanho do WAL que antecipa o checkpoint em segundo plano
+CHECKPOINT_WAL_BYTES = 4 * 1024 * 1024
+# Última gravação (ID da entrada do WAL) aplicada a cada conjunto de dados
+VERSIONS_FILE = 'versions.json'
+
+
+class DataFileError(Exception):
+    """Arquivo de dados ilegível (JSON inválido ou truncado)."""
+
+    def __init__(self, path, error):
+        super().__init__(
+            f"Arquivo de dados corrompido: {path} ({error}). "
+            "Restaure um backup da pasta backups/ antes de continuar."
+        )
+        self.path = path
+
+
+class VersionConflict(Exception):
+    """Conjunto de dados gravado por outro processo depois de ter sido lido."""
+
+    def __init__(self, file_key):
+        super().__init__(
+            f"Os dados de '{file_key}' foram alterados por outro processo desde a leitura. "
+            "Nada foi gravado; repita a operação."
+        )
+        self.file_key = file_key
+
+
+class MigrationRequired(Exception):
+    """Dados em formato anterior, abertos somente para leitura (só o aplicativo os converte)."""
+
+
+@lru_cache(maxsize=4096)
+def date_ordinal(date_str):
+    """Converte 'dd/mm/aaaa' em ordinal (None se a data for inválida)."""
+    try:
+        return datetime.strptime(date_str, '%d/%m/%Y').toordinal()
+    except (TypeError, ValueError):
+        return None
+
+
+def _as_bytes(content):
+    return content.encode('utf-8') if isinstance(content, str) else content
+
+
+def write_file_atomic(path, content):
+    """Grava o arquivo (texto ou bytes) em um temporário e o substitui atomicamente."""
+    tmp_path = f"{path}.tmp"
+    with open(tmp_path, 'wb') as f:
+        f.write(_as_bytes(content))
+        f.flush()
+        os.fsync(f.fileno())
+    os.replace(tmp_path, path)
+
+
+def file_signature(path):
+    """Identifica a versão de um arquivo por (mtime, tamanho, inode); None se não existir."""
+    try:
+        stats = os.stat(path)
+    except FileNotFoundError:
+        return None
+    return stats.st_mtime_ns, stats.st_size, stats.st_ino
+
+
+def _in_range(date_str, start, end):
+    if start is None and end is None:
+        return True
+    ordinal = date_ordinal(date_str)
+    if ordinal is None:
+        return False
+    return (start is None or ordinal >= start) and (end is None or ordinal <= end)
+
+
+class MovementFilter:
+    """Filtro de movimentações aplicado durante a leitura; start/end são ordinais inclusivos (ver between())."""
+
+    def __init__(self, food_id=None, start=None, end=None):
+        self.food_id = food_id
+        self.start = start
+        self.end = end
+
+    @classmethod
+    def between(cls, start_date=None, end_date=None, **kwargs):
+        """Filtro a partir de datas 'dd/mm/aaaa' (None ou vazio = sem limite)."""
+        start = date_ordinal(start_date) if start_date else None
+        end = date_ordinal(end_date) if end_date else None
+        return cls(start=start, end=end, **kwargs)
+
+    def matches(self, record):
+        return (
+            (self.food_id is None or record.get('food_id') == self.food_id)
+            and _in_range(record.get('date'), self.start, self.end)
+        )
+
+
+# ==================== PARTIÇÕES MENSAIS ====================
+@lru_cache(maxsize=4096)
+def partition_key(date_str):
+    """Partição ('aaaa-mm') de uma movimentação a partir da data 'dd/mm/aaaa'."""
+    ordinal = date_ordinal(date_str)
+    if ordinal is None:
+        return UNDATED_PARTITION
+    day = date.fromordinal(ordinal)
+    return f"{day.year:04d}-{day.month:02d}"
+
+
+def group_by_partition(records):
+    """Registros agrupados por partição ('aaaa-mm'), na ordem original."""
+    groups = defaultdict(list)
+    for record in records:
+        groups[partition_key(record.get('date'))].append(record)
+    return groups
+
+
+def records_digest(records):
+    """Hash dos registros de uma partição, independente do formato do arquivo."""
+    return snapshot_digest(json.dumps(records, separators=(',', ':')).encode('utf-8'))
+
+
+def partition_stats(records, content):
+    """Resumo de uma partição para o manifesto: datas, contagem por alimento e hashes."""
+    ordinals = [ordinal for ordinal in map(date_ordinal, (r.get('date') for r in records))
+                if ordinal is not None]
+    foods = Counter(str(r['food_id']) for r in records if r.get('food_id') is not None)
+    return {
+        'count': len(records),
+        'min_date': min(ordinals, default=None),
+        'max_date': max(ordinals, default=None),
+        'foods': dict(foods),
+        'digest': snapshot_digest(content),
+        'records': records_digest(records)
+    }
+
+
+class MovementPartitions:
+    """Movimentações de um tipo em partições mensais, com um manifesto (datas, alimentos e hash de cada uma)."""
+
+    def __init__(self, data_path):
+        self.legacy_path = data_path  # Layout anterior: um único arquivo
+        self.directory = os.path.splitext(data_path)[0]
+        self.manifest_path = os.path.join(self.directory, PARTITION_MANIFEST)
+        self.journal = MovementJournal(self.manifest_path)
+
+    def partition_path(self, key):
+        return os.path.join(self.directory, f"{key}.json")
+
+    def read_manifest(self):
+        """Retorna (hash do manifesto, manifesto); sem manifesto, não há partições."""
+        try:
+            with open(self.manifest_path, 'rb') as f:
+                content = f.read()
+        except FileNotFoundError:
+            return None, {'version': 0, 'partitions': {}}
+        return snapshot_digest(content), json.loads(content)
+
+    def select(self, manifest, record_filter=None):
+        """Partições, em ordem cronológica, que podem conter registros do filtro."""
+        keys = []
+        for key, stats in sorted(manifest['partitions'].items()):
+            if record_filter is not None:
+                if record_filter.food_id is not None and str(record_filter.food_id) not in stats['foods']:
+                    continue
+                if record_filter.start is not None or record_filter.end is not None:
+                    if stats['min_date'] is None:
+                        continue  # Só datas inválidas: nunca entram em um período
+                    if record_filter.start is not None and stats['max_date'] < record_filter.start:
+                        continue
+                    if record_filter.end is not None and stats['min_date'] > record_filter.end:
+                        continue
+            keys.append(key)
+        return keys
+
+    def iter_records(self, record_filter=None, changes=None):
+        """Registros das partições e do diário; changes ({partição: registros} no WAL) substitui os do disco."""
+        digest, manifest = self.read_manifest()
+        matches = record_filter.matches if record_filter else None
+        keys = set(self.select(manifest, record_filter)) | set(changes or ())
+        for key in sorted(keys):
+            if changes and key in changes:
+                for record in changes[key]:
+                    if matches is None or matches(record):
+                        yield dict(record)
+                continue
+            with open(self.partition_path(key), 'rb') as f:
+                for record in iter_file(f):
+                    if matches is None or matches(record):
+                        yield record
+
+        if changes is None:
+            for record in self.journal.read(digest):
+                if matches is None or matches(record):
+                    yield record
+
+    def count(self, changes=None):
+        """Número de registros, pelo manifesto (só o diário é lido)."""
+        digest, manifest = self.read_manifest()
+        total = sum(len(records) for records in (changes or {}).values())
+        total += sum(
+            stats['count'] for key, stats in manifest['partitions'].items()
+            if key not in (changes or {})
+        )
+        if changes is None:
+            total += sum(1 for _ in self.journal.read(digest))
+        return total
+
+    def changes_for(self, records, pending=None):
+        """Partições que mudam para que o conjunto passe a ser records ({partição: registros}; vazia = removida)."""
+        _, manifest = self.read_manifest()
+        pending = pending or {}
+        groups = group_by_partition(records)
+        changes = {
+            key: [] for key in set(manifest['partitions']) | set(pending)
+            if key not in groups and (key not in pending or pending[key])
+        }
+        for key, group in groups.items():
+            if key in pending:
+                unchanged = pending[key] == group
+            else:
+                stats = manifest['partitions'].get(key)
+                unchanged = (stats is not None and stats['count'] == len(group)
+                             and stats.get('records') == records_digest(group)
+                             and os.path.exists(self.partition_path(key)))
+            if not unchanged:
+                changes[key] = group
+        return changes
+
+    def changes_without(self, record_filter, pending=None):
+        """Partições que mudam ao remover os registros do filtro, lendo só as que podem contê-los."""
+        digest, manifest = self.read_manifest()
+        changes = {}
+        journal = []
+        if pending is None:
+            journal = [r for r in self.journal.read(digest) if not record_filter.matches(r)]
+        else:
+            for key, records in pending.items():
+                kept = [r for r in records if not record_filter.matches(r)]
+                if len(kept) != len(records):
+                    changes[key] = kept
+        from_journal = group_by_partition(journal)
+        for key in (set(self.select(manifest, record_filter)) | set(from_journal)) - set(pending or ()):
+            records = []
+            if key in manifest['partitions']:
+                with open(self.partition_path(key), 'rb') as f:
+                    records = decode(f.read())
+            kept = [r for r in records if not record_filter.matches(r)]
+            if len(kept) != len(records) or key in from_journal:
+                changes[key] = kept + from_journal.get(key, [])
+        return changes
+
+    def plan_changes(self, changes, codec):
+        """Arquivos a gravar e a remover para aplicar changes ({partição: registros}) às partições."""
+        _, manifest = self.read_manifest()
+        partitions = dict(manifest['partitions'])
+        writes, removals = [], []
+        for key, records in sorted(changes.items()):
+            path = self.partition_path(key)
+            if records:
+                content = codec.dumps(records)
+                writes.append((path, content))
+                partitions[key] = partition_stats(records, content)
+            elif partitions.pop(key, None) is not None:
+                removals.append(path)
+        # A versão muda a cada gravação: o diário antigo nunca casa com o novo manifesto
+        new_manifest = {'version': manifest['version'] + 1, 'partitions': dict(sorted(partitions.items()))}
+        writes.append((self.manifest_path, json.dumps(new_manifest, indent=2)))
+        return writes, removals
+
+    def plan_save(self, records, codec, rewrite_all=False):
+        """Arquivos a gravar e a remover para que as partições contenham exatamente records."""
+        changes = self.changes_for(records)
+        if rewrite_all:
+            changes.update(group_by_partition(records))
+        return self.plan_changes(changes, codec)
+
+
+# ==================== JSON ====================
+class JsonStorage:
+    """Backend padrão: um arquivo por conjunto de dados, com WAL, partições mensais e trava entre processos."""
+    name = 'json'
+
+    def __init__(self, data_files, read_only=False):
+        self.data_files = data_files
+        self.read_only = read_only
+        self.codec = get_codec(get_config()['codec'])
+        data_dir = os.path.dirname(next(iter(data_files.values())))
+        self.manifest_path = os.path.join(data_dir, COMMIT_MANIFEST)
+        self.versions_path = os.path.join(data_dir, VERSIONS_FILE)
+        self.partitions = {
+            file_key: MovementPartitions(path)
+            for file_key, path in data_files.items() if file_key in JOURNALED_FILES
+        }
+        lock_path = os.path.join(data_dir, LOCK_FILE)
+        if read_only and not os.path.exists(lock_path):
+            self.process_lock = NullLock()
+        else:
+            self.process_lock = get_file_lock(lock_path)
+        self.wal = WriteAheadLog(os.path.join(data_dir, WAL_FILE), self.process_lock)
+        self._lock = threading.RLock()
+        self._pending = {}           # file_key -> registros (movimentações: {partição: registros}) no WAL
+        self._pending_ids = {}       # file_key -> ID da última entrada do WAL que o alterou
+        self._wal_signature = None
+        self._wal_offset = 0
+        self._checkpoint_due = threading.Event()
+        self._checkpointer = None
+        self._closed = False
+        self._versions = {}
+        self._versions_signature = None
+
+        if read_only:
+            # Nada é gravado: o WAL pendente é lido, mas recuperação e migração ficam para o aplicativo
+            if os.path.exists(self.manifest_path):
+                raise MigrationRequired(f"Gravação interrompida em {data_dir}")
+            for partitions in self.partitions.values():
+                if os.path.exists(partitions.legacy_path):
+                    raise MigrationRequired(f"{partitions.legacy_path} está no formato anterior às partições mensais")
+            return
+        with self.process_lock.exclusive():
+            self.recover()
+            self.checkpoint()  # Reaplica o que ficou no WAL (ex.: queda antes do checkpoint)
+            self.migrate_partitions()
+
+    def _check_writable(self):
+        if self.read_only:
+            raise PermissionError("Dados abertos somente para leitura")
+
+    # ---------- WAL ----------
+    def _merge_entry(self, entry, pending):
+        """Acumula uma entrada do WAL em pending. Retorna os conjuntos que ela altera."""
+        for file_key, records in entry.get('datasets', {}).items():
+            if file_key in self.partitions:
+                # Entrada no formato anterior (conjunto inteiro): substitui todas as partições
+                _, manifest = self.partitions[file_key].read_manifest()
+                changes = dict.fromkeys(set(manifest['partitions']) | set(pending.get(file_key, ())), [])
+                changes.update(group_by_partition(records))
+                pending.setdefault(file_key, {}).update(changes)
+            else:
+                pending[file_key] = records
+        for file_key, changes in entry.get('partitions', {}).items():
+            pending.setdefault(file_key, {}).update(changes)
+        return set(entry.get('datasets', ())) | set(entry.get('partitions', ()))
+
+    def _refresh_pending(self):
+        """IDs das gravações do WAL ainda não aplicadas, lidas do disco (inclusive as de outros processos)."""
+        with self._lock:
+            signature = file_signature(self.wal.path)
+            if signature == self._wal_signature:
+                return self._pending_ids
+            if (signature is None or self._wal_signature is None
+                    or signature[2] != self._wal_signature[2] or signature[1] < self._wal_offset):
+                # WAL novo ou substituído pelo checkpoint: relê desde o início
+                self._pending, self._pending_ids, self._wal_offset = {}, {}, 0
+            if signature is not None:
+                entries, self._wal_offset = self.wal.read(self._wal_offset)
+                for entry in entries:
+                    for file_key in self._merge_entry(entry, self._pending):
+                        self._pending_ids[file_key] = entry['id']
+            self._wal_signature = signature
+            return self._pending_ids
+
+    def _schedule_checkpoint(self):
+        interval = float(get_config()['checkpoint_interval'])
+        if interval <= 0:
+            self.checkpoint()  # Checkpoint desativado: aplica na hora
+            return
+        if self._checkpointer is None:
+            self._checkpointer = threading.Thread(
+                target=self._checkpoint_loop, args=(interval,), daemon=True
+            )
+            self._checkpointer.start()
+            atexit.register(self.close)
+        if self._wal_offset >= CHECKPOINT_WAL_BYTES:
+            self._checkpoint_due.set()
+
+    def _checkpoint_loop(self, interval):
+        while not self._closed:
+            self._checkpoint_due.wait(interval)
+            self._checkpoint_due.clear()
+            try:
+                self.checkpoint()
+            except (OSError, ValueError, DataFileError) as e:
+                # O WAL é mantido: nada se perde, nova tentativa no próximo ciclo
+                logging.error(f"Falha no checkpoint do WAL: {e}")
+
+    def checkpoint(self):
+        """Aplica as gravações do WAL aos arquivos de dados e descarta o trecho aplicado."""
+        self._check_writable()
+        with self._lock, self.process_lock.exclusive():
+            entries, size = self.wal.read()
+            if entries:
+                datasets, versions = {}, {}
+                for entry in entries:
+                    # Vale a última gravação de cada conjunto (ou partição)
+                    versions.update(dict.fromkeys(self._merge_entry(entry, datasets), entry['id']))
+                self._write_datasets(datasets, versions)
+            if size:
+                self.wal.discard(size)
+            self._refresh_pending()
+            return bool(entries)
+
+    def close(self):
+        """Encerra o checkpoint em segundo plano, aplicando o que estiver pendente."""
+        self._closed = True
+        if self.read_only:
+            return
+        self._checkpoint_due.set()
+        if self._checkpointer is not None and self._checkpointer is not threading.current_thread():
+            self._checkpointer.join()
+        self.checkpoint()
+
+    # ---------- versões ----------
+    def _stored_versions(self):
+        """Versões já aplicadas aos arquivos (data/versions.json), relidas só se o arquivo mudar."""
+        signature = file_signature(self.versions_path)
+        if signature != self._versions_signature:
+            try:
+                with open(self.versions_path, 'rb') as f:
+                    self._versions = json.loads(f.read())
+            except FileNotFoundError:
+                self._versions = {}
+            except ValueError as e:
+                raise DataFileError(self.versions_path, e)
+            self._versions_signature = signature
+        return self._versions
+
+    def version(self, file_key):
+        """Versão lógica de um conjunto: muda a cada gravação, de qualquer processo (o checkpoint não a altera)."""
+        pending_id = self._refresh_pending().get(file_key)
+        if pending_id:
+            return pending_id, 0
+        journal_size = 0
+        if file_key in self.partitions:
+            signature = file_signature(self.partitions[file_key].journal.path)
+            journal_size = signature[1] if signature else 0
+        return self._stored_versions().get(file_key), journal_size
+
+    def _check_versions(self, versions):
+        """Compara as versões lidas com as atuais (chamado sob a trava exclusiva)."""
+        # Relê o WAL e versions.json por inteiro: a assinatura (mtime, tamanho,
+        # inode) pode não distinguir um arquivo recriado logo após o anterior
+        self._pending, self._pending_ids, self._wal_offset, self._wal_signature = {}, {}, 0, None
+        self._versions, self._versions_signature = {}, None
+        for file_key, version in versions.items():
+            if self.version(file_key) != version:
+                raise VersionConflict(file_key)
+
+    # ---------- leitura ----------
+    def signature(self, file_key):
+        """Versão atual de um conjunto de dados (arquivos e gravação pendente no WAL)."""
+        pending_id = self._refresh_pending().get(file_key)
+        if file_key in self.partitions:
+            partitions = self.partitions[file_key]
+            return (file_signature(partitions.manifest_path),
+                    file_signature(partitions.journal.path), pending_id)
+        return file_signature(self.data_files[file_key]), pending_id
+
+    def load(self, file_key):
+        """Retorna os registros (dicionários) de um conjunto de dados."""
+        with self._lock, self.process_lock.shared():
+            self._refresh_pending()
+            if file_key in self.partitions:
+                try:
+                    return list(self.partitions[file_key].iter_records(changes=self._pending.get(file_key)))
+                except ValueError as e:
+                    raise DataFileError(self.partitions[file_key].directory, e)
+            if file_key in self._pending:
+                return [copy_record(record) for record in self._pending[file_key]]
+            path = self.data_files[file_key]
+            try:
+                with open(path, 'rb') as f:
+                    return decode(f.read())
+            except FileNotFoundError:
+                return []
+            except ValueError as e:
+                raise DataFileError(path, e)
+
+    def count(self, file_key):
+        """Número de registros de um conjunto de dados."""
+        if file_key not in self.partitions:
+            return len(self.load(file_key))
+        with self._lock, self.process_lock.shared():
+            self._refresh_pending()
+            return self.partitions[file_key].count(self._pending.get(file_key))
+
+    def iter_records(self, file_key, record_filter=None):
+        """Percorre os registros sem carregar o arquivo inteiro, aplicando o filtro na leitura."""
+        with self._lock, self.process_lock.shared():
+            yield from self._iter_records(file_key, record_filter)
+
+    def _iter_records(self, file_key, record_filter):
+        matches = record_filter.matches if record_filter else None
+        self._refresh_pending()
+        if file_key in self.partitions:
+            try:
+                yield from self.partitions[file_key].iter_records(record_filter, self._pending.get(file_key))
+            except ValueError as e:
+                raise DataFileError(self.partitions[file_key].directory, e)
+            return
+
+        if file_key in self._pending:
+            for record in self._pending[file_key]:
+                if matches is None or matches(record):
+                    yield copy_record(record)
+            return
+
+        path = self.data_files[file_key]
+        try:
+            with open(path, 'rb') as f:
+                for record in iter_file(f):
+                    if matches is None or matches(record):
+                        yield record
+        except FileNotFoundError:
+            return
+        except ValueError as e:
+            raise DataFileError(path, e)
+
+    # ---------- escrita ----------
+    def save(self, file_key, records, version=None):
+        """Substitui todo o conjunto de dados. Retorna a nova versão (ver save_many)."""
+        versions = None if version is None else {file_key: version}
+        return self.save_many({file_key: records}, versions)[file_key]
+
+    def save_many(self, datasets, versions=None, deletions=None):
+        """Substitui vários conjuntos de uma só vez (uma entrada no WAL). Retorna as novas versões.
+
+        Com versions, levanta VersionConflict se algum mudou desde a leitura; deletions remove registros por filtro.
+        """
+        self._check_writable()
+        entry_id = uuid.uuid4().hex
+        deletions = deletions or {}
+        if versions or deletions or datasets.keys() & self.partitions.keys():
+            # As partições alteradas dependem do estado atual: calculadas sob a trava exclusiva
+            with self._lock, self.process_lock.exclusive():
+                if versions:
+                    self._check_versions(versions)
+                self.wal.append(self._wal_entry(entry_id, datasets, deletions))
+        else:
+            self.wal.append(self._wal_entry(entry_id, datasets, deletions))
+        self._refresh_pending()
+        self._schedule_checkpoint()
+        return {file_key: (entry_id, 0) for file_key in list(datasets) + list(deletions)}
+
+    def _wal_entry(self, entry_id, datasets, deletions):
+        entry = {'id': entry_id, 'datasets': {}, 'partitions': {}}
+        self._refresh_pending()
+        for file_key, records in datasets.items():
+            if file_key in self.partitions:
+                # Sempre presente, mesmo sem partições alteradas: o diário é incorporado
+                entry['partitions'][file_key] = self.partitions[file_key].changes_for(
+                    records, self._pending.get(file_key)
+                )
+            else:
+                entry['datasets'][file_key] = records
+        for file_key, record_filter in deletions.items():
+            if file_key in self.partitions:
+                entry['partitions'][file_key] = self.partitions[file_key].changes_without(
+                    record_filter, self._pending.get(file_key)
+                )
+            else:
+                entry['datasets'][file_key] = [r for r in self.load(file_key) if not record_filter.matches(r)]
+        return entry
+
+    def _write_datasets(self, datasets, versions=None):
+        """Grava conjuntos de dados nos arquivos (checkpoint e conversão de formato)."""
+        writes, removals, journals = [], [], []
+        for file_key, records in datasets.items():
+            if file_key in self.partitions:
+                partitions = self.partitions[file_key]
+                if isinstance(records, dict):
+                    partition_writes, partition_removals = partitions.plan_changes(records, self.codec)
+                else:
+                    partition_writes, partition_removals = partitions.plan_save(records, self.codec, rewrite_all=True)
+                writes.extend(partition_writes)
+                removals.extend(partition_removals)
+                # As partições agora contêm todo o histórico: compacta o diário
+                journals.append(partitions.manifest_path)
+            else:
+                writes.append((self.data_files[file_key], self.codec.dumps(records)))
+        if versions:
+            writes.append((self.versions_path, json.dumps({**self._stored_versions(), **versions})))
+        self._commit(writes, removals, journals)
+
+    def _commit(self, writes, removals=(), journals=()):
+        """Grava e remove arquivos como uma única operação (concluída por recover() se o processo cair)."""
+        if len(writes) == 1 and not removals and not journals:
+            write_file_atomic(*writes[0])  # Um único arquivo: a troca atômica basta
+            return
+
+        renames = []
+        for path, content in writes:
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            tmp_path = f"{path}.commit"
+            with open(tmp_path, 'wb') as f:
+                f.write(_as_bytes(content))
+                f.flush()
+                os.fsync(f.fileno())
+            renames.append([tmp_path, path])
+
+        commit = {'renames': renames, 'removals': list(removals), 'journals': list(journals)}
+        write_file_atomic(self.manifest_path, json.dumps(commit))
+        self._apply_commit(commit)
+        os.remove(self.manifest_path)
+
+    def _apply_commit(self, commit):
+        for tmp_path, path in commit['renames']:
+            if os.path.exists(tmp_path):
+                os.replace(tmp_path, path)
+        for path in commit['removals']:
+            if os.path.exists(path):
+                os.remove(path)
+        for data_path in commit['journals']:
+            MovementJournal(data_path).clear()
+
+    def recover(self):
+        """Conclui um commit interrompido (manifesto gravado, renomeações pendentes)."""
+        try:
+            with open(self.manifest_path, 'r') as f:
+                commit = json.load(f)
+        except FileNotFoundError:
+            return
+        except json.JSONDecodeError:
+            # Manifesto incompleto: o commit não chegou a começar
+            os.remove(self.manifest_path)
+            return
+
+        if isinstance(commit, list):
+            # Formato anterior: [[file_key, temporário, destino], ...]
+            commit = {
+                'renames': [[tmp_path, path] for _, tmp_path, path in commit],
+                'removals': [],
+                'journals': [path for file_key, _, path in commit if file_key in JOURNALED_FILES]
+            }
+        self._apply_commit(commit)
+        os.remove(self.manifest_path)
+
+    def migrate_partitions(self):
+        """Converte o layout antigo (stock_entries.json + diário) em partições mensais. Retorna os conjuntos migrados.
+
+        Um arquivo antigo não vazio (ex.: backup restaurado) substitui as partições existentes.
+        """
+        migrated = []
+        for file_key, partitions in self.partitions.items():
+            legacy_path = partitions.legacy_path
+            try:
+                with open(legacy_path, 'rb') as f:
+                    content = f.read()
+                records = decode(content) if content.strip() else []
+            except FileNotFoundError:
+                continue
+            except ValueError as e:
+                raise DataFileError(legacy_path, e)  # Mantido para recuperação manual
+            records.extend(MovementJournal(legacy_path).read(snapshot_digest(content)))
+
+            if records or not os.path.exists(partitions.manifest_path):
+                writes, removals = partitions.plan_save(records, self.codec)
+                journals = [partitions.manifest_path, legacy_path]
+            else:
+                writes, removals, journals = [], [], [legacy_path]
+            self._commit(writes, removals + [legacy_path], journals)
+            migrated.append(file_key)
+        return migrated
+
+    def convert(self, codec_name):
+        """Regrava todos os conjuntos de dados no formato codec_name. Retorna a contagem por conjunto."""
+        with self._lock, self.process_lock.exclusive():
+            self.checkpoint()
+            datasets = {file_key: self.load(file_key) for file_key in self.data_files}
+            self.codec = get_codec(codec_name)
+            self._write_datasets(datasets)
+        return {file_key: len(records) for file_key, records in datasets.items()}
+
+    def append(self, file_key, records):
+        """Acrescenta registros sem reescrever o histórico. Retorna as assinaturas (antes, depois) do conjunto."""
+        self._check_writable()
+        with self._lock, self.process_lock.exclusive():
+            before = self.signature(file_key)
+            if file_key not in self.partitions:
+                self.save(file_key, self.load(file_key) + list(records))
+                return before, self.signature(file_key)
+            if file_key in self._refresh_pending():
+                # O diário vale sobre as partições: aplica antes a gravação pendente
+                self.checkpoint()
+                before = self.signature(file_key)
+            partitions = self.partitions[file_key]
+            os.makedirs(partitions.directory, exist_ok=True)
+            partitions.journal.append(records)
+            return before, self.signature(file_key)
+
+    def cost_totals(self, base_units, start=None, end=None):
+        """Custo total e quantidade total (unidade base) das entradas do período, por ID de alimento."""
+        totals = defaultdict(lambda: [0.0, 0.0])
+        for entry in self.iter_records('stock_entries', MovementFilter(start=start, end=end)):
+            quantity = entry['quantity'] * base_units[entry['unit']]
+            if quantity > 0 and entry.get('food_id') is not None:
+                totals[entry['food_id']][0] += entry['cost']
+                totals[entry['food_id']][1] += quantity
+        return {name: tuple(values) for name, values in totals.items()}
+
+
+# ==================== SQLITE ====================
+SQLITE_COLUMNS = {
+    'foods': ['id', 'name', 'unit', 'quantity_in_stock', 'quantity_per_portion',
+              'calories', 'proteins', 'carbs', 'fats', 'min_stock', 'ideal_stock'],
+    'suppliers': ['id', 'name', 'type', 'location'],
+    'stock_entries': ['food_name', 'quantity', 'unit', 'cost', 'date', 'supplier',
+                      'food_id', 'supplier_id'],
+    'stock_exits': ['food_name', 'quantity', 'unit', 'date', 'reason', 'food_id'],
+}
+MEAL_ITEM_COLUMNS = ['food_name', 'quantity', 'unit', 'food_id']
+# Colunas adicionadas depois da primeira versão do esquema (bancos já existentes)
+SQLITE_ADDED_COLUMNS = [
+    ('foods', 'id', 'INTEGER'),
+    ('suppliers', 'id', 'INTEGER'),
+    ('stock_entries', 'food_id', 'INTEGER'),
+    ('stock_entries', 'supplier_id', 'INTEGER'),
+    ('stock_exits', 'food_id', 'INTEGER'),
+    ('meal_items', 'food_id', 'INTEGER'),
+]
+SQLITE_ID_INDEXES = """
+CREATE INDEX IF NOT EXISTS idx_foods_id ON foods(id);
+CREATE INDEX IF NOT EXISTS idx_suppliers_id ON suppliers(id);
+CREATE INDEX IF NOT EXISTS idx_stock_entries_food_id ON stock_entries(food_id, date_ord);
+CREATE INDEX IF NOT EXISTS idx_stock_entries_supplier_id ON stock_entries(supplier_id);
+CREATE INDEX IF NOT EXISTS idx_stock_exits_food_id ON stock_exits(food_id, date_ord);
+CREATE INDEX IF NOT EXISTS idx_meal_items_food_id ON meal_items(food_id);
+"""
+
+SQLITE_SCHEMA = """
+CREATE TABLE IF NOT EXISTS foods (
+    seq INTEGER PRIMARY KEY, name TEXT, unit TEXT, quantity_in_stock REAL,
+    quantity_per_portion REAL, calories REAL, proteins REAL, carbs REAL,
+    fats REAL, min_stock REAL, ideal_stock REAL
+);
+CREATE INDEX IF NOT EXISTS idx_foods_name ON foods(name);
+
+CREATE TABLE IF NOT EXISTS suppliers (
+    seq INTEGER PRIMARY KEY, name TEXT, type TEXT, location TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_suppliers_name ON suppliers(name);
+
+CREATE TABLE IF NOT EXISTS stock_entries (
+    seq INTEGER PRIMARY KEY, food_name TEXT, quantity REAL, unit TEXT,
+    cost REAL, date TEXT, supplier TEXT, date_ord INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_stock_entries_food ON stock_entries(food_name, date_ord);
+CREATE INDEX IF NOT EXISTS idx_stock_entries_supplier ON stock_entries(supplier);
+CREATE INDEX IF NOT EXISTS idx_stock_entries_date ON stock_entries(date_ord);
+
+CREATE TABLE IF NOT EXISTS stock_exits (
+    seq INTEGER PRIMARY KEY, food_name TEXT, quantity REAL, unit TEXT,
+    date TEXT, reason TEXT, date_ord INTEGER
+);
+CREATE INDEX IF NOT EXISTS idx_stock_exits_food ON stock_exits(food_name, date_ord);
+CREATE INDEX IF NOT EXISTS idx_stock_exits_date ON stock_exits(date_ord);
+
+CREATE TABLE IF NOT EXISTS meals (
+    seq INTEGER PRIMARY KEY, name TEXT
+);
+CREATE TABLE IF NOT EXISTS meal_items (
+    meal_seq INTEGER REFERENCES meals(seq), position INTEGER,
+    food_name TEXT, quantity REAL, unit TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_meal_items_meal ON meal_items(meal_seq, position);
+CREATE INDEX IF NOT EXISTS idx_meal_items_food ON meal_items(food_name);
+
+CREATE TABLE IF NOT EXISTS dataset_versions (
+    file_key TEXT PRIMARY KEY, version INTEGER NOT NULL
+);
+"""
+
+
+def _unit_factor_sql(base_units):
+    """Expressão SQL que converte a coluna 'unit' no fator da unidade base."""
+    cases = " ".join("WHEN ? THEN ?" for _ in base_units)
+    params = [value for pair in base_units.items() for value in pair]
+    return f"(CASE unit {cases} END)", params
+
+
+def _where(record_filter):
+    """Cláusula WHERE (e parâmetros) de um MovementFilter."""
+    conditions, params = [], []
+    if record_filter.food_id is not None:
+        conditions.append("food_id = ?")
+        params.append(record_filter.food_id)
+    if record_filter.start is not None:
+        conditions.append("date_ord >= ?")
+        params.append(record_filter.start)
+    if record_filter.end is not None:
+        conditions.append("date_ord <= ?")
+        params.append(record_filter.end)
+    return (f"WHERE {' AND '.join(conditions)}" if conditions else ""), params
+
+
+class SqliteStorage:
+    """Backend SQLite com tabelas indexadas por alimento, fornecedor e data (uma conexão por thread)."""
+    name = 'sqlite'
+
+    def __init__(self, db_path, read_only=False):
+        self.db_path = db_path
+        self.read_only = read_only
+        self._local = threading.local()
+        self._connections = []
+        self._connections_lock = threading.Lock()
+        if read_only:
+            if not os.path.exists(db_path):
+                raise MigrationRequired(f"Banco de dados {db_path} não encontrado")
+            for table, column, _ in SQLITE_ADDED_COLUMNS:
+                if column not in [row['name'] for row in self.conn.execute(f"PRAGMA table_info({table})")]:
+                    raise MigrationRequired(f"Banco de dados {db_path} no formato anterior")
+            return
+        self.conn.executescript(SQLITE_SCHEMA)
+        self._migrate_schema()
+
+    @property
+    def conn(self):
+        """Conexão da thread atual."""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            # check_same_thread=False só para close() poder fechar as conexões das outras threads
+            if self.read_only:
+                conn = sqlite3.connect(f"file:{quote(os.path.abspath(self.db_path))}?mode=ro",
+                                       uri=True, check_same_thread=False)
+            else:
+                conn = sqlite3.connect(self.db_path, check_same_thread=False)
+            conn.row_factory = sqlite3.Row
+            self._local.conn = conn
+            with self._connections_lock:
+                self._connections.append(conn)
+        return conn
+
+    def _migrate_schema(self):
+        with self.conn:
+            # Trava de escrita: outro processo abrindo o mesmo banco não migra ao mesmo tempo
+            self.conn.execute("BEGIN IMMEDIATE")
+            for table, column, column_type in SQLITE_ADDED_COLUMNS:
+                columns = [row['name'] for row in self.conn.execute(f"PRAGMA table_info({table})")]
+                if column not in columns:
+                    self.conn.execute(f"ALTER TABLE {table} ADD COLUMN {column} {column_type}")
+        self.conn.executescript(SQLITE_ID_INDEXES)
+
+    def signature(self, file_key):
+        """Versão do conjunto de dados, incrementada a cada escrita (por qualquer processo)."""
+        row = self.conn.execute(
+            "SELECT version FROM dataset_versions WHERE file_key = ?", (file_key,)
+        ).fetchone()
+        return (row['version'] if row else 0,)
+
+    def version(self, file_key):
+        """Versão lógica do conjunto (a mesma contagem usada em signature())."""
+        return self.signature(file_key)
+
+    def _bump_version(self, file_key):
+        self.conn.execute(
+            "INSERT INTO dataset_versions (file_key, version) VALUES (?, 1) "
+            "ON CONFLICT(file_key) DO UPDATE SET version = version + 1",
+            (file_key,)
+        )
+
+    def load(self, file_key):
+        if file_key == 'meals':
+            return self._load_meals()
+        columns = SQLITE_COLUMNS[file_key]
+        rows = self.conn.execute(
+            f"SELECT {', '.join(columns)} FROM {file_key} ORDER BY seq"
+        )
+        return [dict(row) for row in rows]
+
+    def _load_meals(self):
+        meals = {}
+        for row in self.conn.execute("SELECT seq, name FROM meals ORDER BY seq"):
+            meals[row['seq']] = {'name': row['name'], 'foods': []}
+        rows = self.conn.execute(
+            f"SELECT meal_seq, {', '.join(MEAL_ITEM_COLUMNS)} FROM meal_items "
+            "ORDER BY meal_seq, position"
+        )
+        for row in rows:
+            meals[row['meal_seq']]['foods'].append(
+                {column: row[column] for column in MEAL_ITEM_COLUMNS}
+            )
+        return list(meals.values())
+
+    def _insert(self, file_key, records):
+        if file_key == 'meals':
+            for meal in records:
+                cursor = self.conn.execute("INSERT INTO meals (name) VALUES (?)", (meal['name'],))
+                placeholders = ', '.join('?' for _ in MEAL_ITEM_COLUMNS)
+                self.conn.executemany(
+                    f"INSERT INTO meal_items (meal_seq, position, {', '.join(MEAL_ITEM_COLUMNS)}) "
+                    f"VALUES (?, ?, {placeholders})",
+                    [[cursor.lastrowid, position] + [item.get(column) for column in MEAL_ITEM_COLUMNS]
+                     for position, item in enumerate(meal['foods'])]
+                )
+            return
+
+        columns = list(SQLITE_COLUMNS[file_key])
+        rows = [[record.get(column) for column in columns] for record in records]
+        if file_key in JOURNALED_FILES:
+            columns.append('date_ord')
+            for row, record in zip(rows, records):
+                row.append(date_ordinal(record['date']))
+        placeholders = ', '.join('?' for _ in columns)
+        self.conn.executemany(
+            f"INSERT INTO {file_key} ({', '.join(columns)}) VALUES ({placeholders})", rows
+        )
+
+    def save(self, file_key, records, version=None):
+        versions = None if version is None else {file_key: version}
+        return self.save_many({file_key: records}, versions)[file_key]
+
+    def save_many(self, datasets, versions=None, deletions=None):
+        """Substitui vários conjuntos de dados em uma única transação do banco.
+
+        Com versions, a transação é cancelada com VersionConflict se algum conjunto mudou desde a leitura.
+        """
+        deletions = deletions or {}
+        with self.conn:
+            if versions:
+                self.conn.execute("BEGIN IMMEDIATE")
+                for file_key, version in versions.items():
+                    if self.version(file_key) != version:
+                        raise VersionConflict(file_key)
+            for file_key, records in datasets.items():
+                if file_key == 'meals':
+                    self.conn.execute("DELETE FROM meal_items")
+                self.conn.execute(f"DELETE FROM {file_key}")
+                self._insert(file_key, records)
+                self._bump_version(file_key)
+            for file_key, record_filter in deletions.items():
+                where, params = _where(record_filter)
+                self.conn.execute(f"DELETE FROM {file_key} {where}", params)
+                self._bump_version(file_key)
+            return {file_key: self.version(file_key) for file_key in list(datasets) + list(deletions)}
+
+    def append(self, file_key, records):
+        with self.conn:
+            self.conn.execute("BEGIN IMMEDIATE")
+            before = self.signature(file_key)
+            self._insert(file_key, records)
+            self._bump_version(file_key)
+            return before, self.signature(file_key)
+
+    def count(self, file_key):
+        return self.conn.execute(f"SELECT COUNT(*) FROM {file_key}").fetchone()[0]
+
+    def iter_records(self, file_key, record_filter=None):
+        """Percorre os registros direto do cursor; o filtro vira cláusula WHERE."""
+        if file_key == 'meals':
+            yield from self._load_meals()
+            return
+        where, params = _where(record_filter or MovementFilter())
+        rows = self.conn.execute(
+            f"SELECT {', '.join(SQLITE_COLUMNS[file_key])} FROM {file_key} {where} ORDER BY seq",
+            params
+        )
+        for row in rows:
+            yield dict(row)
+
+    def cost_totals(self, base_units, start=None, end=None):
+        factor, params = _unit_factor_sql(base_units)
+        period, period_params = "", []
+        if start is not None:
+            period += " AND date_ord >= ?"
+            period_params.append(start)
+        if end is not None:
+            period += " AND date_ord <= ?"
+            period_params.append(end)
+        rows = self.conn.execute(
+            f"SELECT food_id, SUM(cost), SUM(quantity * {factor}) FROM stock_entries "
+            f"WHERE food_id IS NOT NULL AND quantity * {factor} > 0{period} GROUP BY food_id",
+            params + params + period_params
+        )
+        return {name: (cost, quantity) for name, cost, quantity in rows}
+
+    def close(self):
+        """Fecha as conexões de todas as threads."""
+        with self._connections_lock:
+            connections, self._connections = self._connections, []
+        for conn in connections:
+            conn.close()
+        self._local = threading.local()
+
+
+# ==================== SELEÇÃO / IMPORTAÇÃO ====================
+def create_storage(data_files, read_only=False):
+    """Cria o backend escolhido na configuração (storage em config.json); read_only não grava nem migra."""
+    config = get_config()
+    if config['storage'] == 'sqlite':
+        return SqliteStorage(config['sqlite_path'], read_only)
+    if config['storage'] == 'json':
+        return JsonStorage(data_files, read_only)
+    raise ValueError(f"Backend de armazenamento desconhecido: {config['storage']}")
+
+
+def copy_sqlite(source_path, target_path):
+    """Copia um banco SQLite pela API de backup do SQLite (cópia consistente mesmo com gravações em curso)."""
+    source = sqlite3.connect(source_path)
+    target = sqlite3.connect(target_path)
+    try:
+        source.backup(target)
+    finally:
+        target.close()
+        source.close()
+
+
+def import_json_to_sqlite(data_files, db_path):
+    """Importa os arquivos data/*.json para um banco SQLite. Retorna a contagem por conjunto."""
+    source = JsonStorage(data_files)
+    target = SqliteStorage(db_path)
+    counts = {}
+    try:
+        for file_key in data_files:
+            records = source.load(file_key)
+            target.save(file_key, records)
+            counts[file_key] = len(records)
+    finally:
+        target.close()
+    return counts
@@ -0,0 +1,196 @@
+# src/modules/tables.py
+from collections import namedtuple
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLineEdit, QTableView, QLabel, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import Qt, QAbstractTableModel, QModelIndex, QTimer
+from src.modules.search import NameIndex, normalize_name
+from src.modules.workers import Task, WorkerPool
+
+# Linhas entregues à view por vez e espera após a última tecla do filtro (ms)
+FETCH_BATCH = 500
+FILTER_DEBOUNCE_MS = 200
+
+# Coluna de uma página: título, valor a partir do registro e chave de ordenação (padrão: o próprio valor)
+Column = namedtuple('Column', ['header', 'value', 'sort_key'], defaults=[None])
+
+
+def default_sort_key(value):
+    # Vazios por último; textos sem acentos e sem diferenciar maiúsculas
+    return (value is None, normalize_name(value) if isinstance(value, str) else value)
+
+
+def display(value):
+    return "" if value is None else str(value)
+
+
+def row_text(columns, record):
+    return " ".join(display(column.value(record)) for column in columns)
+
+
+def sort_order(records, column, descending=False):
+    """Posições dos registros ordenados pela coluna (roda no pool de tarefas)."""
+    value, sort_key = column.value, column.sort_key or default_sort_key
+    keys = [sort_key(value(record)) for record in records]
+    return sorted(range(len(records)), key=keys.__getitem__, reverse=descending)
+
+
+def row_index(columns, records):
+    """NameIndex do texto das linhas; os itens são as posições (nada é copiado)."""
+    return NameIndex(range(len(records)), text=lambda position: row_text(columns, records[position]))
+
+
+class RecordTableModel(QAbstractTableModel):
+    """Registros de um conjunto de dados (lista de objetos ou StockLedger) exibidos por colunas.
+
+    As linhas são lidas sob demanda (fetchMore); ordem e filtro chegam prontos em set_rows.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.columns = []
+        self.records = []
+        self.order = range(0)  # Posições na ordem atual (sem filtro)
+        self._visible = self.order  # Posições exibidas (ordem atual, com filtro)
+        self._loaded = 0
+
+    def set_records(self, columns, records):
+        self.columns = list(columns)
+        self.records = records
+        order = range(len(records))
+        self.set_rows(order, order)
+
+    def set_rows(self, order, visible):
+        self.beginResetModel()
+        self.order = order
+        self._visible = visible
+        self._loaded = min(FETCH_BATCH, len(visible))
+        self.endResetModel()
+
+    def record(self, row):
+        return self.records[self._visible[row]]
+
+    def match_count(self):
+        return len(self._visible)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._loaded
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.columns)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and index.isValid():
+            return display(self.columns[index.column()].value(self.record(index.row())))
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.columns[section].header
+        return None
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._loaded < len(self._visible)
+
+    def fetchMore(self, parent=QModelIndex()):
+        count = min(FETCH_BATCH, len(self._visible) - self._loaded)
+        self.beginInsertRows(QModelIndex(), self._loaded, self._loaded + count - 1)
+        self._loaded += count
+        self.endInsertRows()
+
+
+class TablePage(QWidget):
+    """Tabela de uma página de dados, com filtro e ordenação pelo cabeçalho calculados no pool de tarefas."""
+
+    def __init__(self, pool=None, parent=None):
+        super().__init__(parent)
+        self.pool = pool or WorkerPool(max_threads=1)
+        self._task = None
+        self._index = None  # NameIndex das linhas, montado no primeiro filtro
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+
+        self.filter_input = QLineEdit()
+        self.filter_input.setPlaceholderText("Filtrar...")
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_input.textChanged.connect(self.filter_timer.start)
+        layout.addWidget(self.filter_input)
+
+        self.model = RecordTableModel(self)
+        self.table = QTableView()
+        self.table.setModel(self.model)
+        self.table.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.table.verticalHeader().setVisible(False)
+        self.header = self.table.horizontalHeader()
+        self.header.setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
+        self.header.setSectionsClickable(True)
+        self.header.setSortIndicatorShown(True)
+        self.header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.header.sortIndicatorChanged.connect(self.apply_sort)
+        layout.addWidget(self.table)
+
+        self.status_label = QLabel()
+        layout.addWidget(self.status_label)
+
+    def set_records(self, columns, records):
+        """Exibe os registros na ordem original, sem filtro."""
+        self._cancel()
+        self._index = None
+        self.filter_timer.stop()
+        self.filter_input.blockSignals(True)
+        self.filter_input.clear()
+        self.filter_input.blockSignals(False)
+        self.header.blockSignals(True)
+        self.header.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.header.blockSignals(False)
+        self.model.set_records(columns, records)
+        self.update_status()
+
+    def apply_sort(self, section, order):
+        columns, records = self.model.columns, self.model.records
+        if 0 <= section < len(columns):
+            descending = order == Qt.SortOrder.DescendingOrder
+            self._update_rows(lambda: sort_order(records, columns[section], descending))
+        else:
+            self._update_rows(lambda: range(len(records)))
+
+    def apply_filter(self):
+        self._update_rows()
+
+    def _update_rows(self, sort=None):
+        """Calcula no pool a ordem (se sort for dado) e as linhas do filtro atual."""
+        self._cancel()
+        columns, records = self.model.columns, self.model.records
+        order, index = self.model.order, self._index
+        text = self.filter_input.text().strip()
+
+        def compute(task):
+            rows = sort() if sort is not None else order
+            if not text:
+                return rows, rows, index
+            rows_index = index or row_index(columns, records)
+            task.progress(0)  # Ponto de cancelamento
+            allowed = set(rows_index.positions(text))
+            return rows, [position for position in rows if position in allowed], rows_index
+
+        self._task = Task(compute)
+        self._task.signals.result.connect(self._show_rows)
+        self.status_label.setText("Atualizando...")
+        self.pool.start(self._task)
+
+    def _show_rows(self, result):
+        order, visible, self._index = result
+        self._task = None
+        self.model.set_rows(order, visible)
+        self.update_status()
+
+    def _cancel(self):
+        if self._task is not None:
+            self._task.cancel()  # O resultado de uma tarefa cancelada não é entregue
+            self._task = None
+
+    def update_status(self):
+        total, shown = len(self.model.records), self.model.match_count()
+        self.status_label.setText(f"{total} registros" if shown == total else f"{shown} de {total} registros")
@@ -0,0 +1,65 @@
+# src/modules/usage.py
+import threading
+from collections import defaultdict
+from src.modules.cache import dataset_cache
+
+
+class MealUsageIndex:
+    """Índice invertido alimento (ID) -> usos nas refeições, por versão de meals e foods.
+
+    Itens em unidade sem conversão para a do alimento ficam em incompatible, fora do consumo.
+    """
+
+    def __init__(self, base_units, unit_kinds):
+        self.base_units = base_units
+        self.unit_kinds = unit_kinds
+        self._lock = threading.Lock()
+        self._storage = None
+        self._signature = None
+        self._usages = {}        # food_id -> [(refeição, quantidade na unidade base)]
+        self._daily = {}         # food_id -> soma das quantidades
+        self._incompatible = []  # (refeição, food_id, unidade do item)
+
+    def _build(self, storage):
+        units = {
+            record['id']: record['unit']
+            for record in dataset_cache.get('foods', storage)
+            if record.get('id') is not None
+        }
+        usages, incompatible = defaultdict(list), []
+        for meal in dataset_cache.get('meals', storage):
+            for item in meal['foods']:
+                food_id = item.get('food_id')
+                if food_id not in units:
+                    continue
+                if self.unit_kinds[item['unit']] != self.unit_kinds[units[food_id]]:
+                    incompatible.append((meal['name'], food_id, item['unit']))
+                    continue
+                usages[food_id].append((meal['name'], item['quantity'] * self.base_units[item['unit']]))
+        self._usages = dict(usages)
+        self._daily = {food_id: sum(q for _, q in items) for food_id, items in usages.items()}
+        self._incompatible = incompatible
+
+    def _refresh(self, storage):
+        signature = (storage.signature('meals'), storage.signature('foods'))
+        if storage is not self._storage or signature != self._signature:
+            self._build(storage)
+            self._storage, self._signature = storage, signature
+
+    def usages(self, food_id, storage):
+        """Usos do alimento: [(refeição, quantidade na unidade base)]."""
+        with self._lock:
+            self._refresh(storage)
+            return list(self._usages.get(food_id, ()))
+
+    def daily_usage(self, storage):
+        """Consumo diário (unidade base) de cada alimento usado em refeições, por ID."""
+        with self._lock:
+            self._refresh(storage)
+            return dict(self._daily)
+
+    def incompatible(self, storage):
+        """Itens de refeição sem conversão para a unidade do alimento: [(refeição, food_id, unidade)]."""
+        with self._lock:
+            self._refresh(storage)
+            return list(self._incompatible)
@@ -1,15 +1,21 @@
 # src/modules/utils.py
 import os
-import json
 from datetime import datetime
-from collections import defaultdict
-from difflib import get_close_matches
-import unicodedata
-from PyQt6.QtWidgets import QTableWidget, QTableWidgetItem, QHeaderView
+from src.modules.storage import create_storage, VersionConflict
+from src.modules.cache import dataset_cache, ledger_cache, name_index_cache
+from src.modules.search import normalize_name
+from src.modules.costs import CostIndex
+from src.modules.usage import MealUsageIndex
+from src.modules.movements import MovementIndex, MOVEMENT_FILE_KEYS
+from src.modules.references import resolve_references, reference_resolver
+from src.modules.tables import TablePage
 
 # ==================== CLASS DEFINITIONS ====================
 class Food:
-    def __init__(self, name, unit, quantity_in_stock, quantity_per_portion, calories, proteins, carbs, fats, min_stock=0, ideal_stock=0):
+    __slots__ = ('id', 'name', 'unit', 'quantity_in_stock', 'quantity_per_portion', 'calories', 'proteins', 'carbs', 'fats', 'min_stock', 'ideal_stock')
+
+    def __init__(self, name, unit, quantity_in_stock, quantity_per_portion, calories, proteins, carbs, fats, min_stock=0, ideal_stock=0, id=None):
+        self.id = id  # ID estável (referenciado pelo histórico e pelas refeições)
         self.name = name
         self.unit = unit
         self.quantity_in_stock = quantity_in_stock
@@ -22,20 +28,24 @@ class Food:
         self.ideal_stock = ideal_stock
 
     def to_dict(self):
-        return self.__dict__
+        return {field: getattr(self, field) for field in self.__slots__}
     
     def normalize_name(self):
-        return unicodedata.normalize('NFD', self.name).encode('ascii', 'ignore').decode('ascii').lower()
+        return normalize_name(self.name)
 
 
 class Supplier:
-    def __init__(self, name, type, location):
+    __slots__ = ('id', 'name', 'type', 'location')
+
+    def __init__(self, name, type, location, id=None):
+        self.id = id
         self.name = name
         self.type = type
         self.location = location
 
     def to_dict(self):
         return {
+            'id': self.id,
             'name': self.name,
             'type': self.type,
             'location': self.location
@@ -43,34 +53,43 @@ class Supplier:
 
 
 class StockEntry:
-    def __init__(self, food_name, quantity, unit, cost, date, supplier):
+    __slots__ = ('food_name', 'quantity', 'unit', 'cost', 'date', 'supplier', 'food_id', 'supplier_id')
+
+    def __init__(self, food_name, quantity, unit, cost, date, supplier, food_id=None, supplier_id=None):
         self.food_name = food_name
         self.quantity = quantity
         self.unit = unit
         self.cost = cost
         self.date = date
         self.supplier = supplier
+        self.food_id = food_id
+        self.supplier_id = supplier_id
 
     def to_dict(self):
-        return self.__dict__
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class StockExit:
-    def __init__(self, food_name, quantity, unit, date, reason):
+    __slots__ = ('food_name', 'quantity', 'unit', 'date', 'reason', 'food_id')
+
+    def __init__(self, food_name, quantity, unit, date, reason, food_id=None):
         self.food_name = food_name
         self.quantity = quantity
         self.unit = unit
         self.date = date
         self.reason = reason
+        self.food_id = food_id
 
     def to_dict(self):
-        return self.__dict__
+        return {field: getattr(self, field) for field in self.__slots__}
 
 
 class Meal:
+    __slots__ = ('name', 'foods')
+
     def __init__(self, name, foods):
         self.name = name
-        self.foods = foods  # Lista de dicionários: {'food_name': str, 'quantity': float, 'unit': str}
+        self.foods = foods  # Lista de dicionários: {'food_name': str, 'quantity': float, 'unit': str, 'food_id': int}
 
     def to_dict(self):
         return {
@@ -83,6 +102,8 @@ class Meal:
 UNIDADES = ['g', 'kg', 'unidades', 'litros', 'ml']
 TIPOS_FORNECEDORES = ['mercado', 'padaria', 'açougue', 'outro']
 BASE_UNITS = {'g': 1, 'kg': 1000, 'ml': 1, 'litros': 1000, 'unidades': 1}
+# Grandeza de cada unidade: massa e volume se convertem entre si (1 g = 1 ml, como em BASE_UNITS)
+UNIT_KINDS = {'g': 'medida', 'kg': 'medida', 'ml': 'medida', 'litros': 'medida', 'unidades': 'contagem'}
 DATA_FILES = {
     'foods': 'data/foods.json',
     'suppliers': 'data/suppliers.json',
@@ -90,6 +111,15 @@ DATA_FILES = {
     'stock_exits': 'data/stock_exits.json',
     'meals': 'data/meals.json'
 }
+# Tentativas de update_data quando outro processo grava no meio
+UPDATE_ATTEMPTS = 5
+
+# Custo médio ponderado por alimento, compartilhado pelos relatórios (instância global)
+cost_index = CostIndex(BASE_UNITS)
+# Usos de cada alimento nas refeições, na unidade base (instância global)
+meal_usage_index = MealUsageIndex(BASE_UNITS, UNIT_KINDS)
+# Entradas e saídas por alimento, ordenadas por data, para consultas por período (instância global)
+movement_index = MovementIndex(BASE_UNITS)
 
 
 # ==================== UTILITY FUNCTIONS ====================
@@ -97,19 +127,98 @@ def clear_screen():
     os.system('cls' if os.name == 'nt' else 'clear')
 
 
+_storage = None
+
+
+def get_storage():
+    """Backend de armazenamento configurado (JSON por padrão, ver config.py)."""
+    global _storage
+    if _storage is None:
+        _storage = create_storage(DATA_FILES)
+    return _storage
+
+
+class Dataset(list):
+    """Lista retornada por load_data, com a versão lida: save_data recusa gravar uma cópia desatualizada."""
+    __slots__ = ('version', 'file_key')
+
+    def __init__(self, items=(), version=None, file_key=None):
+        super().__init__(items)
+        self.version = version
+        self.file_key = file_key
+
+
 def load_data(file_key, class_type):
-    """Carrega dados de um arquivo JSON e retorna uma lista de objetos da classe especificada."""
-    try:
-        with open(DATA_FILES[file_key], 'r') as f:
-            return [class_type(**item) for item in json.load(f)]
-    except (FileNotFoundError, json.JSONDecodeError):
-        return []  # Retorna uma lista vazia se o arquivo não existir ou estiver corrompido
+    """Carrega um conjunto de dados e retorna uma lista de objetos da classe especificada."""
+    storage = get_storage()
+    # Versão lida antes dos registros: uma gravação no meio gera conflito, nunca perda
+    version = storage.version(file_key)
+    # Reaproveita os registros já lidos enquanto os arquivos não mudarem
+    items = Dataset((class_type(**item) for item in dataset_cache.get(file_key, storage)), version, file_key)
+    resolve_references(file_key, items, storage)  # Nomes atuais a partir dos IDs
+    return items
+
+
+def load_ledger(file_key, class_type):
+    """Movimentações em formato colunar (StockLedger), para telas e relatórios que só leem o histórico."""
+    # Montado direto do backend e mantido pronto enquanto o conjunto não mudar
+    ledger = ledger_cache.get(file_key, class_type, get_storage())
+    resolve_references(file_key, ledger, get_storage())
+    return ledger
+
+
+def iter_data(file_key, class_type, filter=None):
+    """Percorre os registros um a um, aplicando filter (MovementFilter) antes de criar os objetos."""
+    storage = get_storage()
+    resolve = reference_resolver(file_key, storage)
+    records = dataset_cache.peek(file_key, storage)
+    if records is None:
+        records = storage.iter_records(file_key, filter)
+    elif filter is not None:
+        records = (record for record in records if filter.matches(record))
+    for record in records:
+        item = class_type(**record)
+        resolve(item)
+        yield item
 
 
 def save_data(data, file_key):
-    """Salva uma lista de objetos em um arquivo JSON."""
-    with open(DATA_FILES[file_key], 'w') as f:
-        json.dump([item.to_dict() for item in data], f, indent=2)
+    """Salva uma lista de objetos no backend (VersionConflict se data, de load_data, estiver desatualizada)."""
+    dataset_cache.invalidate(file_key)
+    version = get_storage().save(
+        file_key, [item.to_dict() for item in data], version=getattr(data, 'version', None)
+    )
+    if isinstance(data, Dataset):
+        data.version = version  # A lista passa a refletir a gravação feita
+
+
+def update_data(file_key, class_type, change, attempts=UPDATE_ATTEMPTS):
+    """Relê o conjunto, aplica change(items) e grava; repete se outro processo gravar no meio.
+
+    change deve poder ser reaplicada; se retornar False, nada é gravado. Retorna se houve gravação.
+    """
+    for attempt in range(attempts):
+        items = load_data(file_key, class_type)
+        if change(items) is False:
+            return False
+        try:
+            save_data(items, file_key)
+            return True
+        except VersionConflict:
+            if attempt == attempts - 1:
+                raise
+
+
+def append_data(items, file_key):
+    """Acrescenta registros ao diário de movimentações sem reescrever o histórico."""
+    if items:
+        dataset_cache.invalidate(file_key)
+        records = [item.to_dict() for item in items]
+        signatures = get_storage().append(file_key, records)
+        if file_key == 'stock_entries':
+            cost_index.record(get_storage(), records, signatures)  # Sem reler o histórico
+        if file_key in MOVEMENT_FILE_KEYS:
+            movement_index.record(get_storage(), file_key, records, signatures)
 
 
 def validate_positive_number(value):
@@ -176,45 +285,57 @@ def format_decimal(value):
 
 def select_from_list(items, prompt, min_confidence=0.6):
     """Interactively search for items, handling special characters."""
-    current_matches = items.copy()
+    # Names are normalized once; each term narrows the current positions
+    index = name_index_cache.get(items)  # Reaproveitado enquanto o conjunto não mudar
+    items = list(items)
+    current = list(range(len(items)))
+    current_matches = items
+    approximate = False
     
     while True:
         # Show current matches
         if current_matches:
-            print("\nItens encontrados:")
+            if approximate:
+                print("\nNenhum item contém esse termo. Itens parecidos:")
+            else:
+                print("\nItens encontrados:")
             for i, item in enumerate(current_matches, 1):
                 print(f"{i}. {item.name}")
             
-            # Auto-select if only one match
-            if len(current_matches) == 1:
+            # Auto-select if only one match (never for approximate matches)
+            if len(current_matches) == 1 and not approximate:
                 print(f"\nItem único encontrado: {current_matches[0].name}")
                 return current_matches[0]
         else:
             print("\nNenhum item encontrado. Tente novamente.")
-            current_matches = items.copy()
+            current = list(range(len(items)))
+            current_matches = items
         
         # Get user input
         user_input = input(f"\n{prompt} (digite o número, novo termo, ou 'sair'): ").strip().lower()
         
         # Handle number selection
         if user_input.isdigit():
-            index = int(user_input) - 1
-            if 0 <= index < len(current_matches):
-                return current_matches[index]
+            choice = int(user_input) - 1
+            if 0 <= choice < len(current_matches):
+                return current_matches[choice]
             print("Número inválido. Tente novamente.")
             continue
         
         # Handle search term
         if user_input and user_input != 'sair':
-            # Normalize both input and food names
-            normalized_input = unicodedata.normalize('NFD', user_input)\
-                .encode('ascii', 'ignore').decode('ascii')
-            
-            current_matches = [
-                item for item in current_matches
-                if normalized_input in unicodedata.normalize('NFD', item.name)
-                .encode('ascii', 'ignore').decode('ascii').lower()
-            ]
+            # Look up the index, keeping only the current matches
+            allowed = set(current)
+            current = [position for position in index.positions(user_input) if position in allowed]
+            approximate = False
+            if not current:
+                # No name contains the term: fall back to similar names (typos)
+                current = [
+                    position for position in index.fuzzy_positions(user_input, min_confidence)
+                    if position in allowed
+                ]
+                approximate = bool(current)
+            current_matches = [items[position] for position in current]
         elif user_input == 'sair':
             return None
 
@@ -223,26 +344,6 @@ def select_from_list(items, prompt, min_confidence=0.6):
             print("Entrada inválida. Tente novamente.")
 
 
-def update_table(table: QTableWidget, headers: list, data: list):
-    """Atualiza uma tabela com os cabeçalhos e dados fornecidos."""
-    table.clear()  # Limpa a tabela
-    table.setRowCount(len(data))  # Define o número de linhas
-    table.setColumnCount(len(headers))  # Define o número de colunas
-    table.setHorizontalHeaderLabels(headers)  # Define os cabeçalhos
-
-    # Preenche a tabela com os dados
-    for row, row_data in enumerate(data):
-        for col, value in enumerate(row_data):
-            table.setItem(row, col, QTableWidgetItem(str(value)))
-
-    # Ajusta o redimensionamento das colunas
-    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-
-def create_table_page():
-    """Creates a QTableWidget for displaying tabular data."""
-    table = QTableWidget()
-    table.setColumnCount(1)  # Default to 1 column, can be adjusted later
-    table.setHorizontalHeaderLabels(["Data"])  # Default header, can be adjusted later
-    table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
-    table.verticalHeader().setVisible(False)
-    return table
\ No newline at end of file
+def create_table_page(pool=None):
+    """Creates the table (model/view, with filter and sorting) of a data page."""
+    return TablePage(pool)
\ No newline at end of file
@@ -0,0 +1,119 @@
+# src/modules/wal.py
+import os
+import json
+import threading
+
+WAL_FILE = 'wal.jsonl'
+
+
+class WriteAheadLog:
+    """Write-ahead log em linhas JSON, com um fsync por grupo de append() concorrentes."""
+
+    def __init__(self, path, process_lock=None):
+        self.path = path
+        self.process_lock = process_lock
+        self._cond = threading.Condition()
+        self._file_lock = threading.Lock()
+        self._queue = []          # Linhas aguardando gravação
+        self._enqueued = 0        # Número de entradas já enfileiradas
+        self._durable = 0         # Entradas já processadas (gravadas ou com falha)
+        self._flushing = False
+        self._failure = None      # (primeira, última, exceção) do último grupo que falhou
+
+    def append(self, entry):
+        """Grava uma entrada; retorna quando ela estiver durável."""
+        line = json.dumps(entry)
+        with self._cond:
+            self._queue.append(line)
+            self._enqueued += 1
+            number = self._enqueued
+            while self._durable < number:
+                if self._flushing:
+                    self._cond.wait()
+                    continue
+                # Este chamador grava o grupo inteiro que está na fila
+                batch, last = self._queue, self._enqueued
+                self._queue = []
+                self._flushing = True
+                self._cond.release()
+                try:
+                    self._write(batch)
+                    failure = None
+                except OSError as error:
+                    failure = (last - len(batch) + 1, last, error)
+                finally:
+                    self._cond.acquire()
+                self._durable = last
+                self._flushing = False
+                if failure:
+                    self._failure = failure
+                self._cond.notify_all()
+
+            if self._failure and self._failure[0] <= number <= self._failure[1]:
+                raise self._failure[2]
+
+    def _write(self, lines):
+        if self.process_lock is None:
+            self._write_batch(lines)
+            return
+        with self.process_lock.exclusive():
+            self._write_batch(lines)
+
+    def _write_batch(self, lines):
+        with self._file_lock:
+            prefix = '' if self._ends_with_newline() else '\n'  # Isola uma linha incompleta
+            with open(self.path, 'a') as f:
+                f.write(prefix + '\n'.join(lines) + '\n')
+                f.flush()
+                os.fsync(f.fileno())
+
+    def _ends_with_newline(self):
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(0, os.SEEK_END)
+                if f.tell() == 0:
+                    return True
+                f.seek(-1, os.SEEK_END)
+                return f.read(1) == b'\n'
+        except FileNotFoundError:
+            return True
+
+    def read(self, offset=0):
+        """Retorna (entradas a partir de offset, posição após a última linha completa).
+
+        Linhas incompletas ou inválidas (gravação interrompida) são ignoradas.
+        """
+        try:
+            with open(self.path, 'rb') as f:
+                f.seek(offset)
+                content = f.read()
+        except FileNotFoundError:
+            return [], offset
+
+        content = content[:content.rfind(b'\n') + 1]
+        entries = []
+        for line in content.splitlines():
+            try:
+                entries.append(json.loads(line))
+            except json.JSONDecodeError:
+                continue
+        return entries, offset + len(content)
+
+    def discard(self, size):
+        """Remove os primeiros size bytes (já aplicados), preservando o que foi gravado depois."""
+        with self._file_lock:
+            try:
+                with open(self.path, 'rb') as f:
+                    f.seek(size)
+                    rest = f.read()
+            except FileNotFoundError:
+                return
+            if not rest:
+                os.remove(self.path)
+                return
+            tmp_path = f"{self.path}.tmp"
+            with open(tmp_path, 'wb') as f:
+                f.write(rest)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(tmp_path, self.path)
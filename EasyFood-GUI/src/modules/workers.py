@@ -0,0 +1,80 @@
+# src/modules/workers.py
+import threading
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+
+class TaskCancelled(BaseException):
+    """Interrompe uma tarefa cancelada (não deriva de Exception, como asyncio.CancelledError)."""
+
+
+class TaskSignals(QObject):
+    progress = pyqtSignal(int, int, str)  # feito, total (0 = indeterminado), mensagem
+    result = pyqtSignal(object)
+    error = pyqtSignal(object)  # a exceção levantada
+    cancelled = pyqtSignal()
+    finished = pyqtSignal()  # sempre, depois de um dos três acima
+
+
+class Task(QRunnable):
+    """Trabalho pesado (leitura de dados, relatório, backup) rodado no pool, fora da thread da interface.
+
+    O cancelamento só interrompe fn(task) nas chamadas a task.progress(); cancellable=False o ignora.
+    """
+
+    def __init__(self, fn, cancellable=True):
+        super().__init__()
+        self.fn = fn
+        self.cancellable = cancellable
+        self.signals = TaskSignals()
+        self._cancel = threading.Event()
+
+    def cancel(self):
+        if self.cancellable:
+            self._cancel.set()
+
+    def is_cancelled(self):
+        return self._cancel.is_set()
+
+    def progress(self, done, total=0, message=""):
+        """Informa o andamento; levanta TaskCancelled se a tarefa foi cancelada."""
+        if self._cancel.is_set():
+            raise TaskCancelled()
+        self.signals.progress.emit(done, total, message)
+
+    def run(self):
+        try:
+            result = self.fn(self)
+            if self._cancel.is_set():
+                raise TaskCancelled()  # Terminou, mas ninguém espera mais o resultado
+        except TaskCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            self.signals.error.emit(e)
+        else:
+            self.signals.result.emit(result)
+        finally:
+            self.signals.finished.emit()
+
+
+class WorkerPool:
+    """QThreadPool das tarefas da interface; guarda as que estão em andamento."""
+
+    def __init__(self, max_threads=None):
+        self.pool = QThreadPool()
+        if max_threads:
+            self.pool.setMaxThreadCount(max_threads)
+        self._tasks = set()
+
+    def start(self, task):
+        """Executa a tarefa; conecte os sinais antes (ela pode terminar logo)."""
+        self._tasks.add(task)  # Mantém os sinais vivos até a entrega
+        task.signals.finished.connect(lambda: self._tasks.discard(task))
+        self.pool.start(task)
+        return task
+
+    def shutdown(self):
+        """Cancela o que for cancelável e espera as tarefas em execução terminarem."""
+        self.pool.clear()
+        for task in list(self._tasks):
+            task.cancel()
+        self.pool.waitForDone()
@@ -0,0 +1,35 @@
+import os
+import sys
+import shutil
+import pytest
+
+APP_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+sys.path.insert(0, APP_DIR)
+os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+
+
+@pytest.fixture
+def sqlite_app(tmp_path, monkeypatch):
+    """Cópia dos dados de exemplo num banco SQLite em tmp_path, usada pelo get_storage()."""
+    from src.modules import utils
+    from src.modules.config import reset_config
+    from src.modules.references import migrate_ids
+    from src.modules.storage import import_json_to_sqlite
+
+    shutil.copytree(os.path.join(APP_DIR, 'data'), tmp_path / 'data')
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setenv('EASYFOOD_STORAGE', 'sqlite')
+    monkeypatch.setenv('EASYFOOD_SQLITE_PATH', str(tmp_path / 'easyfood.db'))
+    reset_config()
+    import_json_to_sqlite(utils.DATA_FILES, str(tmp_path / 'easyfood.db'))
+    monkeypatch.setattr(utils, '_storage', None)
+    migrate_ids(utils.get_storage())
+    yield utils.get_storage()
+    utils.get_storage().close()
+    reset_config()
+
+
+@pytest.fixture(scope='session')
+def qapp():
+    from PyQt6.QtWidgets import QApplication
+    return QApplication.instance() or QApplication(sys.argv)
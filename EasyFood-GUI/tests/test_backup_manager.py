@@ -0,0 +1,19 @@
+import os
+
+
+def test_sqlite_backup_restores_to_configured_path(sqlite_app, tmp_path):
+    from src.modules.backup_manager import BackupManager
+    manager = BackupManager()
+    foods = sqlite_app.load('foods')
+
+    assert manager.create_backup()
+    [backup] = manager.list_backups()
+    assert 'easyfood.db' in os.listdir(tmp_path / 'backups' / backup)
+
+    sqlite_app.save('foods', foods[:1])
+    sqlite_app.close()
+    restored, message = manager.restore_backup(backup)
+
+    assert restored, message
+    assert sqlite_app.load('foods') == foods
+    assert not os.path.exists(tmp_path / 'data' / 'easyfood.db')
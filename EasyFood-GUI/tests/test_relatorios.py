@@ -0,0 +1,14 @@
+from src.modules.relatorios import RelatoriosManager
+
+
+def test_stock_report_has_no_total_row(sqlite_app):
+    html = RelatoriosManager().render_report('stock')
+
+    assert "Adequado" in html
+    assert "class='total'" not in html
+
+
+def test_inventory_report_styles_its_totals(sqlite_app):
+    html = RelatoriosManager().render_report('inventory')
+
+    assert html.count("class='total'") == 3
@@ -0,0 +1,17 @@
+from src.modules.cache import name_index_cache
+from src.modules.search_dialog import SearchDialog
+from src.modules.utils import Food, load_data
+
+
+def test_dialog_reuses_cached_index_and_returns_callers_items(qapp, sqlite_app):
+    name_index_cache.invalidate()
+    first = SearchDialog(load_data('foods', Food), "Selecione")
+    foods = load_data('foods', Food)
+
+    dialog = SearchDialog(foods, "Selecione")
+    dialog.search_input.setText("banana")
+    dialog.search_now()
+    dialog.select_item()
+
+    assert dialog.index is first.index
+    assert dialog.get_selected_item() is next(food for food in foods if food.name == "Banana")
@@ -0,0 +1,76 @@
+from operator import attrgetter
+from PyQt6.QtCore import Qt, QModelIndex
+from src.modules.ledger import StockLedger
+from src.modules.tables import FETCH_BATCH, Column, RecordTableModel, TablePage, sort_order
+from src.modules.utils import StockExit
+from src.modules.visualizacao import STOCK_EXIT_COLUMNS
+
+EXITS = [
+    {'food_name': "Feijão", 'quantity': 2.0, 'unit': 'kg', 'date': '05/02/2025', 'reason': "Consumo"},
+    {'food_name': "Arroz", 'quantity': 1.0, 'unit': 'kg', 'date': '20/01/2025', 'reason': "Consumo"},
+    {'food_name': "Açúcar", 'quantity': 0.5, 'unit': 'kg', 'date': '01/03/2025', 'reason': "Vencido"},
+]
+
+
+def ledger():
+    return StockLedger.from_records(StockExit, EXITS)
+
+
+def finish(qapp, page):
+    page.pool.pool.waitForDone()
+    qapp.processEvents()  # Entrega o resultado da tarefa à thread da interface
+
+
+def names(page):
+    model = page.model
+    return [model.data(model.index(row, 0)) for row in range(model.rowCount())]
+
+
+def test_model_reads_rows_lazily_from_ledger(qapp):
+    model = RecordTableModel()
+    records = StockLedger.from_records(StockExit, EXITS * FETCH_BATCH)
+
+    model.set_records(STOCK_EXIT_COLUMNS, records)
+
+    assert model.records is records
+    assert model.rowCount() == FETCH_BATCH
+    assert model.canFetchMore(QModelIndex())
+    assert model.data(model.index(1, 3)) == '20/01/2025'
+
+
+def test_sort_order_uses_column_sort_key():
+    records = list(ledger())
+
+    assert sort_order(records, STOCK_EXIT_COLUMNS[0]) == [2, 1, 0]  # Açúcar, Arroz, Feijão
+    assert sort_order(records, STOCK_EXIT_COLUMNS[3], descending=True) == [2, 0, 1]
+    assert sort_order(records, Column("Qtd", attrgetter('quantity'))) == [2, 1, 0]
+
+
+def test_page_sorts_and_filters_in_pool(qapp):
+    page = TablePage()
+    page.set_records(STOCK_EXIT_COLUMNS, ledger())
+
+    page.header.setSortIndicator(3, Qt.SortOrder.AscendingOrder)
+    finish(qapp, page)
+    assert names(page) == ["Arroz", "Feijão", "Açúcar"]
+
+    page.filter_input.setText("consumo")
+    page.apply_filter()
+    finish(qapp, page)
+    assert names(page) == ["Arroz", "Feijão"]
+    assert page.status_label.text() == "2 de 3 registros"
+
+    page.set_records(STOCK_EXIT_COLUMNS, ledger())
+    assert names(page) == ["Feijão", "Arroz", "Açúcar"]
+    assert page.filter_input.text() == ""
+
+
+def test_new_records_discard_pending_sort(qapp):
+    page = TablePage()
+    page.set_records(STOCK_EXIT_COLUMNS, ledger())
+
+    page.header.setSortIndicator(0, Qt.SortOrder.AscendingOrder)
+    page.set_records(STOCK_EXIT_COLUMNS, ledger()[:2])
+    finish(qapp, page)
+
+    assert names(page) == ["Feijão", "Arroz"]
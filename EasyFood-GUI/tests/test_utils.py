@@ -0,0 +1,22 @@
+from collections import namedtuple
+from src.modules.utils import select_from_list
+
+Item = namedtuple('Item', ['name'])
+ITEMS = [Item("Arroz branco"), Item("Feijão preto"), Item("Arroz integral"), Item("Açúcar")]
+
+
+def answer(monkeypatch, *inputs):
+    replies = iter(inputs)
+    monkeypatch.setattr('builtins.input', lambda prompt="": next(replies))
+
+
+def test_select_from_list_searches_after_invalid_number(monkeypatch):
+    answer(monkeypatch, "99", "arroz", "2")
+
+    assert select_from_list(ITEMS, "Selecione") == Item("Arroz integral")
+
+
+def test_select_from_list_auto_selects_single_match(monkeypatch):
+    answer(monkeypatch, "acucar")
+
+    assert select_from_list(ITEMS, "Selecione") == Item("Açúcar")
@@ -0,0 +1,35 @@
+from src.modules.relatorios import RelatoriosManager
+from src.modules.workers import Task, WorkerPool
+
+
+def run_in_pool(qapp, fn):
+    """Executa fn(task) numa thread do WorkerPool e devolve (resultado, erro)."""
+    outcome = {}
+    pool = WorkerPool()
+    task = Task(fn)
+    task.signals.result.connect(lambda value: outcome.setdefault('result', value))
+    task.signals.error.connect(lambda error: outcome.setdefault('error', error))
+    pool.start(task)
+    pool.pool.waitForDone()
+    qapp.processEvents()  # Entrega os sinais enfileirados para esta thread
+    return outcome.get('result'), outcome.get('error')
+
+
+def test_report_renders_in_worker_on_sqlite(qapp, sqlite_app):
+    manager = RelatoriosManager()
+    sqlite_app.load('foods')  # Conexão já aberta pela thread da interface
+
+    html, error = run_in_pool(qapp, lambda task: manager.render_report('nutrition', progress=task.progress))
+
+    assert error is None
+    assert "<table" in html
+
+
+def test_sqlite_storage_writes_from_worker(qapp, sqlite_app):
+    foods = sqlite_app.load('foods')
+
+    versions, error = run_in_pool(qapp, lambda task: sqlite_app.save('foods', foods[:1]))
+
+    assert error is None
+    assert len(sqlite_app.load('foods')) == 1
+    assert sqlite_app.signature('foods') == versions